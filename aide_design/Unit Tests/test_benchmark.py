@@ -0,0 +1,43 @@
+from aide_design import benchmark
+import os
+import tempfile
+import unittest
+
+
+class BenchmarkTest(unittest.TestCase):
+    """Test running, saving and comparing benchmarks."""
+    def test_run_save_load(self):
+        results = benchmark.run(['cdc_design'], repeat=2, time_min=0)
+        self.assertEqual([r['size'] for r in results],
+                         list(benchmark.WORKLOADS['cdc_design'][1]))
+        self.assertTrue(all(0 < r['best'] <= r['median'] for r in results))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            benchmark.save(results, path)
+            self.assertEqual(benchmark.load(path), results)
+
+    def test_compare(self):
+        baseline = [{'name': 'fric', 'size': 1, 'best': 1.0},
+                    {'name': 'fric', 'size': 10, 'best': 1.0}]
+        results = [{'name': 'fric', 'size': 1, 'best': 1.2},
+                   {'name': 'fric', 'size': 10, 'best': 2.0},
+                   {'name': 'import', 'size': 1, 'best': 5.0}]
+        regressions = benchmark.compare(results, baseline, tolerance=0.25)
+        self.assertEqual([(r['size'], r['ratio']) for r in regressions],
+                         [(10, 2.0)])
+
+    def test_series_memory(self):
+        """A Quantity array should take less memory than an object array."""
+        results = {r['name']: r for r in benchmark.run(
+            ['series_quantity', 'series_object'], repeat=1, time_min=0)
+            if r['size'] == 1000}
+        self.assertLess(results['series_quantity']['peak'],
+                        results['series_object']['peak'])
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            benchmark.run(['nothing'])
+
+
+if __name__ == '__main__':
+    unittest.main()
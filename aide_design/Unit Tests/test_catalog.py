@@ -0,0 +1,81 @@
+from aide_design.units import unit_registry as u
+from aide_design import catalog
+import os
+import tempfile
+import numpy as np
+import unittest
+
+
+class CatalogTest(unittest.TestCase):
+    """Test building, saving and querying a catalog of designs."""
+    @classmethod
+    def setUpClass(cls):
+        cls.flows = catalog.flow_grid(12, 2 * u.L/u.s, 40 * u.L/u.s)
+        cls.catalog = catalog.Catalog.build(cls.flows, n_workers=2,
+                                            chunk_size=4)
+
+    def assertSameDesign(self, a, b):
+        self.assertEqual(set(a), set(b))
+        for field in a:
+            if isinstance(a[field], u.Quantity):
+                self.assertEqual(a[field].units, b[field].units)
+                np.testing.assert_allclose(a[field].magnitude,
+                                           b[field].magnitude)
+            else:
+                np.testing.assert_array_equal(a[field], b[field])
+
+    def test_build(self):
+        serial = catalog.Catalog.build(self.flows[:4], ['cdc', 'pipe'])
+        for name in ('cdc', 'pipe'):
+            for field, values in serial.components[name]['arrays'].items():
+                np.testing.assert_array_equal(
+                    values, self.catalog.components[name]['arrays'][field][:4])
+        self.assertRaises(ValueError, catalog.Catalog.build, self.flows,
+                          ['sedimentation'])
+
+    def test_grid_flow(self):
+        flow = self.flows[3]
+        result = self.catalog.query(flow)
+        self.assertTrue(result['valid'])
+        for name, component in catalog.COMPONENTS.items():
+            design = dict(result[name])
+            self.assertTrue(design.pop('valid'))
+            self.assertSameDesign(design, component.design(flow))
+
+    def test_interpolation(self):
+        flow = np.sqrt(self.flows[5] * self.flows[6])
+        result = self.catalog.query(flow)
+        # The volume of the flocculator is proportional to the flow.
+        self.assertAlmostEqual(result['floc']['Volume'].to(u.m**3).magnitude,
+                               catalog.design_floc(flow)['Volume'].magnitude)
+        self.assertIn(round(result['FlowCatalog'].magnitude, 9),
+                      np.round(self.flows[5:7].magnitude, 9))
+        if result['pipe']['valid']:
+            self.assertEqual(result['pipe']['NomDiam'],
+                             catalog.design_pipe(flow)['NomDiam'])
+
+    def test_validity(self):
+        lfom = self.catalog.query(self.flows[0] * 1.005)['lfom']
+        self.assertTrue(lfom['valid'])
+        self.assertFalse(self.catalog.query(self.flows[0] / 2)['valid'])
+        self.assertFalse(self.catalog.query(self.flows[-1] * 2)['pipe']['valid'])
+        # LFOMs of the largest flows need orifices larger than the drills.
+        lfom = self.catalog.query(self.flows[-1])['lfom']
+        self.assertFalse(lfom['valid'])
+        self.assertIn('drill', lfom['error'])
+        self.assertRaises(ValueError, self.catalog.query, 0 * u.L/u.s)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'catalog.npz')
+            self.catalog.save(path)
+            loaded = catalog.Catalog.load(path)
+        flow = 9.1 * u.L/u.s
+        expected, result = self.catalog.query(flow), loaded.query(flow)
+        self.assertEqual(result['valid'], expected['valid'])
+        for name in catalog.COMPONENTS:
+            self.assertSameDesign(result[name], expected[name])
+
+
+if __name__ == '__main__':
+    unittest.main()
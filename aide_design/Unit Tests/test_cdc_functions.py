@@ -0,0 +1,78 @@
+from aide_design.units import unit_registry as u
+from aide_design import cdc_functions as cdc
+from aide_design import utility as ut
+import numpy as np
+import unittest
+
+
+class CDCDesignTest(unittest.TestCase):
+    """Test the vectorized dosing tube design."""
+    def setUp(self):
+        self.Diam = np.arange(1, 6) / 16 * u.inch
+        self.args = (2 * u.mg/u.L, 51.4 * u.g/u.L, self.Diam, 10 * u.cm,
+                     2 * u.m, 2, 2)
+
+    def test_scalar(self):
+        design = cdc.cdc_design(0.01 * u.m**3/u.s, *self.args)
+        self.assertAlmostEqual(design['DiamTube'].to(u.inch).magnitude,
+                               1/16)
+        self.assertAlmostEqual(design['LenTube'].to(u.m).magnitude,
+                               0.3773877944455432)
+        self.assertEqual(design['NumTube'], 1)
+        self.assertEqual(cdc.i_cdc(0.01 * u.m**3/u.s, *self.args), 0)
+        designs = cdc.cdc_design(np.array([0.01, 1]) * u.m**3/u.s,
+                                 *self.args)
+        np.testing.assert_allclose(
+            ut.base_magnitude(self.Diam[designs['index']]),
+            ut.base_magnitude(designs['DiamTube']))
+
+    def test_broadcast(self):
+        """Designs for an array of flows should match one design at a time."""
+        FlowPlant = np.array([0.01, 0.05, 0.2, 1]) * u.m**3/u.s
+        designs = cdc.cdc_design(FlowPlant, *self.args)
+        for i, flow in enumerate(FlowPlant):
+            design = cdc.cdc_design(flow, *self.args)
+            with self.subTest(flow=flow):
+                for name in design:
+                    np.testing.assert_allclose(
+                        ut.base_magnitude(designs[name][i]),
+                        ut.base_magnitude(design[name]))
+
+    def test_shortest_tube_longer_than_max(self):
+        """The smallest tube is used even if it is longer than the maximum."""
+        design = cdc.cdc_design(0.01 * u.m**3/u.s, 2 * u.mg/u.L,
+                                51.4 * u.g/u.L, self.Diam, 10 * u.cm,
+                                10 * u.cm, 2, 2)
+        self.assertAlmostEqual(design['DiamTube'].to(u.inch).magnitude,
+                               1/16)
+        self.assertGreater(design['LenTube'].to(u.cm).magnitude, 10)
+
+    def test_larger_tube_feasible_again(self):
+        """A larger tube that needs fewer tubes can be short enough after a
+        smaller one is too long.
+        """
+        Diam = np.array([1, 2, 2.1]) / 16 * u.inch
+        design = cdc.cdc_design(0.065 * u.m**3/u.s, 2 * u.mg/u.L,
+                                51.4 * u.g/u.L, Diam, 10 * u.cm, 1.2 * u.m,
+                                2, 2)
+        middle = cdc.cdc_design(0.065 * u.m**3/u.s, 2 * u.mg/u.L,
+                                 51.4 * u.g/u.L, Diam[1], 10 * u.cm,
+                                 1.2 * u.m, 2, 2)['LenTube']
+        self.assertGreater(middle.to(u.m).magnitude, 1.2)
+        self.assertEqual(design['index'], 2)
+        self.assertEqual(design['NumTube'], 1)
+        self.assertLess(design['LenTube'].to(u.m).magnitude, 1.2)
+
+    def test_nu_chem(self):
+        """Alum, PACl and water should each have their own viscosity."""
+        nu = cdc._nu_chem(100 * u.g/u.L, np.array([0, 1, 2])).magnitude
+        self.assertEqual(len(set(nu)), 3)
+        self.assertEqual(nu[2], 10**-6)
+
+    def test_range(self):
+        self.assertRaises(ValueError, cdc.cdc_design, -1 * u.m**3/u.s,
+                          *self.args)
+
+
+if __name__ == '__main__':
+    unittest.main()
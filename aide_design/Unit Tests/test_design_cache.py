@@ -0,0 +1,111 @@
+from aide_design.units import unit_registry as u
+from aide_design import design_cache as dc
+from aide_design import physchem as pc
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import unittest
+
+
+def _store_many(cache, start):
+    for i in range(start, start + 50):
+        cache.store(cache.key('square', (i,)), i**2)
+
+
+class DesignCacheTest(unittest.TestCase):
+    """Test the persistent design result cache."""
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'designs.sqlite')
+        self.cache = dc.DesignCache(self.path)
+
+    def tearDown(self):
+        self.cache.uninstall()
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_memoize(self):
+        calls = []
+
+        @self.cache.memoize
+        def double(x):
+            calls.append(x)
+            return 2 * x
+
+        self.assertEqual(double(3 * u.m), 6 * u.m)
+        self.assertEqual(double(300 * u.cm), 6 * u.m)
+        self.assertEqual(len(calls), 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']),
+                         (1, 1, 1))
+
+    def test_version(self):
+        """Results of another package version are not reused."""
+        key = self.cache.key('f', (1,))
+        self.cache.store(key, 1)
+        other = dc.DesignCache(self.path, version='0')
+        self.assertFalse(other.lookup(other.key('f', (1,)))[0])
+        other.close()
+
+    def test_lru_eviction(self):
+        cache = dc.DesignCache(self.path, max_bytes=2000)
+        for i in range(6):
+            cache.store(cache.key('f', (i,)), bytes(300))
+        cache.lookup(cache.key('f', (0,)))
+        for i in range(6, 8):
+            cache.store(cache.key('f', (i,)), bytes(300))
+        self.assertLessEqual(cache.stats()['bytes'], 2000)
+        self.assertTrue(cache.lookup(cache.key('f', (0,)))[0])
+        self.assertFalse(cache.lookup(cache.key('f', (1,)))[0])
+        self.assertTrue(cache.lookup(cache.key('f', (7,)))[0])
+        cache.close()
+
+    def test_batched_counts(self):
+        """Lookups only read, and their counts are written in batches."""
+        key = self.cache.key('f', (1,))
+        self.cache.store(key, 1)
+        db = sqlite3.connect(self.path, isolation_level=None)
+
+        def hits():
+            return db.execute("SELECT count FROM counts "
+                              "WHERE name = 'hits'").fetchone()[0]
+
+        db.execute("BEGIN IMMEDIATE")
+        self.assertEqual(self.cache.lookup(key), (True, 1))
+        db.execute("COMMIT")
+        self.assertEqual(hits(), 0)
+        for i in range(dc.FLUSH_LOOKUPS - 1):
+            self.cache.lookup(key)
+        self.assertEqual(hits(), dc.FLUSH_LOOKUPS)
+        self.cache.lookup(key)
+        self.assertEqual(self.cache.stats()['hits'], dc.FLUSH_LOOKUPS + 1)
+        db.close()
+
+    def test_install(self):
+        flow_pipe = pc.flow_pipe
+        self.cache.install([('aide_design.physchem', ('flow_pipe',))])
+        self.assertIsNot(pc.flow_pipe, flow_pipe)
+        args = (0.1 * u.m, 1 * u.m, 100 * u.m, 1e-6 * u.m**2/u.s,
+                0.1 * u.mm, 2)
+        self.assertEqual(pc.flow_pipe(*args), flow_pipe(*args))
+        self.assertEqual(pc.flow_pipe(*args), flow_pipe(*args))
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.cache.uninstall()
+        self.assertIs(pc.flow_pipe, flow_pipe)
+
+    def test_concurrent_writers(self):
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=_store_many, args=(self.cache, i))
+                   for i in range(0, 200, 50)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(self.cache.stats()['entries'], 200)
+        self.assertEqual(self.cache.lookup(self.cache.key('square', (7,))),
+                         (True, 49))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+from aide_design.units import unit_registry as u
+from aide_design import floc_model as floc
+from aide_design import dose_control as dc
+import numpy as np
+import unittest
+
+
+def pc(ConcClay, Temp, ConcAl, ConcNatOrgMat):
+    return floc.pc_viscous(10 * u.mW/u.kg, Temp, 10 * u.min, 1 * u.cm,
+                           ConcClay, ConcAl, ConcNatOrgMat, floc.HumicAcid,
+                           floc.PACl, floc.Clay, 0.1, floc.RATIO_HEIGHT_DIAM)
+
+
+class DoseControllerTest(unittest.TestCase):
+    """Test the inverse dose solver."""
+    def setUp(self):
+        self.controller = dc.DoseController(1.0, 10 * u.mW/u.kg, 10 * u.min,
+                                            1 * u.cm)
+        self.ConcClay = [10, 50, 100, 500] * u.NTU
+        self.ConcNatOrgMat = [0, 1, 2, 3] * u.mg/u.L
+
+    def test_dose_reaches_target(self):
+        """The dose should reach the target and a slightly lower one not."""
+        ConcAl = self.controller.dose(self.ConcClay, 20 * u.degC,
+                                      self.ConcNatOrgMat)
+        self.assertTrue(np.all(pc(self.ConcClay, 20 * u.degC, ConcAl,
+                                  self.ConcNatOrgMat) >= 1))
+        self.assertTrue(np.all(pc(self.ConcClay, 20 * u.degC,
+                                  ConcAl * (1 - 1e-5),
+                                  self.ConcNatOrgMat) < 1))
+
+    def test_unreachable_target(self):
+        controller = dc.DoseController(1.6, 10 * u.mW/u.kg, 10 * u.min,
+                                       1 * u.cm)
+        self.assertTrue(np.isnan(controller.dose(10 * u.NTU,
+                                                 20 * u.degC)[0].magnitude))
+
+    def test_series_matches_batch(self):
+        """Warm started steps should agree with independent solutions."""
+        rng = np.random.default_rng(0)
+        ConcClay = 50 * np.exp(np.cumsum(rng.normal(0, 0.05, (30, 4)),
+                                         axis=0)) * u.NTU
+        Temp = 20 * u.degC
+        series = dc.dose_series(self.controller, ConcClay, Temp)
+        batch = self.controller.dose(ConcClay.magnitude.ravel() * u.NTU, Temp)
+        np.testing.assert_allclose(series.magnitude.ravel(), batch.magnitude,
+                                   rtol=1e-5)
+
+    def test_range(self):
+        self.assertRaises(ValueError, self.controller.dose, -1 * u.NTU,
+                          20 * u.degC)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+from aide_design.units import unit_registry as u
+from aide_design import expert_inputs as exp
+from aide_design import materials_database as mat
+import json
+import math
+import numpy as np
+import unittest
+
+
+class ConstantTableTest(unittest.TestCase):
+    """Test the constants that are created when they are first used."""
+    def test_values(self):
+        self.assertEqual(exp.NU_WATER, 10**-6 * u.m**2/u.s)
+        self.assertEqual(exp.K_MINOR_CDC_TUBE, 2)
+        self.assertEqual(mat.ANGLE_SED_PLATE, 60 * u.deg)
+        np.testing.assert_array_equal(mat.DIAM_TUBE_ENGLISH.magnitude,
+                                      np.arange(1, 8) / 16)
+
+    def test_derived(self):
+        self.assertEqual(exp.DIST_CENTER_ENT_TANK_PLATE,
+                         exp.SPACE_ENT_TANK_PLATE
+                         + exp.THICKNESS_ENT_TANK_PLATE)
+        self.assertEqual(mat.N_SED_MODULE_PLATES_MAX,
+                         math.floor(20 / 2.7 * math.tan(math.pi / 3)) + 1)
+        self.assertEqual(len(mat.DIAM_DRILL_MET), 76)
+        self.assertEqual(exp.VOL_CHEM_TANK_AVAIL[0], 5 * u.gal)
+
+    def test_cached(self):
+        self.assertIs(mat.PIPE_ROUGH_PVC, mat.PIPE_ROUGH_PVC)
+        self.assertIn('PIPE_ROUGH_PVC', vars(mat))
+
+    def test_dir(self):
+        names = [row[0] for row in exp.CONSTANTS]
+        self.assertTrue(set(names) <= set(dir(exp)))
+        self.assertTrue(set(names) <= set(exp.__all__))
+
+    def test_unknown(self):
+        self.assertRaises(AttributeError, getattr, exp, 'NOT_A_CONSTANT')
+
+    def test_catalog(self):
+        catalog = mat.catalog()
+        self.assertEqual([row['name'] for row in catalog],
+                         [row[0] for row in mat.CONSTANTS])
+        json.dumps(catalog)
+        rows = {row['name']: row for row in exp.catalog()}
+        self.assertEqual(rows['DENSITY_WATER']['units'], 'kg / m ** 3')
+        self.assertTrue(rows['DIST_CENTER_ENT_TANK_PLATE']['derived'])
+        self.assertFalse(rows['VOL_CHEM_TANK_AVAIL']['derived'])
+        self.assertEqual(rows['VOL_CHEM_TANK_AVAIL']['units'][-1], 'l')
+        self.assertFalse({row['name']: row for row in catalog}[
+            'DIAM_DRILL_MET']['derived'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+from aide_design.units import unit_registry as u
+from aide_design import floc_model as floc
+from aide_design import floc_coil_design as fcd
+from aide_design import utility as ut
+import numpy as np
+import unittest
+
+
+FLOW = 7 * u.mL/u.s
+TEMP = 20 * u.degC
+
+
+class CoilDesignsTest(unittest.TestCase):
+    """Test the vectorized coiled tube flocculator search."""
+    def setUp(self):
+        self.designs = fcd.coil_designs(FLOW, TEMP, 20000, 1 * u.m,
+                                        0.5 * u.W/u.kg,
+                                        np.linspace(1, 20, 20) * u.cm,
+                                        np.linspace(1, 50, 50) * u.m)
+
+    def test_designs_meet_targets(self):
+        """Every design returned should meet all of the targets."""
+        d = self.designs
+        self.assertGreater(len(d['IDTube']), 0)
+        self.assertTrue(np.all(d['GTime'].magnitude >= 20000))
+        self.assertTrue(np.all(d['HeadLoss'] <= 1 * u.m))
+        self.assertTrue(np.all(d['EnergyDis'] <= 0.5 * u.W/u.kg))
+
+    def test_designs_ranked(self):
+        """Designs should be sorted by head loss."""
+        HeadLoss = self.designs['HeadLoss'].magnitude
+        self.assertTrue(np.all(np.diff(HeadLoss) >= 0))
+
+    def test_designs_match_floc_model(self):
+        """The grid should agree with the scalar floc_model functions."""
+        d = self.designs
+        for i in (0, len(d['IDTube']) // 2, -1):
+            with self.subTest(i=i):
+                self.assertAlmostEqual(
+                    floc.g_time_res(FLOW, d['IDTube'][i], d['RadiusCoil'][i],
+                                    d['LengthTube'][i], TEMP),
+                    d['GTime'][i].magnitude, places=6)
+
+    def test_rank_by_range(self):
+        """Unknown ranking keys should raise errors."""
+        self.assertRaises(ValueError, fcd.coil_designs, FLOW, TEMP, 20000,
+                          1 * u.m, 0.5 * u.W/u.kg, [5] * u.cm, [10] * u.m,
+                          rank_by='cost')
+
+
+class CoilRefineTest(unittest.TestCase):
+    """Test the root-finding refinement of a single geometry."""
+    def test_length_coil_gtime(self):
+        LengthTube = fcd.length_coil_gtime(FLOW, 3 * u.mm, 5 * u.cm, TEMP,
+                                           20000)
+        self.assertAlmostEqual(floc.g_time_res(FLOW, 3 * u.mm, 5 * u.cm,
+                                               LengthTube, TEMP),
+                               20000, places=4)
+
+    def test_radius_coil_gtime(self):
+        RadiusCoil = fcd.radius_coil_gtime(FLOW, 3 * u.mm, 20 * u.m, TEMP,
+                                           60000, 1 * u.m)
+        self.assertAlmostEqual(floc.g_time_res(FLOW, 3 * u.mm, RadiusCoil,
+                                               20 * u.m, TEMP),
+                               60000, places=4)
+
+    def test_solver_log(self):
+        """The refinements are recorded and limited by utility.SolverLog."""
+        with ut.SolverLog() as log:
+            fcd.length_coil_gtime(FLOW, 3 * u.mm, 5 * u.cm, TEMP, 20000)
+            fcd.radius_coil_gtime(FLOW, 3 * u.mm, 20 * u.m, TEMP, 60000,
+                                  1 * u.m)
+        self.assertEqual([record.solver for record in log.records],
+                         ['length_coil_gtime', 'radius_coil_gtime'])
+        self.assertTrue(all(record.converged for record in log.records))
+        with ut.SolverLog(max_iter=1) as log:
+            with self.assertWarns(RuntimeWarning):
+                fcd.length_coil_gtime(FLOW, 3 * u.mm, 5 * u.cm, TEMP, 20000)
+        self.assertFalse(log.records[0].converged)
+
+    def test_radius_coil_gtime_range(self):
+        """An unreachable target should raise an error."""
+        self.assertRaises(ValueError, fcd.radius_coil_gtime, FLOW, 3 * u.mm,
+                          1 * u.m, TEMP, 10**7, 1 * u.m)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+from aide_design.units import unit_registry as u
+from aide_design import floc_uncertainty as fu
+import numpy as np
+import unittest
+
+
+class SummaryStatsTest(unittest.TestCase):
+    """Test the streaming statistics."""
+    def setUp(self):
+        self.values = np.random.default_rng(0).normal(size=10**5)
+        self.edges = np.linspace(-6, 6, 4097)
+
+    def test_moments(self):
+        stats = fu.SummaryStats(self.edges)
+        stats.update(self.values)
+        self.assertAlmostEqual(stats.mean.magnitude, self.values.mean())
+        self.assertAlmostEqual(stats.std.magnitude, self.values.std(ddof=1))
+        self.assertEqual(stats.min.magnitude, self.values.min())
+        self.assertEqual(stats.max.magnitude, self.values.max())
+
+    def test_quantile(self):
+        stats = fu.SummaryStats(self.edges)
+        stats.update(self.values)
+        q = (0.01, 0.5, 0.99)
+        np.testing.assert_allclose(stats.quantile(q).magnitude,
+                                   np.quantile(self.values, q), atol=0.01)
+
+    def test_merge(self):
+        """Merged chunks should match a single update."""
+        whole = fu.SummaryStats(self.edges)
+        whole.update(self.values)
+        merged = fu.SummaryStats(self.edges)
+        for chunk in np.array_split(self.values, 7):
+            part = fu.SummaryStats(self.edges)
+            part.update(chunk)
+            merged.merge(part)
+        self.assertEqual(merged.count, whole.count)
+        np.testing.assert_array_equal(merged.hist, whole.hist)
+        self.assertAlmostEqual(merged.mean.magnitude, whole.mean.magnitude)
+        self.assertAlmostEqual(merged.var.magnitude, whole.var.magnitude)
+
+    def test_nan(self):
+        stats = fu.SummaryStats(self.edges)
+        stats.update([1, np.nan, 2])
+        self.assertEqual((stats.count, stats.nan_count), (2, 1))
+
+
+class MonteCarloTest(unittest.TestCase):
+    """Test the Monte Carlo engine with the floc performance model."""
+    inputs = {'ConcClay': fu.LogNormal(50 * u.mg/u.L, 0.5),
+              'Temp': fu.Uniform(10 * u.degC, 30 * u.degC),
+              'ConcNatOrgMat': fu.Uniform(0 * u.mg/u.L, 5 * u.mg/u.L)}
+    model = fu.FlocPerformance(10 * u.mW/u.kg, 10 * u.min, 1 * u.cm,
+                               2 * u.mg/u.L)
+
+    def test_reproducible(self):
+        """The same seed should give the same statistics in any chunking
+        of the work among processes.
+        """
+        serial = fu.monte_carlo(self.inputs, self.model, 20000, seed=3,
+                                chunk_size=3000)
+        parallel = fu.monte_carlo(self.inputs, self.model, 20000, seed=3,
+                                  chunk_size=3000, n_workers=2)
+        for name in serial:
+            with self.subTest(name=name):
+                self.assertEqual(serial[name].count, 20000)
+                self.assertEqual(serial[name].mean, parallel[name].mean)
+                np.testing.assert_array_equal(serial[name].hist,
+                                              parallel[name].hist)
+
+    def test_units(self):
+        stats = fu.monte_carlo(self.inputs, self.model, 1000, seed=1)
+        self.assertEqual(stats['VelTerm'].mean.units, u.m/u.s)
+        self.assertEqual(stats['pC'].quantile(0.5).units, u.dimensionless)
+
+
+if __name__ == '__main__':
+    unittest.main()
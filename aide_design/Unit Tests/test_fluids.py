@@ -0,0 +1,50 @@
+from aide_design.units import unit_registry as u
+from aide_design import physchem as pc
+from aide_design import fluids
+import numpy as np
+import unittest
+
+
+class FluidTest(unittest.TestCase):
+    """Test the solution property models."""
+    def setUp(self):
+        self.Conc = np.array([0, 10, 100, 500]) * u.g/u.L
+        self.Temp = np.array([5, 20, 35]) * u.degC
+
+    def test_water(self):
+        np.testing.assert_allclose(
+            fluids.WATER.nu(0, self.Temp).magnitude,
+            pc.viscosity_kinematic(self.Temp).to(u.m**2/u.s).magnitude)
+
+    def test_alum(self):
+        nu = fluids.ALUM.nu(self.Conc[:, np.newaxis], self.Temp)
+        self.assertEqual(nu.shape, (4, 3))
+        self.assertAlmostEqual(
+            nu[2, 1].magnitude,
+            (1 + 4.255e-6 * 100**2.289)
+            * pc.viscosity_kinematic(20 * u.degC).magnitude)
+
+    def test_nu_coag(self):
+        nu = fluids.nu_coag(100 * u.g/u.L, np.array([0, 1, 2]))
+        np.testing.assert_allclose(
+            nu.magnitude,
+            [fluids.ALUM.nu(100 * u.g/u.L, 20 * u.degC).magnitude,
+             fluids.PACL.nu(100 * u.g/u.L, 20 * u.degC).magnitude,
+             pc.viscosity_kinematic(20 * u.degC).magnitude])
+
+    def test_physchem_accepts_solution(self):
+        """A Solution should give the same result as its viscosity."""
+        solution = fluids.Solution(fluids.PACL, 100 * u.g/u.L)
+        args = (1 * u.mL/u.s, 2 * u.mm, 1 * u.m)
+        self.assertEqual(pc.headloss(*args, solution, 0, 2),
+                         pc.headloss(*args, solution.nu, 0, 2))
+        self.assertEqual(pc.re_pipe(1 * u.mL/u.s, 2 * u.mm, Nu=solution),
+                         pc.re_pipe(1 * u.mL/u.s, 2 * u.mm, solution.nu))
+
+    def test_range(self):
+        self.assertRaises(ValueError, fluids.ALUM.nu, -1 * u.g/u.L,
+                          20 * u.degC)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+from aide_design.units import unit_registry as u
+from aide_design.unit_process_design.prefab import lfom_prefab as lp
+from aide_design.unit_process_design.prefab import lfom_prefab_functional as lf
+import numpy as np
+import unittest
+
+
+class LFOMTest(unittest.TestCase):
+    """Test the cached LFOM design."""
+    def setUp(self):
+        self.lfom = lp.LFOM(5 * u.L/u.s, 20 * u.cm, 1.2, 26,
+                            lp.uomeasure.english)
+
+    def test_matches_functional(self):
+        np.testing.assert_array_equal(
+            self.lfom.fric_n_orifices(),
+            lf.fric_n_lfom_orifices(5 * u.L/u.s, 20 * u.cm,
+                                    lf.uomeasure.english, 26))
+
+    def test_flow_error_max(self):
+        """The largest error is the largest absolute error; the baseline
+        returned the square of the signed maximum over two.
+        """
+        error = self.lfom._flow_error().magnitude
+        self.assertEqual(self.lfom._flow_error_max(), np.abs(error).max())
+        self.assertGreaterEqual(self.lfom._flow_error_max(), -error.min())
+
+    def test_cache(self):
+        """Derived values should be cached until an input they depend on
+        changes.
+        """
+        n = self.lfom.fric_n_orifices()
+        self.assertIs(self.lfom.fric_n_orifices(), n)
+        self.lfom.set_sdr(41)
+        self.assertIn('drillbit_diameter', self.lfom._cache)
+        self.assertNotIn('nom_diam_pipe', self.lfom._cache)
+        self.assertNotIn('fric_n_orifices', self.lfom._cache)
+        self.lfom.drillbit_diameter()
+        self.lfom.flow = 10 * u.L/u.s
+        self.assertEqual(self.lfom._cache, {})
+
+    def test_unchanged_input(self):
+        """Setting an input to its current value should keep the cache."""
+        self.lfom.drillbit_diameter()
+        self.lfom.set_flow(5 * u.L/u.s)
+        self.assertIn('drillbit_diameter', self.lfom._cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
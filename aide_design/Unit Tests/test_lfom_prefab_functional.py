@@ -0,0 +1,74 @@
+from aide_design.units import unit_registry as u
+from aide_design.unit_process_design.prefab import lfom_prefab_functional as lf
+import numpy as np
+import unittest
+
+
+class LFOMRatingTest(unittest.TestCase):
+    """Test the vectorized LFOM rating curve."""
+    def setUp(self):
+        self.designs = [lf.lfom_layout(flow * u.L/u.s, 20 * u.cm,
+                                       lf.drill_series_uom, 26)
+                        for flow in (1.6, 5, 20)]
+
+    def test_orifice_counts(self):
+        """Orifice counts should be whole numbers."""
+        for D, H_rows, N in self.designs:
+            self.assertEqual(N.dtype.kind, 'i')
+
+    def test_rating_matches_orifices(self):
+        D, H_rows, N = self.designs[0]
+        flow = lf.flow_lfom_rating(D, H_rows, N, [0.05, 0.15])[0]
+        for i, H in enumerate((0.05, 0.15)):
+            expected = sum(n * lf.pc.flow_orifice_vert(D, H * u.m - h, 0.62)
+                           for n, h in zip(N, H_rows))
+            self.assertAlmostEqual(flow[i].magnitude, expected.magnitude)
+
+    def test_batch(self):
+        """Padded designs rated together should match one at a time."""
+        rows = max(len(N) for D, H_rows, N in self.designs)
+        def pad(x):
+            return np.pad(x, (0, rows - len(x)), 'constant')
+        D = [D.magnitude for D, H_rows, N in self.designs]
+        H_rows = [pad(H_rows.magnitude) for D, H_rows, N in self.designs]
+        N = [pad(N) for D, H_rows, N in self.designs]
+        FLOW = [1.6, 5, 20] * u.L/u.s
+        batch = lf.lfom_rating(FLOW, 20 * u.cm, D, H_rows, N, N_levels=100)
+        for i, design in enumerate(self.designs):
+            single = lf.lfom_rating(FLOW[i], 20 * u.cm, *design, N_levels=100)
+            with self.subTest(i=i):
+                self.assertAlmostEqual(batch['error_max'][i].magnitude,
+                                       single['error_max'][0].magnitude)
+                self.assertAlmostEqual(batch['error_rms'][i].magnitude,
+                                       single['error_rms'][0].magnitude)
+
+    def test_heights(self):
+        """The heights of the rows should be one array of floats."""
+        FLOW = 5 * u.L/u.s
+        heights = lf.height_lfom_orifices(FLOW, 20 * u.cm, lf.drill_series_uom)
+        self.assertEqual(heights.magnitude.dtype, np.float64)
+        D, H_rows, N = self.designs[1]
+        np.testing.assert_allclose(heights[:len(H_rows)].to(u.m).magnitude,
+                                   H_rows.magnitude)
+
+
+class LFOMOptimizerTest(unittest.TestCase):
+    """Test the LFOM design search."""
+    def test_pareto(self):
+        """The Pareto set should trade pipe size for error and should not
+        depend on the number of processes.
+        """
+        kwargs = dict(SDRs=(26, 41), N_rows=(6, 8, 10), N_levels=50)
+        serial = lf.optimize_lfom(20 * u.L/u.s, 20 * u.cm,
+                                  lf.uomeasure.metric, **kwargs)
+        parallel = lf.optimize_lfom(20 * u.L/u.s, 20 * u.cm,
+                                    lf.uomeasure.metric, n_workers=2,
+                                    chunk_size=16, **kwargs)
+        np.testing.assert_array_equal(serial['N_lfom_orifices'],
+                                      parallel['N_lfom_orifices'])
+        self.assertTrue(np.all(np.diff(serial['ND'].magnitude) > 0))
+        self.assertTrue(np.all(np.diff(serial['error_max'].magnitude) < 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
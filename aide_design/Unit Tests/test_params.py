@@ -0,0 +1,64 @@
+from aide_design.units import unit_registry as u
+from aide_design import params
+from aide_design import cdc_functions as cdc
+from aide_design import floc_model as floc
+from aide_design import physchem
+import numpy as np
+import pickle
+import unittest
+
+
+class ParamSetTest(unittest.TestCase):
+    """Test the frozen parameter sets of the design functions."""
+    def setUp(self):
+        self.args = (10 * u.L/u.s, 2 * u.mg/u.L, 51.4 * u.g/u.L,
+                     np.arange(1, 6) / 16 * u.inch, 10 * u.cm, 2 * u.m, 2, 2)
+        self.cdc = cdc.CDCParams(*self.args)
+
+    def test_normalized(self):
+        """Equal values in other units give an equal, hashable set."""
+        other = cdc.CDCParams(0.01 * u.m**3/u.s, 2e-3, 51.4,
+                              np.arange(1, 6) / 16 * 0.0254, 0.1, 2, 2, 2)
+        self.assertEqual(self.cdc, other)
+        self.assertEqual(hash(self.cdc), hash(other))
+        self.assertEqual(self.cdc.cache_key, other.cache_key)
+        self.assertEqual(len({self.cdc: 1, other: 2}), 1)
+        self.assertIsInstance(self.cdc.DiamTubeAvail, tuple)
+
+    def test_cache_key(self):
+        self.assertNotEqual(self.cdc.cache_key,
+                            self.cdc._replace(HeadlossCDC=20 * u.cm).cache_key)
+        self.assertEqual(self.cdc._replace(HeadlossCDC=0.2).HeadlossCDC, 0.2)
+
+    def test_pickle(self):
+        data = pickle.dumps(self.cdc)
+        self.assertEqual(pickle.loads(data), self.cdc)
+        self.assertLess(len(data), len(pickle.dumps(self.args)) / 2)
+
+    def test_accepts(self):
+        self.assertEqual(cdc.len_cdc_tube(self.cdc),
+                         cdc.len_cdc_tube(*self.args))
+        self.assertEqual(cdc.n_cdc_tube(self.cdc), cdc.n_cdc_tube(*self.args))
+        args = (10 * u.mW/u.kg, 20 * u.degC, 10 * u.min, 1 * u.cm,
+                50 * u.NTU, 1 * u.mg/u.L, 1 * u.mg/u.L, floc.HumicAcid,
+                floc.PACl, floc.Clay, 0.1, floc.RATIO_HEIGHT_DIAM)
+        pc = floc.PCParams(*args)
+        self.assertAlmostEqual(floc.pc_viscous(pc), floc.pc_viscous(*args))
+        self.assertEqual(pc.cache_key, floc.PCParams(*args).cache_key)
+
+    def test_pipe(self):
+        args = (0.1 * u.m, 1 * u.m, 100 * u.m, 1e-6 * u.m**2/u.s,
+                0.0015 * u.mm, 2)
+        self.assertEqual(physchem.flow_pipe(physchem.FlowPipeParams(*args)),
+                         physchem.flow_pipe(*args))
+        flow = physchem.flow_pipe(*args)
+        args = (flow,) + args[1:]
+        self.assertEqual(physchem.diam_pipe(physchem.DiamPipeParams(*args)),
+                         physchem.diam_pipe(*args))
+        args = (flow, 0.1 * u.m) + args[2:]
+        self.assertEqual(physchem.headloss(physchem.HeadlossParams(*args)),
+                         physchem.headloss(*args))
+
+
+if __name__ == '__main__':
+    unittest.main()
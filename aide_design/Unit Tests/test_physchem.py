@@ -13,6 +13,8 @@ By: Ethan Keller
 
 from aide_design.units import unit_registry as u
 from aide_design import physchem as pc
+from aide_design import utility as ut
+import numpy as np
 import unittest
 
 class GeometryTest(unittest.TestCase):
@@ -686,6 +688,17 @@ class OrificeFuncsTest(unittest.TestCase):
             with self.subTest(i=i):
                 self.assertEqual(pc.flow_orifice_vert(*i).magnitude, base)
     
+    def test_flow_orifice_vert_array(self):
+        """flow_orifice_vert_array should match flow_orifice_vert."""
+        Diam = np.array([0.3, 1, 2])
+        Height = np.array([-4, -0.1, 0.2, 0.5, 1, 3])
+        expected = [[pc.flow_orifice_vert(d, h, 0.62).magnitude 
+                     for h in Height] for d in Diam]
+        np.testing.assert_allclose(
+            pc.flow_orifice_vert_array(Diam[:, np.newaxis], Height, 
+                                       0.62).magnitude,
+            expected, rtol=1e-8)
+    
     def test_head_orifice(self):
         """head_orifice should return known value for known inputs."""
         checks = (([1, 1, 1], 0.08265508294256473), 
@@ -1194,5 +1207,35 @@ class MiscPhysFuncsTest(unittest.TestCase):
                 self.assertEqual(pc.headloss_kozeny(*i).magnitude, base)
 
 
+
+class SolverLogTest(unittest.TestCase):
+    """Test the telemetry and iteration limit of the pipe solvers."""
+    def setUp(self):
+        self.args = (np.linspace(1, 50, 10) * u.L/u.s, 1 * u.m, 100 * u.m,
+                     1e-6 * u.m**2/u.s, 0.1 * u.mm, 2)
+
+    def test_records(self):
+        with ut.SolverLog() as log:
+            pc.diam_pipe(*self.args)
+            pc.flow_pipe(0.1 * u.m, 1 * u.m, 100 * u.m, 1e-6 * u.m**2/u.s,
+                         0.1 * u.mm, 0)
+        summary = log.summary()
+        self.assertEqual(summary['diam_pipe']['calls'], 10)
+        self.assertEqual(summary['diam_pipe']['not_converged'], 0)
+        self.assertLessEqual(summary['diam_pipe']['residual_max'],
+                             pc.RTOL_DIAM_PIPE)
+        self.assertEqual(log.histogram('flow_pipe').tolist(), [1])
+        self.assertEqual(log.histogram().sum(), 11)
+
+    def test_limits(self):
+        with ut.SolverLog(max_iter=1, rtol={'diam_pipe': 1e-12}) as log:
+            with self.assertWarns(RuntimeWarning):
+                pc.diam_pipe(*self.args)
+        self.assertEqual(len(log.not_converged()), 10)
+        self.assertEqual(log.summary()['diam_pipe']['iterations_max'], 1)
+        with self.assertRaises(ValueError):
+            ut.SolverLog(max_iter=0)
+
+
 if __name__ == "__main__":
     unittest.main()
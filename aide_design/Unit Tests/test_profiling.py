@@ -0,0 +1,53 @@
+from aide_design.units import unit_registry as u
+from aide_design import physchem as pc
+from aide_design import profiling
+import os
+import tempfile
+import unittest
+
+
+class ProfilerTest(unittest.TestCase):
+    """Test the profiler of the design functions."""
+    def setUp(self):
+        self.args = (0.1 * u.m, 1 * u.m, 100 * u.m, 1e-6 * u.m**2/u.s,
+                     0.1 * u.mm, 2)
+
+    def test_restored(self):
+        flow_pipe = pc.flow_pipe
+        cells = [cell.cell_contents for cell in flow_pipe.__closure__]
+        with profiling.Profiler() as profiler:
+            self.assertIsNot(pc.flow_pipe, flow_pipe)
+            self.assertEqual(pc.flow_pipe(*self.args), flow_pipe(*self.args))
+            self.assertRaises(RuntimeError, profiler.enable)
+        self.assertIs(pc.flow_pipe, flow_pipe)
+        self.assertEqual([cell.cell_contents for cell in flow_pipe.__closure__],
+                         cells)
+
+    def test_table(self):
+        with profiling.Profiler() as profiler:
+            pc.flow_pipe(*self.args)
+        rows = {row['name']: row for row in profiler.table()}
+        row = rows['physchem.flow_pipe']
+        self.assertEqual(row['calls'], 1)
+        self.assertGreater(rows['physchem.fric']['calls'], 1)
+        self.assertGreater(row['inclusive'], row['exclusive'])
+        self.assertAlmostEqual(row['exclusive'], row['units']
+                               + row['handlers'] + row['compute'])
+        self.assertGreater(row['units'], 0)
+        self.assertEqual(rows['utility.check_range']['units'], 0)
+
+    def test_stacks(self):
+        with profiling.Profiler() as profiler:
+            pc.flow_pipe(*self.args)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'flow_pipe.folded')
+            profiler.write_stacks(path)
+            with open(path) as file:
+                stacks = [line.rsplit(' ', 1)[0] for line in file]
+        self.assertIn('physchem.flow_pipe;physchem.flow_pipemajor', stacks)
+        self.assertTrue(all(stack.startswith('physchem.flow_pipe')
+                            for stack in stacks))
+
+
+if __name__ == '__main__':
+    unittest.main()
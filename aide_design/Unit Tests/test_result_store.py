@@ -0,0 +1,112 @@
+from aide_design.units import unit_registry as u
+from aide_design import floc_model as floc
+from aide_design import result_store
+from aide_design import sweep
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+def _dose(ConcAl, coag):
+    return {'Al': ConcAl * coag.AluminumMPM}
+
+
+class ResultStoreTest(unittest.TestCase):
+    """Test the columnar store of sweep results."""
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        self.store = result_store.ResultStore(self.path)
+        self.store.append({'flow': np.arange(5) * u.L/u.s,
+                           'coag': [floc.PACl, floc.Alum] * 2 + [floc.PACl],
+                           'n': np.arange(5)})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_append(self):
+        self.store.append({'flow': [1, 2] * u.m**3/u.s, 'coag': ['Alum'] * 2,
+                           'n': [5, 6]})
+        store = result_store.ResultStore(self.path)
+        self.assertEqual(len(store), 7)
+        self.assertEqual(store.units('flow'), u.L/u.s)
+        np.testing.assert_array_equal(store['flow'][-2:].magnitude,
+                                      [1000, 2000])
+        self.assertEqual(list(store['coag']),
+                         ['PACl', 'Alum', 'PACl', 'Alum', 'PACl', 'Alum',
+                          'Alum'])
+        self.assertIsInstance(store.raw('n'), np.memmap)
+        np.testing.assert_array_equal(
+            np.load(os.path.join(self.path, 'n.npy'), mmap_mode='r'),
+            np.arange(7))
+        self.assertEqual(list(store.read(['n'], slice(2, 4))['n']), [2, 3])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.store.append({'flow': [1] * u.L/u.s, 'n': [1]})
+        with self.assertRaises(ValueError):
+            self.store.append({'flow': [1] * u.L/u.s, 'coag': ['Alum'],
+                               'n': [1, 2]})
+
+    def test_missing(self):
+        self.store.append({'flow': [1, 2, 3] * u.L/u.s,
+                           'coag': ['x', None, 'y'], 'n': [5, 6, 7]})
+        self.assertEqual(list(self.store['coag'][-3:]), ['x', None, 'y'])
+        self.store.append({'flow': [1] * u.L/u.s, 'coag': [np.nan],
+                           'n': [8]})
+        self.assertIsNone(self.store['coag'][-1])
+
+    def test_cast(self):
+        with self.assertRaises(ValueError):
+            self.store.append({'flow': [1] * u.L/u.s, 'coag': ['Alum'],
+                               'n': [1.7]})
+        self.assertEqual(len(self.store), 5)
+        store = result_store.ResultStore(os.path.join(self.path, 'small'))
+        store.append({'n': np.arange(3, dtype=np.int32)})
+        store.append({'n': np.array([3, 4], dtype=np.int64)})
+        with self.assertRaises(ValueError):
+            store.append({'n': np.array([2**40], dtype=np.int64)})
+        store = result_store.ResultStore(os.path.join(self.path, 'float'))
+        store.append({'x': np.zeros(2, dtype=np.float32)})
+        with self.assertRaises(ValueError):
+            store.append({'x': np.array([0.1])})
+        self.assertEqual(list(store['x']), [0, 0])
+
+    def test_unfinished_append(self):
+        """Bytes left by an append that crashed are dropped."""
+        with open(os.path.join(self.path, 'n.npy'), 'ab') as file:
+            file.write(bytes(12))
+        self.store.append({'flow': [1] * u.L/u.s, 'coag': ['Alum'],
+                           'n': [9]})
+        np.testing.assert_array_equal(
+            np.load(os.path.join(self.path, 'n.npy')), [0, 1, 2, 3, 4, 9])
+
+    def test_sweep(self):
+        store = result_store.ResultStore(os.path.join(self.path, 'sweep'))
+        grid = sweep.grid(ConcAl=np.linspace(1, 5, 5) * u.mg/u.L,
+                          coag=[floc.PACl, floc.Alum])
+        sweep.Sweep(_dose, grid, chunk_size=4).run(n_workers=1, store=store)
+        self.assertEqual(len(store), 10)
+        order = np.argsort(store['row'])
+        np.testing.assert_allclose(store['Al'][order].magnitude,
+                                   np.repeat([1, 2, 3, 4, 5], 2)
+                                   * np.tile([13, 2], 5))
+        self.assertEqual(list(store['coag'][order][:2]), ['PACl', 'Alum'])
+
+    def test_sweep_resume(self):
+        """Chunks saved in the checkpoint but not the store are appended."""
+        store = result_store.ResultStore(os.path.join(self.path, 'sweep'))
+        checkpoint = os.path.join(self.path, 'checkpoint')
+        grid = sweep.grid(ConcAl=np.linspace(1, 5, 5) * u.mg/u.L,
+                          coag=[floc.PACl, floc.Alum])
+        run = sweep.Sweep(_dose, grid, chunk_size=4).run
+        run(n_workers=1, checkpoint=checkpoint)
+        os.remove(os.path.join(checkpoint, 'chunk_{0:012d}.npz'.format(4)))
+        run(n_workers=1, checkpoint=checkpoint, store=store)
+        run(n_workers=1, checkpoint=checkpoint, store=store)
+        self.assertEqual(sorted(store['row']), list(range(10)))
+
+
+if __name__ == '__main__':
+    unittest.main()
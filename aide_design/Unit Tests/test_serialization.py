@@ -0,0 +1,101 @@
+from aide_design.units import unit_registry as u
+from aide_design import serialization
+from aide_design import floc_model as floc
+import io
+import json
+import os
+import numpy as np
+import unittest
+
+
+class SerializationTest(unittest.TestCase):
+    """Test writing and reading Quantities and design results as JSON."""
+    def setUp(self):
+        self.result = {
+            'flow': 3.5 * u.L/u.s, 'temperature': 20 * u.degC,
+            'heights': np.linspace(0, 20, 11) * u.cm,
+            'concentrations': np.arange(6.).reshape(2, 3) * u.mg/u.L,
+            'counts': np.arange(5), 'number': np.int64(3),
+            'rows': [1 * u.m, (2, None, 'a')], 'coag': floc.PACl}
+
+    def assertSame(self, a, b):
+        if isinstance(a, u.Quantity):
+            self.assertEqual(a.units, b.units)
+            np.testing.assert_array_equal(a.magnitude, b.magnitude)
+        else:
+            np.testing.assert_array_equal(a, b)
+
+    def test_round_trip(self):
+        for binary in (None, True, False):
+            decoded = serialization.loads(
+                serialization.dumps(self.result, binary))
+            self.assertEqual(set(decoded), set(self.result))
+            for name in ('flow', 'temperature', 'heights', 'concentrations',
+                         'number'):
+                self.assertSame(decoded[name], self.result[name])
+            self.assertSame(decoded['rows'][0], 1 * u.m)
+            self.assertEqual(decoded['rows'][1], [2, None, 'a'])
+            self.assertIs(decoded['coag'], floc.PACl)
+
+    def test_arrays(self):
+        text = serialization.dumps({'x': np.arange(5.) * u.m})
+        self.assertEqual(json.loads(text),
+                         {'x': {'magnitude': [0.0, 1.0, 2.0, 3.0, 4.0],
+                                'units': 'm'}})
+        flows = np.random.RandomState(0).rand(3000, 2) * u.L/u.s
+        text = serialization.dumps(flows)
+        self.assertIn('base64', text)
+        decoded = serialization.loads(text)
+        self.assertSame(decoded, flows)
+        decoded[0, 0] = 0 * u.L/u.s
+        self.assertEqual(decoded[0, 0], 0 * u.L/u.s)
+
+    def test_stream(self):
+        flows = np.linspace(0, 1, 3 * serialization.SIZE_CHUNK) * u.L/u.s
+        for binary in (True, False):
+            pieces = list(serialization.iterencode(flows, binary))
+            self.assertGreater(len(pieces), 3)
+            file = io.StringIO()
+            serialization.dump(flows, file, binary)
+            self.assertEqual(file.getvalue(), ''.join(pieces))
+            file.seek(0)
+            self.assertSame(serialization.load(file), flows)
+
+    def test_material(self):
+        sand = floc.Material('Sand', 1e-4, 2650, None)
+        decoded = serialization.loads(serialization.dumps(sand))
+        self.assertIsInstance(decoded, floc.Material)
+        self.assertEqual(vars(decoded), vars(sand))
+        # Objects that aren't tagged with a known class are left as they are.
+        for text in ('{"material": "Chemical", "name": "PACl"}',
+                     '{"__material__": "Pipe", "name": "PVC"}'):
+            self.assertEqual(serialization.loads(text), json.loads(text))
+
+    def test_pc_params(self):
+        params = {'coag': floc.PACl, 'material': floc.Clay,
+                  'ConcClay': 100 * u.mg/u.L,
+                  'pipe': {'material': 'PVC'}}
+        decoded = serialization.loads(serialization.dumps(params))
+        self.assertIs(decoded['coag'], floc.PACl)
+        self.assertIs(decoded['material'], floc.Clay)
+        self.assertSame(decoded['ConcClay'], params['ConcClay'])
+        self.assertEqual(decoded['pipe'], {'material': 'PVC'})
+
+    def test_encode(self):
+        encoded = serialization.encode(self.result)
+        self.assertEqual(encoded['heights']['units'], 'cm')
+        self.assertEqual(json.loads(json.dumps(encoded)), encoded)
+        self.assertSame(serialization.decode(encoded)['concentrations'],
+                        self.result['concentrations'])
+
+    def test_example(self):
+        path = os.path.join(os.path.dirname(serialization.__file__), '..',
+                            'design_request_example.json')
+        with open(path) as file:
+            request = serialization.load(file)['request']
+        self.assertEqual(request['flow_rate'], 3.5 * u.L/u.s)
+        self.assertEqual(request['name'], 'conduction line')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+from aide_design.units import unit_registry as u
+from aide_design import utility as ut
+from aide_design import series
+import numpy as np
+import unittest
+
+
+class SeriesTest(unittest.TestCase):
+    """Test snapping sizes to a series."""
+    def setUp(self):
+        self.series = series.DRILL_METRIC
+        self.sizes = np.random.default_rng(0).uniform(0.5, 50, 1000) * u.mm
+
+    def test_ceil_floor(self):
+        """Snapped sizes should match a search of the whole series."""
+        values = self.series.values.magnitude
+        sizes = self.sizes.magnitude
+        ceil = [values[values >= x - 1e-12].min() for x in sizes]
+        floor = [values[values <= x + 1e-12].max() for x in sizes]
+        np.testing.assert_allclose(self.series.ceil(self.sizes).magnitude,
+                                   ceil)
+        np.testing.assert_allclose(self.series.floor(self.sizes).magnitude,
+                                   floor)
+
+    def test_nearest(self):
+        nearest = self.series.nearest(self.sizes)
+        ceil = self.series.ceil(self.sizes)
+        floor = self.series.floor(self.sizes)
+        np.testing.assert_array_equal(
+            nearest, np.where(abs(ceil - self.sizes) < abs(self.sizes - floor),
+                              ceil, floor) * u.mm)
+
+    def test_out_of_range(self):
+        self.assertRaises(ValueError, self.series.ceil, 60 * u.mm)
+        self.assertRaises(ValueError, self.series.floor, 0.1 * u.mm)
+        self.assertEqual(self.series.ceil(60 * u.mm, 'clip'), 50 * u.mm)
+        self.assertTrue(np.isnan(self.series.floor(0.1 * u.mm,
+                                                   'nan').magnitude))
+
+    def test_legacy_nearest(self):
+        """utility.ceil_nearest and floor_nearest should keep their results,
+        including wrapping around at the ends of the array.
+        """
+        array = np.array([1., 2, 3])
+        for x in (0.5, 1, 1.5, 3, 4):
+            with self.subTest(x=x):
+                self.assertEqual(ut.ceil_nearest(x, array),
+                                 array[np.argmax(array >= x)])
+                self.assertEqual(ut.floor_nearest(x, array),
+                                 array[np.argmax(array >= x) - 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
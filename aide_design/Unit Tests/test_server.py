@@ -0,0 +1,99 @@
+from aide_design import server
+from concurrent import futures
+import asyncio
+import json
+import threading
+import unittest
+
+
+RELEASE = threading.Event()
+CALLS = []
+
+
+def _slow(x):
+    CALLS.append(x)
+    RELEASE.wait(10)
+    if x < 0:
+        raise ValueError("x is negative.")
+    return {'y': 2 * x}
+
+
+async def _post(port, body):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    data = json.dumps(body).encode()
+    writer.write('POST /design HTTP/1.1\r\nContent-Length: {0}\r\n\r\n'.format(
+        len(data)).encode() + data)
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(data)
+
+
+class DesignServerTest(unittest.TestCase):
+    """Test the asyncio design server with a thread pool as the executor."""
+    def setUp(self):
+        server.DESIGNERS['slow'] = _slow
+        RELEASE.clear()
+        del CALLS[:]
+
+    def tearDown(self):
+        del server.DESIGNERS['slow']
+        RELEASE.set()
+
+    def run_server(self, test, size_queue=server.SIZE_QUEUE):
+        async def run():
+            design_server = server.DesignServer(
+                1, size_queue, futures.ThreadPoolExecutor(1))
+            listener = await design_server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                return await test(design_server, port)
+            finally:
+                RELEASE.set()
+                listener.close()
+                await design_server.close()
+        return asyncio.run(run())
+
+    def test_coalescing(self):
+        async def test(design_server, port):
+            requests = [asyncio.ensure_future(_post(port, {'request': {
+                'unit_process': 'slow', 'name': str(i), 'x': 2}}))
+                for i in range(5)]
+            await asyncio.sleep(0.2)
+            RELEASE.set()
+            return await asyncio.gather(*requests), design_server.metrics()
+        responses, metrics = self.run_server(test)
+        self.assertEqual(CALLS, [2])
+        self.assertEqual(responses[3], (200, {'result': {
+            'unit_process': 'slow', 'name': '3', 'y': 4}}))
+        self.assertEqual(metrics['counts']['coalesced'], 4)
+        self.assertEqual(metrics['latency_ms']['count'], 5)
+
+    def test_backpressure(self):
+        async def test(design_server, port):
+            requests = [asyncio.ensure_future(_post(port, {'request': {
+                'unit_process': 'slow', 'x': 0}}))]
+            while not CALLS:
+                await asyncio.sleep(0.01)
+            requests += [asyncio.ensure_future(_post(port, {'request': {
+                'unit_process': 'slow', 'x': i}})) for i in range(1, 4)]
+            await asyncio.sleep(0.2)
+            depth = design_server.metrics()['queue']['depth']
+            RELEASE.set()
+            return [r[0] for r in await asyncio.gather(*requests)], depth
+        statuses, depth = self.run_server(test, size_queue=2)
+        self.assertEqual(depth, 2)
+        self.assertEqual(sorted(statuses), [200, 200, 200, 503])
+
+    def test_errors(self):
+        async def test(design_server, port):
+            RELEASE.set()
+            return [await _post(port, body) for body in (
+                {'request': {'unit_process': 'slow', 'x': -1}},
+                {'request': {'unit_process': 'none'}}, [])]
+        statuses = [response[0] for response in self.run_server(test)]
+        self.assertEqual(statuses, [422, 400, 400])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+from aide_design.units import unit_registry as u
+from aide_design import floc_model as floc
+from aide_design import sweep
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+CALLS = []
+
+
+def _design(ConcAl, ConcClay, coag):
+    CALLS.append(len(ConcAl))
+    return {'pC': floc.pc_viscous(10 * u.mW/u.kg, 20 * u.degC, 10 * u.min,
+                                  1 * u.cm, ConcClay, ConcAl, 1 * u.mg/u.L,
+                                  floc.HumicAcid, coag, floc.Clay, 0.1,
+                                  floc.RATIO_HEIGHT_DIAM),
+            'ratio': (ConcAl / ConcClay).to(u.dimensionless)}
+
+
+class SweepTest(unittest.TestCase):
+    """Test the shared memory parameter sweep runner."""
+    def setUp(self):
+        self.grid = sweep.grid(ConcAl=np.linspace(0.5, 5, 20) * u.mg/u.L,
+                               ConcClay=np.linspace(10, 500, 15) * u.mg/u.L,
+                               coag=[floc.PACl, floc.Alum])
+        self.sweep = sweep.Sweep(_design, self.grid, chunk_size=100)
+        del CALLS[:]
+
+    def test_grid(self):
+        self.assertEqual(len(self.grid['coag']), 600)
+        self.assertEqual(self.grid['coag'][:3], [floc.PACl, floc.Alum,
+                                                 floc.PACl])
+        self.assertEqual(self.grid['ConcAl'][29], 0.5 * u.mg/u.L)
+        self.assertAlmostEqual(self.grid['ConcAl'][30].magnitude, 0.5 + 4.5/19)
+
+    def test_run(self):
+        outputs = self.sweep.run(n_workers=1)
+        pacl = slice(0, 30, 2)
+        expected = floc.pc_viscous(
+            10 * u.mW/u.kg, 20 * u.degC, 10 * u.min, 1 * u.cm,
+            self.grid['ConcClay'][pacl], self.grid['ConcAl'][pacl],
+            1 * u.mg/u.L, floc.HumicAcid, floc.PACl, floc.Clay, 0.1,
+            floc.RATIO_HEIGHT_DIAM)
+        np.testing.assert_allclose(outputs['pC'][pacl], expected)
+        self.assertEqual(outputs['ratio'].units, u.dimensionless)
+        parallel = self.sweep.run(n_workers=2)
+        np.testing.assert_array_equal(parallel['pC'], outputs['pC'])
+
+    def test_checkpoint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            outputs = self.sweep.run(n_workers=1, checkpoint=directory)
+            os.remove(os.path.join(directory, 'chunk_000000000200.npz'))
+            del CALLS[:]
+            resumed = self.sweep.run(n_workers=1, checkpoint=directory)
+            # The probe of the first row and one chunk in two groups.
+            self.assertEqual(CALLS, [1, 50, 50])
+            np.testing.assert_array_equal(resumed['pC'], outputs['pC'])
+            other = sweep.Sweep(_design, self.grid, chunk_size=50)
+            with self.assertRaises(ValueError):
+                other.run(n_workers=1, checkpoint=directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
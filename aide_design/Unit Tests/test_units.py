@@ -0,0 +1,67 @@
+from aide_design.units import unit_registry as u
+from aide_design import physchem as pc
+from aide_design import floc_model as floc
+from aide_design import materials_database as mat
+from concurrent import futures
+import threading
+import unittest
+
+N_THREADS = 32
+N_CALLS = 10
+
+
+def _design(i):
+    """Return results that depend on the contexts and solvers of a thread."""
+    mw = (10 + i) * u.g/u.mol
+    results = []
+    for j in range(N_CALLS):
+        with u.context('chem', mw=mw):
+            results.append((1 * u.mol).to(u.g).magnitude)
+        if i % 4 == 0 and j == 0:
+            # Other threads should keep the default contexts.
+            u.disable_contexts()
+        results.append(pc.flow_pipe(0.1 * u.m, 1 * u.m, 100 * u.m,
+                                    1e-6 * u.m**2/u.s, mat.PIPE_ROUGH_PVC,
+                                    2).magnitude)
+        results.append(floc.pc_viscous(
+            10 * u.mW/u.kg, 20 * u.degC, 10 * u.min, 1 * u.cm,
+            100 * u.NTU, (1 + i % 5) * u.mg/u.L, 1 * u.mg/u.L,
+            floc.HumicAcid, floc.PACl, floc.Clay, 0.1,
+            floc.RATIO_HEIGHT_DIAM))
+    return results, len(u._active_ctx._contexts)
+
+
+def _in_thread(func, *args):
+    """Return func(*args) called in a new thread."""
+    with futures.ThreadPoolExecutor(1) as executor:
+        return executor.submit(func, *args).result()
+
+
+class ThreadContextTest(unittest.TestCase):
+    """Test that contexts are local to a thread and that designs can run in
+    many threads at once.
+    """
+    def test_local(self):
+        default = len(u._active_ctx._contexts)
+        def disable():
+            u.disable_contexts()
+            return len(u._active_ctx._contexts)
+        self.assertEqual(_in_thread(disable), 0)
+        self.assertEqual(len(u._active_ctx._contexts), default)
+        self.assertGreater(default, 0)
+
+    def test_concurrent(self):
+        expected = [_in_thread(_design, i)[0] for i in range(N_THREADS)]
+        barrier = threading.Barrier(N_THREADS)
+        def run(i):
+            barrier.wait()
+            return _design(i)
+        with futures.ThreadPoolExecutor(N_THREADS) as executor:
+            results = list(executor.map(run, range(N_THREADS)))
+        for i, (values, n_contexts) in enumerate(results):
+            self.assertEqual(values, expected[i])
+            self.assertEqual(n_contexts, 0 if i % 4 == 0 else 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+from aide_design.units import unit_registry as u
+from aide_design import utility as ut
+import numpy as np
+import unittest
+
+
+class SigArrayTest(unittest.TestCase):
+    """Test that sig_array formats arrays exactly as sig does."""
+    def setUp(self):
+        rng = np.random.RandomState(3)
+        self.values = np.concatenate([
+            rng.lognormal(0, 6, 500) * rng.choice([-1, 1], 500),
+            10.0**np.arange(-8, 9), [0, 1, 2.5, 55.55, 99.95, 0.0995, 12]])
+
+    def test_numbers(self):
+        for n in range(1, 6):
+            np.testing.assert_array_equal(
+                ut.sig_array(self.values, n),
+                np.array([ut.sig(x, n) for x in self.values]))
+
+    def test_quantities(self):
+        for n in (1, 3):
+            for units in (u.m/u.s, u.degC, u.dimensionless):
+                np.testing.assert_array_equal(
+                    ut.sig_array(self.values * units, n),
+                    np.array([ut.sig(x * units, n) for x in self.values]))
+
+    def test_shape(self):
+        table = ut.sig_array(np.array([[1234.5, 0.01234], [-5, 0]]) * u.m, 2)
+        self.assertEqual(table.tolist(), [['1.2e+3 m', '0.012 m'],
+                                          ['-5.0 m', '0.0']])
+
+
+
+class StepTest(unittest.TestCase):
+    """Test rounding to multiples of a step."""
+    def test_stepceil(self):
+        self.assertEqual(ut.stepceil_with_units(10 * u.m, 1, u.mm),
+                         10000 * u.mm)
+        self.assertEqual(ut.stepceil_with_units(12.01 * u.cm, 5, u.cm),
+                         15 * u.cm)
+        self.assertEqual(ut.stepceil_with_units(0.3 * u.m, 0.1, u.m).magnitude,
+                         0.3)
+        self.assertEqual(ut.stepceil_with_units(1.5 * u.m, 50 * u.cm,
+                                                u.cm).magnitude, 150)
+
+    def test_family(self):
+        lengths = np.array([0.21, 0.25, 0.3, 0.39, -0.05]) * u.m
+        self.assertEqual(ut.stepceil_with_units(lengths, 0.1, u.m)
+                         .magnitude.tolist(), [0.3, 0.3, 0.3, 0.4, 0])
+        self.assertEqual(ut.stepfloor_with_units(lengths, 0.1, u.m)
+                         .magnitude.tolist(), [0.2, 0.2, 0.3, 0.3, -0.1])
+        self.assertEqual(ut.stepround_with_units(lengths, 0.1, u.m)
+                         .magnitude.tolist(), [0.2, 0.3, 0.3, 0.4, 0])
+
+    def test_step_range(self):
+        with self.assertRaises(ValueError):
+            ut.stepceil_with_units(1 * u.m, 0, u.m)
+
+
+class ArangeTest(unittest.TestCase):
+    """Test series of values with units."""
+    def test_arange(self):
+        heights = ut.arange_with_units(7.5 * u.mm, 20 * u.cm, 2 * u.cm)
+        self.assertEqual(heights.units, u.mm)
+        self.assertEqual(heights.magnitude.dtype, np.float64)
+        np.testing.assert_allclose(heights.magnitude,
+                                   np.arange(7.5, 200, 20))
+
+    def test_unit(self):
+        flows = ut.arange_with_units(1, 3, 0.5, u.L/u.s)
+        self.assertEqual(flows.units, u.L/u.s)
+        self.assertEqual(flows.magnitude.tolist(), [1, 1.5, 2, 2.5])
+        self.assertEqual(ut.arange_with_units(0, 3, 1).units, u.dimensionless)
+
+
+class CheckRangeTest(unittest.TestCase):
+    """Test the parameter range checks."""
+    def test_quantities(self):
+        ut.check_range([[1*u.m, 2*u.m], '>0'], [3*u.m, '>0'],
+                       [np.array([1, 2])*u.m, '>0, int'])
+        with self.assertRaises(ValueError):
+            ut.check_range([[1*u.m, -2*u.m], '>0'])
+        quantities = np.array([1*u.m, 2*u.cm], dtype=object)
+        ut.check_range([quantities, '>0'])
+        quantities[1] = -2*u.cm
+        with self.assertRaises(ValueError):
+            ut.check_range([quantities, '>0'])
+
+    def test_not_numbers(self):
+        for values in ([1, None], np.array([1, None], dtype=object), ['a']):
+            with self.assertRaises(TypeError):
+                ut.check_range([values, '>0'])
+        ut.check_range([[True, False], 'boolean'])
+
+    def test_int(self):
+        ut.check_range([np.arange(5), 'int'])
+        for value in (1.5, np.inf, np.nan):
+            with self.assertRaises(TypeError):
+                ut.check_range([[1, value], 'int'])
+
+
+if __name__ == '__main__':
+    unittest.main()
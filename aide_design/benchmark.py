@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Benchmarks of the design functions.
+
+Each workload in WORKLOADS times a representative call at several sizes:
+one scalar call and batches of inputs for the pipe solvers, the pipe
+database lookups, a grid of coagulant and clay doses for pc_viscous, CDC
+tube selection for many plants, LFOM design, series of lengths, writing
+a design result as JSON and the time it takes to import the package. The
+series workloads build a series and sum it both as one Quantity array and
+as an object array of Quantities, the representation the LFOM functions
+used to have, to show the difference. run returns one record per
+workload and size, with the best and median time per call in seconds and
+the peak memory allocated by one call in bytes, which save writes to a
+JSON file. compare checks the records against a saved baseline and
+returns the workloads that became slower by more than a tolerance.
+
+    python -m aide_design.benchmark --output results.json
+    python -m aide_design.benchmark --baseline results.json
+
+exits with status 1 if any workload regressed.
+"""
+
+######################### Imports #########################
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from aide_design.units import unit_registry as u
+
+# Workloads that became slower than the baseline by more than this fraction
+# are reported as regressions.
+TOLERANCE = 0.25
+
+# Number of timing repeats; the best and median of the repeats are kept.
+N_REPEAT = 5
+
+# Smallest total time of the calls in one repeat, in seconds.
+TIME_MIN = 0.05
+
+# Modules whose import is timed by the import workload.
+MODULES_IMPORT = ('aide_design.physchem', 'aide_design.floc_model',
+                  'aide_design.pipedatabase', 'aide_design.cdc_functions')
+
+
+######################## Workloads ########################
+def _pipe_inputs(size):
+    """Return flows, diameters and the fixed pipe inputs for a batch."""
+    from aide_design import materials_database as mat
+    flow = np.linspace(1, 50, size) * u.L/u.s
+    diam = np.linspace(0.05, 0.3, size) * u.m
+    if size == 1:
+        flow, diam = flow[0], diam[0]
+    return flow, diam, 1e-6 * u.m**2/u.s, mat.PIPE_ROUGH_PVC
+
+
+def fric(size):
+    from aide_design import physchem as pc
+    flow, diam, nu, rough = _pipe_inputs(size)
+    return lambda: pc.fric(flow, diam, nu, rough)
+
+
+def flow_pipe(size):
+    from aide_design import physchem as pc
+    flow, diam, nu, rough = _pipe_inputs(size)
+    return lambda: pc.flow_pipe(diam, 1 * u.m, 100 * u.m, nu, rough, 2)
+
+
+def diam_pipe(size):
+    from aide_design import physchem as pc
+    flow, diam, nu, rough = _pipe_inputs(size)
+    return lambda: pc.diam_pipe(flow, 1 * u.m, 100 * u.m, nu, rough, 2)
+
+
+def flow_orifice_vert(size):
+    from aide_design import physchem as pc
+    height = np.linspace(-0.01, 0.2, size) * u.m
+    if size == 1:
+        height = height[-1]
+    return lambda: pc.flow_orifice_vert(2 * u.cm, height, 0.63)
+
+
+def pipe_lookup(size):
+    """Find the SDR 26 pipe for each of size inner diameters."""
+    from aide_design import pipedatabase as pipe
+    diams = np.linspace(0.5, 10, size) * u.inch
+    return lambda: [pipe.ND_SDR_available(diam, 26) for diam in diams]
+
+
+def pc_viscous(size):
+    """Evaluate pc_viscous on a size by size grid of coagulant and clay."""
+    from aide_design import floc_model as floc
+    conc_al = np.linspace(0.5, 5, size)[:, np.newaxis] * u.mg/u.L
+    conc_clay = np.linspace(10, 500, size)[np.newaxis, :] * u.NTU
+    return lambda: floc.pc_viscous(
+        10 * u.mW/u.kg, 20 * u.degC, 10 * u.min, 1 * u.cm, conc_clay,
+        conc_al, 1 * u.mg/u.L, floc.HumicAcid, floc.PACl, floc.Clay, 0.1,
+        floc.RATIO_HEIGHT_DIAM)
+
+
+def cdc_design(size):
+    """Choose the dosing tubes of size plants."""
+    from aide_design import cdc_functions as cdc
+    flow = np.linspace(1, 100, size) * u.L/u.s
+    tubes = cdc._DiamTubeAvail(True)
+    return lambda: cdc.cdc_design(flow, 2 * u.mg/u.L, 51.4 * u.g/u.L, tubes,
+                                  10 * u.cm, 2 * u.m, 2, 2)
+
+
+def lfom_design(size):
+    """Lay out the orifices of size LFOMs."""
+    from aide_design.unit_process_design.prefab import (
+        lfom_prefab_functional as lfom)
+    flows = np.linspace(5, 20, size) * u.L/u.s
+    return lambda: [lfom.lfom_layout(flow, 20 * u.cm, lfom.uomeasure.metric,
+                                     lfom.SDR_LFOM) for flow in flows]
+
+
+def series_quantity(size):
+    """Build and sum a series of size lengths as one Quantity array."""
+    from aide_design import utility as ut
+    return lambda: ut.arange_with_units(0 * u.cm, size * u.cm, 1 * u.cm).sum()
+
+
+def series_object(size):
+    """Build and sum a series of size lengths as an object array of
+    Quantities.
+    """
+    return lambda: np.arange(0 * u.cm, size * u.cm, 1 * u.cm,
+                             dtype=object).sum()
+
+
+def json_dumps(size):
+    """Write a design result with size row heights as JSON."""
+    from aide_design import serialization
+    from aide_design import floc_model as floc
+    result = {'flow': 20 * u.L/u.s, 'coag': floc.PACl,
+              'heights': np.linspace(0, 20, size) * u.cm,
+              'orifices': np.arange(size)}
+    return lambda: serialization.dumps(result)
+
+
+def import_time(size):
+    """Import the package in a fresh interpreter."""
+    command = [sys.executable, '-W', 'ignore', '-c',
+               'import ' + ', '.join(MODULES_IMPORT)]
+    return lambda: subprocess.run(command, check=True)
+
+
+# Names of the workloads, the functions that return a callable to time
+# for a given size, and the sizes they are timed at.
+WORKLOADS = {
+    'fric': (fric, (1, 10, 30)),
+    'flow_pipe': (flow_pipe, (1, 10, 100)),
+    'diam_pipe': (diam_pipe, (1, 10, 100)),
+    'flow_orifice_vert': (flow_orifice_vert, (1, 10, 100)),
+    'pipe_lookup': (pipe_lookup, (1, 10)),
+    'pc_viscous': (pc_viscous, (1, 30, 300)),
+    'cdc_design': (cdc_design, (1, 100, 10000)),
+    'lfom_design': (lfom_design, (1, 10)),
+    'series_quantity': (series_quantity, (10, 1000, 10000)),
+    'series_object': (series_object, (10, 1000, 10000)),
+    'json_dumps': (json_dumps, (10, 1000, 100000)),
+    'import': (import_time, (1,)),
+    }
+
+
+######################### Running #########################
+def measure(func, repeat=N_REPEAT, time_min=TIME_MIN):
+    """Return the best and median time of one call of func, in seconds,
+    and the peak memory allocated during one call, in bytes.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < time_min and number < 10**6:
+        number *= 10
+    times = np.array(timer.repeat(repeat, number)) / number
+    return {'best': times.min(), 'median': np.median(times),
+            'repeat': repeat, 'number': number, 'peak': peak_memory(func)}
+
+
+def peak_memory(func):
+    """Return the peak memory allocated by Python during one call of
+    func, in bytes.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+def run(names=None, repeat=N_REPEAT, time_min=TIME_MIN, log=None):
+    """Time the workloads called names, or all of them if names is None.
+
+    Returns a list of records of name, size, best, median, repeat,
+    number and peak. log is called with each record as it is measured.
+    """
+    unknown = set(names or ()) - set(WORKLOADS)
+    if unknown:
+        raise ValueError("There are no workloads called {0}; the workloads "
+                         "are {1}.".format(sorted(unknown), list(WORKLOADS)))
+    results = []
+    for name, (make, sizes) in WORKLOADS.items():
+        if names and name not in names:
+            continue
+        for size in sizes:
+            record = {'name': name, 'size': size}
+            record.update(measure(make(size), repeat, time_min))
+            results.append(record)
+            if log is not None:
+                log(record)
+    return results
+
+
+def environment():
+    """Return the versions and machine the benchmarks ran on."""
+    import pint
+    import aide_design
+    return {'aide_design': aide_design.__version__,
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'pint': pint.__version__, 'machine': platform.machine(),
+            'processor': platform.processor(), 'system': platform.system(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def save(results, path):
+    """Write results and the environment to the JSON file at path."""
+    with open(path, 'w') as file:
+        json.dump({'environment': environment(), 'results': results}, file,
+                  indent=1, default=float)
+
+
+def load(path):
+    """Return the results saved at path."""
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Return the records of results that are slower than in baseline.
+
+    A workload regressed if its best time is more than 1 + tolerance times
+    its best time in baseline. Each record gains the baseline time and the
+    ratio of the times.
+    """
+    before = {(r['name'], r['size']): r['best'] for r in baseline}
+    regressions = []
+    for record in results:
+        key = (record['name'], record['size'])
+        if key in before and record['best'] > (1 + tolerance) * before[key]:
+            regressions.append(dict(record, baseline=before[key],
+                                    ratio=record['best'] / before[key]))
+    return regressions
+
+
+def _format(record):
+    return ('{name:<20} {size:>7} {best:>12.3e} {median:>12.3e} '
+            '{peak:>12}'.format(**record))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the design functions.")
+    parser.add_argument('names', nargs='*', help="workloads to run")
+    parser.add_argument('--output', help="JSON file to save the results to")
+    parser.add_argument('--baseline', help="JSON file of earlier results")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--repeat', type=int, default=N_REPEAT)
+    args = parser.parse_args(argv)
+    print('{0:<20} {1:>7} {2:>12} {3:>12} {4:>12}'.format(
+        'name', 'size', 'best s', 'median s', 'peak bytes'))
+    results = run(args.names, args.repeat,
+                  log=lambda r: print(_format(r), flush=True))
+    if args.output:
+        save(results, args.output)
+    if args.baseline:
+        regressions = compare(results, load(args.baseline), args.tolerance)
+        for record in regressions:
+            print('{0} {1} regressed: {2:.3e} s against {3:.3e} s '
+                  '({4:.2f}x)'.format(record['name'], record['size'],
+                                      record['best'], record['baseline'],
+                                      record['ratio']))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
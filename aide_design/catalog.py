@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Catalog of standard designs precomputed on a grid of plant flows.
+
+Catalog.build designs the LFOM, CDC, flocculator and a pipe of a plant at
+every flow of a grid, by default N_FLOWS flows evenly spaced on a log scale
+from FLOW_MIN to expert_inputs.FLOW_TRAIN_MAX, in a pool of processes.
+save writes the designs to a compressed .npz file with one array per
+output of each design, and load reads them back.
+
+query answers a new plant flow at once. The discrete outputs of each
+design, such as pipe sizes, drill sizes and numbers of orifices or tubes,
+are those of the cataloged design at the nearest flow. The continuous
+outputs, such as tube lengths and volumes, are interpolated between the
+designs at the flows on either side. A design is valid if the flow is
+inside the grid and the designs on either side have the same discrete
+outputs, so the nearest design is the one that designing for the flow
+itself would give. An LFOM is sized to its flow and its orifice counts
+change at almost every flow, so an LFOM is valid instead if its flow error
+at the new flow is at most ERROR_LFOM_EXTRA more than at the flow it was
+designed for. Designs that can't be made at a flow, such as LFOMs that
+need orifices larger than the largest drill, are recorded with their
+error and are never valid.
+
+    catalog = Catalog.build(n_workers=4)
+    catalog.save('standard_designs.npz')
+    quote = Catalog.load('standard_designs.npz').query(12.3 * u.L/u.s)
+"""
+
+######################### Imports #########################
+import collections
+import json
+from concurrent import futures
+
+import numpy as np
+
+from aide_design.units import unit_registry as u
+from aide_design import utility as ut
+from aide_design import physchem as pc
+from aide_design import pipedatabase as pipe
+from aide_design import materials_database as mat
+from aide_design import cdc_functions as cdc
+from aide_design import expert_inputs as ex
+from aide_design.unit_process_design.prefab import (
+    lfom_prefab_functional as lf)
+
+# The smallest flow of the default grid.
+FLOW_MIN = 1 * u.L/u.s
+
+# Number of flows in the default grid. Neighbouring flows differ by 2.5%.
+N_FLOWS = 200
+
+# Inputs of the cataloged designs that aren't in expert_inputs. The pipe is
+# the conduction line of design_request_example.json.
+CONC_COAG_DOSE_MAX = 2 * u.mg/u.L
+LENGTH_CDC_TUBE_MAX = 2 * u.m
+EN_COAG = 1
+LENGTH_PIPE = 4 * u.m
+HEADLOSS_PIPE = 30 * u.cm
+SDR_PIPE = 26
+TEMP_PIPE = 20 * u.degC
+
+# How much larger the flow error of an LFOM at a queried flow may be than
+# at the flow it was designed for, and the number of water levels the
+# error is found at.
+ERROR_LFOM_EXTRA = 0.02
+N_LEVELS_LFOM = 200
+
+
+######################## Designs ########################
+def design_lfom(FlowPlant):
+    """Return the LFOM of a plant. HeightRows and NumOrifices have
+    expert_inputs.RATIO_LFOM_ORIFICE rows, padded with NaN and 0.
+    """
+    HL_LFOM = ex.HEADLOSS_LFOM_MIN
+    D, H_rows, N = lf.lfom_layout(FlowPlant, HL_LFOM, lf.uomeasure.metric,
+                                  lf.SDR_LFOM)
+    rating = lf.lfom_rating(FlowPlant, HL_LFOM, D, H_rows[np.newaxis],
+                            N[np.newaxis], N_LEVELS_LFOM)
+    return {'NomDiam': lf.nom_diam_lfom_pipe(FlowPlant, HL_LFOM,
+                                             lf.Pi_LFOM_safety,
+                                             lf.SDR_LFOM).to(u.inch),
+            'DiamOrifice': D.to(u.mm),
+            'HeightRows': _pad(H_rows.to(u.cm), np.nan),
+            'NumOrifices': _pad(N, 0),
+            'ErrorMax': float(rating['error_max'][0])}
+
+
+def _pad(x, fill):
+    """Return x padded with fill to RATIO_LFOM_ORIFICE values."""
+    n_pad = int(ex.RATIO_LFOM_ORIFICE) - len(x)
+    if isinstance(x, u.Quantity):
+        return u.Quantity(np.append(x.magnitude, np.full(n_pad, fill)),
+                          x.units)
+    return np.append(x, np.full(n_pad, fill, dtype=x.dtype))
+
+
+def _check_lfom(FlowPlant, design):
+    """Return whether the flow error of a cataloged LFOM at FlowPlant is at
+    most ERROR_LFOM_EXTRA more than at the flow it was designed for.
+    """
+    rows = ~np.isnan(design['HeightRows'].magnitude)
+    rating = lf.lfom_rating(FlowPlant, ex.HEADLOSS_LFOM_MIN,
+                            design['DiamOrifice'],
+                            design['HeightRows'][rows][np.newaxis],
+                            design['NumOrifices'][rows][np.newaxis],
+                            N_LEVELS_LFOM)
+    return float(rating['error_max'][0]) <= (design['ErrorMax']
+                                             + ERROR_LFOM_EXTRA)
+
+
+def design_cdc(FlowPlant):
+    """Return the dosing tubes of the coagulant CDC of a plant."""
+    design = cdc.cdc_design(FlowPlant, CONC_COAG_DOSE_MAX,
+                            ex.CONC_COAG_STOCK_EST, cdc.DIAM_ENGLISH_TUBE_AVAIL,
+                            ex.HEADLOSS_CDC, LENGTH_CDC_TUBE_MAX, EN_COAG,
+                            ex.K_MINOR_CDC_TUBE)
+    return {'DiamTube': design['DiamTube'].to(u.inch),
+            'NumTube': int(design['NumTube']),
+            'LenTube': design['LenTube'].to(u.m)}
+
+
+def design_floc(FlowPlant):
+    """Return the residence time, volume and head loss of a flocculator
+    that meets the collision potential and energy dissipation rate of the
+    basis of design.
+    """
+    Time = (ex.COLL_POT_FLOC_BOD / ex.ENERGY_DIS_FLOC_BOD**(1/3)).to(u.s)
+    return {'Time': Time,
+            'Volume': (FlowPlant * Time).to(u.m**3),
+            'HeadLoss': (ex.ENERGY_DIS_FLOC_BOD * Time / pc.gravity).to(u.cm)}
+
+
+def design_pipe(FlowPlant):
+    """Return the smallest SDR_PIPE pipe whose head loss over LENGTH_PIPE
+    is at most HEADLOSS_PIPE.
+    """
+    Nu = pc.viscosity_kinematic(TEMP_PIPE)
+    Diam = pc.diam_pipe(FlowPlant, HEADLOSS_PIPE, LENGTH_PIPE, Nu,
+                        mat.PIPE_ROUGH_PVC, 0)
+    NomDiam = pipe.ND_SDR_available(Diam, SDR_PIPE)
+    InnerDiam = pipe.ID_SDR(NomDiam, SDR_PIPE)
+    return {'NomDiam': NomDiam.to(u.inch), 'InnerDiam': InnerDiam.to(u.mm),
+            'HeadLoss': pc.headloss(FlowPlant, InnerDiam, LENGTH_PIPE, Nu,
+                                    mat.PIPE_ROUGH_PVC, 0).to(u.cm)}
+
+
+# A design function of the plant flow, the names of its discrete outputs
+# and an optional check of a cataloged design at a new flow, which replaces
+# the comparison of the designs on either side.
+Component = collections.namedtuple('Component', ('design', 'discrete',
+                                                 'check'))
+
+COMPONENTS = {
+    'lfom': Component(design_lfom, ('NomDiam', 'DiamOrifice', 'HeightRows',
+                                    'NumOrifices', 'ErrorMax'), _check_lfom),
+    'cdc': Component(design_cdc, ('DiamTube', 'NumTube'), None),
+    'floc': Component(design_floc, (), None),
+    'pipe': Component(design_pipe, ('NomDiam', 'InnerDiam'), None),
+    }
+
+
+def flow_grid(n_flows=N_FLOWS, FlowMin=FLOW_MIN, FlowMax=None):
+    """Return n_flows flows evenly spaced on a log scale from FlowMin to
+    FlowMax, which defaults to expert_inputs.FLOW_TRAIN_MAX.
+    """
+    if FlowMax is None:
+        FlowMax = ex.FLOW_TRAIN_MAX
+    ut.check_range([n_flows - 1, ">0, int", "Number of flows less one"])
+    FlowMin = FlowMin.to(u.L/u.s).magnitude
+    FlowMax = FlowMax.to(u.L/u.s).magnitude
+    ut.check_range([FlowMin, ">0", "Smallest flow"],
+                   [FlowMax - FlowMin, ">0", "Range of flows"])
+    return np.geomspace(FlowMin, FlowMax, n_flows) * u.L/u.s
+
+
+def _design_chunk(names, flows):
+    """Return the designs of the components called names at flows, in
+    m³/s. Designs that can't be made are replaced by their error.
+    """
+    designs = {name: [] for name in names}
+    for flow in flows:
+        for name in names:
+            try:
+                design = COMPONENTS[name].design(flow * u.m**3/u.s)
+            except ValueError as error:
+                design = str(error)
+            designs[name].append(design)
+    return designs
+
+
+def _stack(designs):
+    """Return a list of the designs of one component at every flow as
+    arrays of the outputs at every flow, and the units of the outputs.
+    """
+    made = [design for design in designs if not isinstance(design, str)]
+    if not made:
+        return {}, {}
+    arrays, units = {}, {}
+    for field, value in made[0].items():
+        if isinstance(value, u.Quantity):
+            units[field] = '{:~}'.format(value.units)
+            values = [np.asarray(design[field].to(value.units).magnitude,
+                                 dtype=float) if design is not None else None
+                      for design in _or_none(designs)]
+            fill = np.nan
+        else:
+            units[field] = None
+            values = [np.asarray(design[field]) if design is not None
+                      else None for design in _or_none(designs)]
+            fill = 0
+        shape = np.shape(next(v for v in values if v is not None))
+        dtype = np.result_type(*[v for v in values if v is not None])
+        arrays[field] = np.stack([np.full(shape, fill, dtype) if v is None
+                                  else v for v in values])
+    return arrays, units
+
+
+def _or_none(designs):
+    return [None if isinstance(design, str) else design for design in designs]
+
+
+######################### Catalog #########################
+class Catalog:
+    """Designs of the components in COMPONENTS at a grid of flows.
+
+    flows are magnitudes in m³/s. Each component has the arrays of its
+    outputs at every flow, their units, whether it could be designed at
+    every flow and the error where it couldn't.
+    """
+    def __init__(self, flows, components):
+        self.flows = np.asarray(flows, dtype=float)
+        self.components = components
+
+    @classmethod
+    def build(cls, flows=None, names=None, n_workers=1, chunk_size=16):
+        """Design the components called names, or all of COMPONENTS, at
+        every flow, which defaults to flow_grid(), in n_workers processes.
+        """
+        if flows is None:
+            flows = flow_grid()
+        if names is None:
+            names = list(COMPONENTS)
+        unknown = set(names) - set(COMPONENTS)
+        if unknown:
+            raise ValueError("There are no components called {0}; the "
+                             "components are {1}.".format(sorted(unknown),
+                                                          list(COMPONENTS)))
+        ut.check_range([n_workers, ">0, int", "Number of workers"],
+                       [chunk_size, ">0, int", "Chunk size"])
+        flows = np.sort(np.ravel(flows.to(u.m**3/u.s).magnitude))
+        chunks = [flows[start:start + chunk_size]
+                  for start in range(0, len(flows), chunk_size)]
+        if n_workers == 1:
+            results = [_design_chunk(names, chunk) for chunk in chunks]
+        else:
+            with futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+                results = list(executor.map(_design_chunk,
+                                            [names] * len(chunks), chunks))
+        components = {}
+        for name in names:
+            designs = [design for result in results for design in result[name]]
+            arrays, units = _stack(designs)
+            components[name] = {
+                'arrays': arrays, 'units': units,
+                'available': np.array([not isinstance(design, str)
+                                       for design in designs]),
+                'errors': np.array([design if isinstance(design, str) else ''
+                                    for design in designs])}
+        return cls(flows, components)
+
+    def save(self, path):
+        """Write the catalog to a compressed .npz file."""
+        arrays = {'flows': self.flows}
+        header = {}
+        for name, component in self.components.items():
+            header[name] = component['units']
+            arrays[name + '.available'] = component['available']
+            arrays[name + '.errors'] = component['errors']
+            for field, values in component['arrays'].items():
+                arrays[name + '.' + field] = values
+        arrays['header'] = np.array(json.dumps(header))
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Return the catalog saved at path."""
+        with np.load(path) as data:
+            header = json.loads(str(data['header']))
+            components = {}
+            for name, units in header.items():
+                components[name] = {
+                    'arrays': {field: data[name + '.' + field]
+                               for field in units},
+                    'units': units,
+                    'available': data[name + '.available'],
+                    'errors': data[name + '.errors']}
+            return cls(data['flows'], components)
+
+    def query(self, FlowPlant):
+        """Return the cataloged designs for a plant flow.
+
+        The result has the flow, the nearest cataloged flow, whether every
+        design is valid and a dictionary of the outputs of each component
+        together with whether it is valid, or with the error if the
+        component couldn't be designed at the nearest flow.
+        """
+        flow = FlowPlant.to(u.m**3/u.s).magnitude
+        ut.check_range([flow, ">0", "Flow rate"])
+        flows = self.flows
+        above = min(np.searchsorted(flows, flow), len(flows) - 1)
+        below = max(above - 1, 0)
+        if flow < flows[below]:
+            above = below
+        nearest = below if flow - flows[below] <= flows[above] - flow else above
+        # A flow converted from other units may differ from the cataloged
+        # flow it was taken from in the last digits.
+        if np.isclose(flow, flows[nearest], rtol=1e-12, atol=0):
+            flow = flows[nearest]
+            below = above = nearest
+        weight = 0 if above == below else ((flow - flows[below])
+                                           / (flows[above] - flows[below]))
+        inside = flows[0] <= flow <= flows[-1]
+        result = {'FlowPlant': FlowPlant,
+                  'FlowCatalog': (flows[nearest] * u.m**3/u.s).to(
+                      FlowPlant.units),
+                  'valid': True}
+        for name, component in self.components.items():
+            spec = COMPONENTS[name]
+            available = component['available']
+            if not available[nearest]:
+                result[name] = {'valid': False,
+                                'error': str(component['errors'][nearest])}
+                result['valid'] = False
+                continue
+            arrays = component['arrays']
+            same = bool(available[below] and available[above] and all(
+                np.array_equal(arrays[field][below], arrays[field][above],
+                               equal_nan=True)
+                for field in spec.discrete))
+            design = {}
+            for field, values in arrays.items():
+                if field in spec.discrete or not same:
+                    value = values[nearest]
+                else:
+                    value = values[below] + weight * (values[above]
+                                                      - values[below])
+                units = component['units'][field]
+                design[field] = value if units is None else u.Quantity(
+                    value, units)
+            if spec.check is None:
+                valid = inside and same
+            else:
+                valid = inside and bool(spec.check(FlowPlant, design))
+            design['valid'] = valid
+            result[name] = design
+            result['valid'] = result['valid'] and valid
+        return result
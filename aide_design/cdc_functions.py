@@ -18,6 +18,10 @@ from aide_design import utility as ut
 
 from aide_design import expert_inputs as exp
 
+from aide_design import fluids
+
+from aide_design import params
+
 #==============================================================================
 # Functions for Coagulant Viscosities and Selecting Available Tube Diameters
 #==============================================================================
@@ -38,29 +42,27 @@ def _DiamTubeAvail(en_tube_series = True):
 
 NU_WATER = 1*(u.mm**2/u.s)
 
+# The viscosity of the stock is relative to NU_WATER rather than to water at
+# the stock temperature. aide_design.fluids has the temperature dependent
+# properties.
 @u.wraps(u.m**2/u.s, [u.kg/u.m**3], False)
 def _nu_alum(conc_alum):
-    nu = (1 + (4.255 * 10**-6) * conc_alum**2.289) * NU_WATER
-    return nu.to(u.mm**2/u.s)
-    
-    return nu
+    return fluids.ALUM.ratio_nu(conc_alum) * NU_WATER.to(u.m**2/u.s).magnitude
 
 
 @u.wraps(u.m**2/u.s, [u.kg/u.m**3], False)   
 def _nu_pacl(conc_pacl):
-    nu = (1 + (2.383 * 10**-5) * conc_pacl**1.893) * NU_WATER
-    return nu.to(u.mm**2/u.s)
-    
-    return nu
+    return fluids.PACL.ratio_nu(conc_pacl) * NU_WATER.to(u.m**2/u.s).magnitude
 
 
+# en_chem is 0 for alum and 1 for PACl; anything else has the viscosity of
+# water.
 @u.wraps(u.m**2/u.s, [u.kg/u.m**3, None], False)    
 def _nu_chem(conc_chem, en_chem):
-    if en_chem == 0:
-        return _nu_alum(conc_chem)
-        return _nu_pacl(conc_chem)
-    else:
-        return NU_WATER
+    en_chem = np.asarray(en_chem)
+    return np.where(en_chem == 0, _nu_alum(conc_chem).magnitude,
+                    np.where(en_chem == 1, _nu_pacl(conc_chem).magnitude,
+                             NU_WATER.to(u.m**2/u.s).magnitude))
 
   
     
@@ -72,14 +74,10 @@ def _nu_chem(conc_chem, en_chem):
 # Maximum flow that can be put through a tube of a given diameter without 
 # exceeding the allowable deviation from linear head loss behavior
 
-@u.wraps(u.L/u.s, [u.m, u.m], False)
 @u.wraps(u.m**3/u.s, [u.m, u.m], False)
 def _flow_available(Diam, HeadlossCDC):
-    flow = math.pi * Diam**2 / 4 * (((
-                2 * exp.RATIO_LINEAR_CDC_ERROR * HeadlossCDC * pc.gravity)/
-                    exp.K_MINOR_CDC_TUBE)**1/2)
     sqrt = 2 * exp.RATIO_LINEAR_CDC_ERROR * HeadlossCDC * pc.gravity.magnitude / exp.K_MINOR_CDC_TUBE
-    flow = math.pi * Diam**2 / 4 * (sqrt**0.5)
+    flow = np.pi * np.asarray(Diam)**2 / 4 * (sqrt**0.5)
     return flow
 
 
@@ -108,25 +106,18 @@ def _len_tube(Flow, Diam, HeadLoss, Nu, KMinor):
 @u.wraps(None, [u.m**3/u.s, u.kg/u.m**3, u.kg/u.m**3, u.m, u.m], False)
 def _n_tube_array(FlowPlant, ConcDoseMax, ConcStock, 
                   DiamTubeAvail, HeadlossCDC): 
-    
-    np.ceil((FlowPlant * ConcDoseMax
-               )/ ConcStock*_flow_available(DiamTubeAvail, HeadlossCDC).magnitude) 
     return np.ceil((FlowPlant * ConcDoseMax) / 
             (ConcStock * _flow_available(DiamTubeAvail, HeadlossCDC).magnitude)) 
 
 
 @u.wraps(u.m**3/u.s, [u.m**3/u.s, u.kg/u.m**3, u.kg/u.m**3], False)
 def _flow_chem_stock(FlowPlant, ConcDoseMax, ConcStock):
-    FlowPlant * ConcDoseMax / ConcStock 
     return FlowPlant * ConcDoseMax / ConcStock 
     
 
 @u.wraps(u.m**3/u.s, [u.m**3/u.s, u.kg/u.m**3, u.kg/u.m**3, u.m, u.m], False)
 def _flow_cdc_tube(FlowPlant, ConcDoseMax, ConcStock, 
                    DiamTubeAvail, HeadlossCDC):
-    
-    (_flow_chem_stock(FlowPlant, ConcDoseMax, ConcStock)
-     ) / (_n_tube_array(FlowPlant, ConcDoseMax, ConcStock, DiamTubeAvail, HeadlossCDC))
     return (_flow_chem_stock(FlowPlant, ConcDoseMax, ConcStock).magnitude
             ) / (_n_tube_array(FlowPlant, ConcDoseMax, ConcStock, 
                         DiamTubeAvail, HeadlossCDC))
@@ -135,38 +126,87 @@ def _flow_cdc_tube(FlowPlant, ConcDoseMax, ConcStock,
     
 # Calculate the length of each diameter tube given the corresponding flow rate
 # and coagulant 
-# Choose the tube that is shorter than the maximum length tube.
 @u.wraps(u.m, [u.m**3/u.s, u.kg/u.m**3, u.kg/u.m**3, u.m, u.m, None, None], False)
 def _length_cdc_tube_array(FlowPlant, ConcDoseMax, ConcStock, 
                            DiamTubeAvail, HeadlossCDC, ENCoag, MinorLossCDCTube):
-    
     Flow = _flow_cdc_tube(FlowPlant, ConcDoseMax, ConcStock, DiamTubeAvail, HeadlossCDC).magnitude
     Nu =  _nu_chem(ConcStock, ENCoag).magnitude
-    
     return _len_tube(Flow, DiamTubeAvail, HeadlossCDC, Nu, MinorLossCDCTube).magnitude
     
 
+#==============================================================================
+# Vectorized Design of the Dosing Tubes
+#==============================================================================
+
+# The arguments of the dose controller design functions, which all accept a
+# CDCParams in place of their arguments.
+CDCParams = params.param_set('CDCParams', (
+    ('FlowPlant', u.m**3/u.s), ('ConcDoseMax', u.kg/u.m**3),
+    ('ConcStock', u.kg/u.m**3), ('DiamTubeAvail', u.m), ('HeadlossCDC', u.m),
+    ('LenCDCTubeMax', u.m), ('ENCoag', None), ('MinorLossCDCTube', None)))
+
+
+# The candidate tube diameters are the last axis of every array in the
+# design. FlowPlant, ConcDoseMax, ConcStock and ENCoag can be arrays of any
+# broadcastable shape, so many plants and chemicals are designed at once.
+@params.accepts(CDCParams)
+@u.wraps(None, [u.m**3/u.s, u.kg/u.m**3, u.kg/u.m**3, u.m, u.m, u.m, None, None], False)
+def cdc_design(FlowPlant, ConcDoseMax, ConcStock, 
+               DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
+               ENCoag, MinorLossCDCTube):
+    """Return the tube diameter, length and number of tubes of a CDC.
+
+    Every candidate diameter in DiamTubeAvail is evaluated in one pass.
+    The chosen tube is the largest diameter whose length is shorter than
+    LenCDCTubeMax. If even the smallest tube is too long, the smallest
+    tube is chosen and its length is longer than LenCDCTubeMax.
+
+    The result is a dictionary of DiamTube, LenTube, NumTube and index,
+    the index of DiamTube in DiamTubeAvail, with the broadcast shape of
+    FlowPlant, ConcDoseMax, ConcStock and ENCoag.
+    """
+    ut.check_range([FlowPlant, ">0", "Flow rate"],
+                   [ConcDoseMax, ">0", "Maximum dose"],
+                   [ConcStock, ">0", "Stock concentration"],
+                   [DiamTubeAvail, ">0", "Tube diameter"],
+                   [HeadlossCDC, ">0", "Head loss"],
+                   [LenCDCTubeMax, ">0", "Maximum tube length"],
+                   [MinorLossCDCTube, ">=0", "Minor loss coefficient"])
+    DiamTubeAvail = np.atleast_1d(DiamTubeAvail)
+    FlowChem = np.asarray(FlowPlant * ConcDoseMax / ConcStock)[..., np.newaxis]
+    Nu = np.asarray(_nu_chem(ConcStock, ENCoag).magnitude)
+    if Nu.ndim > 0:
+        Nu = Nu[..., np.newaxis]
+    NumTube = np.ceil(FlowChem / _flow_available(DiamTubeAvail, 
+                                                 HeadlossCDC).magnitude)
+    FlowTube = FlowChem / NumTube
+    LenTube = ((pc.gravity.magnitude * HeadlossCDC * np.pi * DiamTubeAvail**4)
+               / (128 * Nu * FlowTube)
+               - (FlowTube * MinorLossCDCTube) / (16 * np.pi * Nu))
+    LenTube, NumTube = np.broadcast_arrays(LenTube, NumTube)
+    # Rounding up the number of tubes can make a larger tube shorter than a
+    # smaller one, so the chosen tube is the last one that is short enough.
+    feasible = LenTube < LenCDCTubeMax
+    index = np.where(np.any(feasible, axis=-1),
+                     len(DiamTubeAvail) - 1
+                     - np.argmax(feasible[..., ::-1], axis=-1),
+                     0)
+    pick = index[..., np.newaxis]
+    return {'DiamTube': DiamTubeAvail[index] * u.m,
+            'LenTube': np.take_along_axis(LenTube, pick, -1)[..., 0] * u.m,
+            'NumTube': np.take_along_axis(NumTube, pick, -1)[..., 0],
+            'index': index}
+
+
 # Find the index of that tube
+@params.accepts(CDCParams)
 @u.wraps(None, [u.m**3/u.s, u.kg/u.m**3, u.kg/u.m**3, u.m, u.m, u.m, None, None], False)
 def i_cdc(FlowPlant, ConcDoseMax, ConcStock, 
           DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
           ENCoag, MinorLossCDCTube):
-    
-    tube_array = _length_cdc_tube_array(FlowPlant, ConcDoseMax, ConcStock, 
-                                        DiamTubeAvail, HeadlossCDC, ENCoag, 
-                                        MinorLossCDCTube) 
-    
-    print(tube_array[0].magnitude)
-    print(LenCDCTubeMax)
-    
-    if tube_array[0].magnitude < float(LenCDCTubeMax):
-        y = ut.floor_nearest(LenCDCTubeMax,tube_array)
-        x = (tube_array.index(y)).magnitude
-    
-    else:
-        x = 0
-    
-    return x
+    return cdc_design(FlowPlant, ConcDoseMax, ConcStock, 
+                      DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
+                      ENCoag, MinorLossCDCTube)['index']
 
 
 
@@ -175,49 +215,34 @@ def i_cdc(FlowPlant, ConcDoseMax, ConcStock,
 #==============================================================================
 #The length of tubing may be longer than the max specified if the stock concentration is too
 # high to give a viable solution with the specified length of tubing.
+@params.accepts(CDCParams)
 @u.wraps(u.m, [u.m**3/u.s, u.kg/u.m**3, u.kg/u.m**3, u.m, u.m, u.m, None, None], False)
 def len_cdc_tube(FlowPlant, ConcDoseMax, ConcStock, 
                  DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
                  ENCoag, MinorLossCDCTube):
-   
-    index = i_cdc(FlowPlant, ConcDoseMax, ConcStock, 
-                DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
-                ENCoag, MinorLossCDCTube)
-    
-    len_cdc_tube = (_length_cdc_tube_array(FlowPlant, ConcDoseMax, ConcStock, 
-                                        DiamTubeAvail, HeadlossCDC, ENCoag, 
-                                        MinorLossCDCTube))[index].magnitude
-   
-    return len_cdc_tube
+    return cdc_design(FlowPlant, ConcDoseMax, ConcStock, 
+                      DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
+                      ENCoag, MinorLossCDCTube)['LenTube'].magnitude
 
 
+@params.accepts(CDCParams)
 @u.wraps(u.m, [u.m**3/u.s, u.kg/u.m**3, u.kg/u.m**3, u.m, u.m, u.m, None, None], False)
 def diam_cdc_tube(FlowPlant, ConcDoseMax, ConcStock, 
                   DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
                   ENCoag, MinorLossCDCTube):
-     
-    index = i_cdc(FlowPlant, ConcDoseMax, ConcStock, 
-                   DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
-                   ENCoag, MinorLossCDCTube)
-    
-    diam_cdc_tube = DiamTubeAvail[index]
-     
-    return diam_cdc_tube
+    return cdc_design(FlowPlant, ConcDoseMax, ConcStock, 
+                      DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
+                      ENCoag, MinorLossCDCTube)['DiamTube'].magnitude
  
 
+@params.accepts(CDCParams)
 @u.wraps(None, [u.m**3/u.s, u.kg/u.m**3, u.kg/u.m**3, u.m, u.m, u.m, None, None], False)    
 def n_cdc_tube(FlowPlant, ConcDoseMax, ConcStock, 
           DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
           ENCoag, MinorLossCDCTube):
-    
-    index = i_cdc(FlowPlant, ConcDoseMax, ConcStock, 
-                  DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
-                  ENCoag, MinorLossCDCTube)
-    
-    n_cdc_tube = _n_tube_array(FlowPlant, ConcDoseMax, ConcStock, 
-                  DiamTubeAvail, HeadlossCDC)[index]
-    
-    return n_cdc_tube
+    return cdc_design(FlowPlant, ConcDoseMax, ConcStock, 
+                      DiamTubeAvail, HeadlossCDC, LenCDCTubeMax, 
+                      ENCoag, MinorLossCDCTube)['NumTube']
 
 
 
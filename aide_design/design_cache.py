@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Persistent cache of design results.
+
+Batch runs design the same LFOMs, dosing tubes and pipes for many plants.
+A DesignCache keeps the results on disk, in a local SQLite database, keyed
+by a hash of the function name, its inputs in base units and the package
+version, so a result computed by one run or one worker is reused by all of
+them and a new version of the package never returns stale results.
+
+The database is in WAL mode and every write is its own short transaction,
+so the workers of a process pool can share one cache file. Lookups only
+read; each connection counts its hits and misses and the times its results
+were used in memory, and writes them with the next store, every
+FLUSH_LOOKUPS lookups, and on stats and close. When the stored results
+grow beyond max_bytes, the least recently used are deleted. stats returns
+the hits and misses of every process that has used the file.
+
+Functions are cached with the memoize decorator, or in place with install,
+which replaces the functions listed in CACHED_FUNCTIONS in their modules
+until uninstall is called:
+
+    cache = DesignCache('designs.sqlite')
+    cache.install()
+    ...
+    cache.uninstall()
+"""
+
+######################### Imports #########################
+import contextlib
+import functools
+import hashlib
+import importlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import aide_design
+from aide_design import params
+
+# Default location of the cache file.
+PATH_DEFAULT = os.path.join(os.path.expanduser('~'), '.cache', 'aide_design',
+                            'designs.sqlite')
+
+# Default bound on the total size of the pickled results, in bytes.
+SIZE_MAX = 256 * 2**20
+
+# Seconds a writer waits for another process to finish its transaction.
+TIMEOUT = 60
+
+# Lookups a connection counts in memory before writing the counts.
+FLUSH_LOOKUPS = 100
+
+# The solvers, pipe lookups and unit process designers that install caches,
+# as (module, function names) pairs.
+CACHED_FUNCTIONS = (
+    ('aide_design.physchem', ('flow_pipe', 'diam_pipe')),
+    ('aide_design.pipedatabase', ('ID_SDR_all_available', 'ND_SDR_available',
+                                  'ND_available')),
+    ('aide_design.cdc_functions', ('cdc_design',)),
+    ('aide_design.floc_coil_design', ('coil_designs',)),
+    ('aide_design.unit_process_design.prefab.lfom_prefab_functional',
+     ('lfom_layout', 'optimize_lfom')),
+    )
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+    "value BLOB NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS results_used ON results (used)",
+    "CREATE TABLE IF NOT EXISTS counts (name TEXT PRIMARY KEY, "
+    "count INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO counts VALUES ('hits', 0), ('misses', 0), "
+    "('bytes', 0)",
+    )
+
+
+class DesignCache:
+    """A size bounded, least recently used cache of results in SQLite.
+
+    Each thread and each process opens its own connection, so a cache can
+    be passed to the workers of a process pool.
+    """
+    def __init__(self, path=PATH_DEFAULT, max_bytes=SIZE_MAX,
+                 version=aide_design.__version__):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes is {0} but must be greater than "
+                             "0.".format(max_bytes))
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version
+        self._local = threading.local()
+        self._installed = []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        state['_installed'] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connection(self):
+        """Return the connection of this thread, opening it if needed."""
+        if getattr(self._local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=TIMEOUT,
+                                 isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            with _transaction(db):
+                for statement in _SCHEMA:
+                    db.execute(statement)
+            self._local.db = db
+            self._local.pid = os.getpid()
+            self._local.counts = {'hits': 0, 'misses': 0}
+            self._local.used = {}
+        return self._local.db
+
+    def _flush(self, db):
+        """Write the counts and use times of the lookups of this thread in
+        the open transaction.
+        """
+        db.executemany("UPDATE counts SET count = count + ? WHERE name = ?",
+                       [(count, name) for name, count
+                        in self._local.counts.items() if count])
+        db.executemany("UPDATE results SET used = ? WHERE key = ?",
+                       [(used, key) for key, used
+                        in self._local.used.items()])
+        self._local.counts = {'hits': 0, 'misses': 0}
+        self._local.used = {}
+
+    def key(self, name, args=(), kwargs=None):
+        """Return the key of a call of the function called name."""
+        text = params.canonical((self.version, name, tuple(args),
+                                 kwargs or {}))
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def lookup(self, key):
+        """Return (True, result) if key is in the cache and (False, None)
+        if not.
+        """
+        db = self._connection()
+        row = db.execute("SELECT value FROM results WHERE key = ?",
+                         (key,)).fetchone()
+        counts = self._local.counts
+        if row is None:
+            counts['misses'] += 1
+        else:
+            counts['hits'] += 1
+            self._local.used[key] = time.time()
+        if counts['hits'] + counts['misses'] >= FLUSH_LOOKUPS:
+            with _transaction(db):
+                self._flush(db)
+        if row is None:
+            return False, None
+        return True, pickle.loads(row[0])
+
+    def store(self, key, result):
+        """Store result under key, evicting the least recently used results
+        if the cache grows beyond max_bytes.
+        """
+        value = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(value) > self.max_bytes:
+            return
+        db = self._connection()
+        with _transaction(db):
+            self._flush(db)
+            old = db.execute("SELECT size FROM results WHERE key = ?",
+                             (key,)).fetchone()
+            db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                       (key, value, len(value), time.time()))
+            size = len(value) - (old[0] if old else 0)
+            # UPDATE ... RETURNING would need SQLite 3.35; the transaction
+            # keeps the two statements together.
+            db.execute("UPDATE counts SET count = count + ? "
+                       "WHERE name = 'bytes'", (size,))
+            total = db.execute("SELECT count FROM counts "
+                               "WHERE name = 'bytes'").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(db, total - self.max_bytes)
+
+    @staticmethod
+    def _evict(db, excess):
+        """Delete the least recently used results that hold excess bytes."""
+        keys = []
+        freed = 0
+        for key, size in db.execute("SELECT key, size FROM results "
+                                    "ORDER BY used"):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        db.executemany("DELETE FROM results WHERE key = ?", keys)
+        db.execute("UPDATE counts SET count = count - ? WHERE name = 'bytes'",
+                   (freed,))
+
+    def memoize(self, func):
+        """Return func with its results cached."""
+        name = '{0}.{1}'.format(func.__module__, func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = self.key(name, args, kwargs)
+            found, result = self.lookup(key)
+            if not found:
+                result = func(*args, **kwargs)
+                self.store(key, result)
+            return result
+        return wrapper
+
+    def install(self, functions=CACHED_FUNCTIONS):
+        """Replace functions, given as (module, names) pairs, with cached
+        versions in their modules.
+        """
+        for module_name, names in functions:
+            module = importlib.import_module(module_name)
+            for name in names:
+                func = getattr(module, name)
+                self._installed.append((module, name, func))
+                setattr(module, name, self.memoize(func))
+
+    def uninstall(self):
+        """Put back the functions replaced by install."""
+        while self._installed:
+            module, name, func = self._installed.pop()
+            setattr(module, name, func)
+
+    def stats(self):
+        """Return the hits, misses, number of results and bytes stored."""
+        db = self._connection()
+        with _transaction(db):
+            self._flush(db)
+        stats = dict(db.execute("SELECT name, count FROM counts"))
+        stats['entries'] = db.execute(
+            "SELECT COUNT(*) FROM results").fetchone()[0]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0
+        stats['max_bytes'] = self.max_bytes
+        return stats
+
+    def clear(self):
+        """Delete every result and reset the statistics."""
+        db = self._connection()
+        with _transaction(db):
+            db.execute("DELETE FROM results")
+            db.execute("UPDATE counts SET count = 0")
+        self._local.counts = {'hits': 0, 'misses': 0}
+        self._local.used = {}
+
+    def close(self):
+        """Close the connection of this thread."""
+        if getattr(self._local, 'pid', None) == os.getpid():
+            with _transaction(self._local.db):
+                self._flush(self._local.db)
+            self._local.db.close()
+        self._local = threading.local()
+
+
+@contextlib.contextmanager
+def _transaction(db):
+    """Run the statements of a with block in one write transaction."""
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
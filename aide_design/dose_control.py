@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Coagulant dose control from raw water measurements.
+
+pc_viscous predicts pC* from the coagulant dose. Operators need the
+inverse: the minimum aluminum dose (ConcAl) that reaches a target pC* for
+the current turbidity, temperature and humic acid concentration. The
+functions in this file solve that inverse problem for whole arrays of
+readings at once with a bracketed Newton iteration on the log of the dose.
+A DoseController keeps the last dose of every plant so that each new
+reading in a sensor stream starts from a tight bracket around it.
+"""
+
+######################### Imports #########################
+import numpy as np
+
+from aide_design.units import unit_registry as u
+from aide_design import utility as ut
+from aide_design import floc_model as floc
+
+# Dose range that is searched when there is no previous dose to start from.
+CONC_AL_MIN = 0.01 * u.mg/u.L
+CONC_AL_MAX = 100 * u.mg/u.L
+
+# Number of doses in the cold start bracketing grid.
+N_DOSE_GRID = 25
+
+# Factor between the previous dose and the ends of a warm start bracket.
+RATIO_DOSE_WARM_BRACKET = 1.5
+
+# Step in ln(dose) used for the finite difference derivative.
+_STEP_LOG_DOSE = 1e-6
+
+
+class DoseController:
+    """Minimum coagulant dose that reaches a target pC*.
+
+    The flocculator design and the target are fixed when the controller
+    is created. dose solves independent arrays of readings; step solves
+    one reading per plant, warm started from the doses of the previous
+    step. Readings that can't reach the target at ConcAlMax get a dose of
+    NaN.
+    """
+    def __init__(self, pCTarget, EnergyDis, Time, DiamTube, coag=floc.PACl,
+                 material=floc.Clay, NatOrgMat=floc.HumicAcid,
+                 FittingParam=0.1, RatioHeightDiameter=floc.RATIO_HEIGHT_DIAM,
+                 ConcAlMin=CONC_AL_MIN, ConcAlMax=CONC_AL_MAX, rtol=1e-6,
+                 max_iter=50):
+        ut.check_range([pCTarget, ">0", "Target pC*"],
+                       [rtol, ">0", "Relative tolerance"],
+                       [max_iter, ">0, int", "Maximum iterations"])
+        self.pCTarget = pCTarget
+        self.EnergyDis = ut.base_magnitude(EnergyDis)
+        self.Time = ut.base_magnitude(Time)
+        self.DiamTube = ut.base_magnitude(DiamTube)
+        self.coag = coag
+        self.material = material
+        self.NatOrgMat = NatOrgMat
+        self.FittingParam = FittingParam
+        self.RatioHeightDiameter = RatioHeightDiameter
+        self.ConcAlMin = ut.base_magnitude(ConcAlMin)
+        self.ConcAlMax = ut.base_magnitude(ConcAlMax)
+        self.rtol = rtol
+        self.max_iter = max_iter
+        self.iterations = 0
+        self._last = None
+
+    def _residual(self, ConcAl, ConcClay, Temp, ConcNatOrgMat):
+        """Return pC* minus the target; positive where the dose suffices."""
+        return floc.pc_viscous(self.EnergyDis, Temp, self.Time, self.DiamTube,
+                               ConcClay, ConcAl, ConcNatOrgMat,
+                               self.NatOrgMat, self.coag, self.material,
+                               self.FittingParam,
+                               self.RatioHeightDiameter) - self.pCTarget
+
+    def _bracket_cold(self, ConcClay, Temp, ConcNatOrgMat):
+        """Return the first interval of the dose grid that reaches the
+        target for every reading.
+
+        Readings that already meet the target at ConcAlMin get an
+        interval of zero width at ConcAlMin and readings that never meet
+        it get NaN.
+        """
+        grid = np.logspace(np.log10(self.ConcAlMin), np.log10(self.ConcAlMax),
+                           N_DOSE_GRID)
+        f = self._residual(grid, ConcClay[:, np.newaxis], Temp[:, np.newaxis],
+                           ConcNatOrgMat[:, np.newaxis])
+        reached = f >= 0
+        k = np.argmax(reached, axis=1)
+        hi = grid[k]
+        lo = np.where(k > 0, grid[np.maximum(k - 1, 0)], hi)
+        never = ~np.any(reached, axis=1)
+        lo[never] = np.nan
+        hi[never] = np.nan
+        return lo, hi
+
+    def _bracket_warm(self, ConcAlPrev, ConcClay, Temp, ConcNatOrgMat):
+        """Return intervals next to the previous doses that contain the
+        lowest dose reaching the target, and a mask of the readings for
+        which such an interval was found.
+        """
+        r = RATIO_DOSE_WARM_BRACKET
+        doses = ConcAlPrev[:, np.newaxis] * np.array([1 / r, 1, r])
+        f = self._residual(doses, ConcClay[:, np.newaxis], Temp[:, np.newaxis],
+                           ConcNatOrgMat[:, np.newaxis])
+        below = (f[:, 0] < 0) & (f[:, 1] >= 0)
+        above = (f[:, 1] < 0) & (f[:, 2] >= 0)
+        lo = np.where(below, doses[:, 0], doses[:, 1])
+        hi = np.where(below, doses[:, 1], doses[:, 2])
+        return lo, hi, (below | above) & np.isfinite(ConcAlPrev)
+
+    def _newton(self, lo, hi, ConcClay, Temp, ConcNatOrgMat):
+        """Return the lowest dose reaching the target inside [lo, hi].
+
+        Newton steps on ln(dose) are taken while they stay inside the
+        bracket, otherwise the bracket is bisected. Each step aims a
+        little above the root so that the iteration settles on a dose that
+        reaches the target. The residual and its finite difference
+        derivative come from one call to pc_viscous. The iteration stops
+        when the bracket is narrower than rtol or when a dose that reaches
+        the target is within rtol of the root. The iterations and the
+        widest relative bracket are reported to utility.SolverLog.
+        """
+        lo = lo.copy()
+        hi = hi.copy()
+        active = np.isfinite(lo) & (hi > lo * (1 + self.rtol))
+        y = 0.5 * (np.log(lo) + np.log(hi))
+        self.iterations = 0
+        while np.any(active) and self.iterations < self.max_iter:
+            self.iterations += 1
+            ya = y[active]
+            doses = np.exp(np.stack((ya, ya + _STEP_LOG_DOSE), axis=1))
+            f = self._residual(doses, ConcClay[active, np.newaxis],
+                               Temp[active, np.newaxis],
+                               ConcNatOrgMat[active, np.newaxis])
+            enough = f[:, 0] >= 0
+            lo[active] = np.where(enough, lo[active], doses[:, 0])
+            hi[active] = np.where(enough, doses[:, 0], hi[active])
+            slope = (f[:, 1] - f[:, 0]) / _STEP_LOG_DOSE
+            with np.errstate(divide='ignore', invalid='ignore'):
+                correction = -f[:, 0] / slope
+            step = ya + correction + self.rtol / 2
+            inside = ((slope > 0) & (step > np.log(lo[active]))
+                      & (step < np.log(hi[active])))
+            y[active] = np.where(inside, step,
+                                 0.5 * (np.log(lo[active])
+                                        + np.log(hi[active])))
+            converged = ((hi[active] <= lo[active] * (1 + self.rtol))
+                         | (enough & (np.abs(correction) < self.rtol)))
+            active[active] = ~converged
+        finite = np.isfinite(lo)
+        width = np.max(hi[finite] / lo[finite] - 1) if np.any(finite) else 0
+        ut.report_solver('dose_control', self.iterations, width,
+                         not np.any(active))
+        return hi
+
+    def dose(self, ConcClay, Temp, ConcNatOrgMat=0):
+        """Return the minimum dose for arrays of independent readings."""
+        ConcClay, Temp, ConcNatOrgMat = self._readings(ConcClay, Temp,
+                                                        ConcNatOrgMat)
+        lo, hi = self._bracket_cold(ConcClay, Temp, ConcNatOrgMat)
+        return self._newton(lo, hi, ConcClay, Temp, ConcNatOrgMat) * u.kg/u.m**3
+
+    def step(self, ConcClay, Temp, ConcNatOrgMat=0):
+        """Return the minimum dose for one new reading from every plant.
+
+        The doses of the previous step are used to bracket the new doses;
+        only plants whose dose moved outside of that bracket fall back to
+        the cold start grid.
+        """
+        ConcClay, Temp, ConcNatOrgMat = self._readings(ConcClay, Temp,
+                                                        ConcNatOrgMat)
+        if self._last is None or len(self._last) != len(ConcClay):
+            lo, hi = self._bracket_cold(ConcClay, Temp, ConcNatOrgMat)
+        else:
+            lo, hi, warm = self._bracket_warm(self._last, ConcClay, Temp,
+                                              ConcNatOrgMat)
+            if not np.all(warm):
+                lo[~warm], hi[~warm] = self._bracket_cold(
+                    ConcClay[~warm], Temp[~warm], ConcNatOrgMat[~warm])
+        self._last = self._newton(lo, hi, ConcClay, Temp, ConcNatOrgMat)
+        return self._last * u.kg/u.m**3
+
+    def reset(self):
+        """Forget the doses of the previous step."""
+        self._last = None
+
+    @staticmethod
+    def _readings(ConcClay, Temp, ConcNatOrgMat):
+        """Return the readings as 1D float arrays of equal length in base
+        units.
+        """
+        Temp = ut.base_magnitude(Temp)
+        ConcClay, Temp, ConcNatOrgMat = np.broadcast_arrays(
+            np.atleast_1d(ut.base_magnitude(ConcClay)).astype(float),
+            np.atleast_1d(Temp).astype(float),
+            np.atleast_1d(ut.base_magnitude(ConcNatOrgMat)).astype(float))
+        ut.check_range([ConcClay, ">0", "Clay concentration"],
+                       [Temp, ">0", "Temperature in Kelvin"],
+                       [ConcNatOrgMat, ">=0", "Humic acid concentration"])
+        return ConcClay.copy(), Temp.copy(), ConcNatOrgMat.copy()
+
+
+def dose_series(controller, ConcClay, Temp, ConcNatOrgMat=0):
+    """Return the minimum dose for every reading of a time series.
+
+    The readings are arrays whose first axis is time and whose optional
+    second axis is the plant. Each time step is solved for all plants at
+    once and is warm started from the doses of the step before it.
+    """
+    ConcClay = ut.base_magnitude(ConcClay)
+    Temp = ut.base_magnitude(Temp)
+    ConcNatOrgMat = ut.base_magnitude(ConcNatOrgMat)
+    ConcClay, Temp, ConcNatOrgMat = np.broadcast_arrays(ConcClay, Temp,
+                                                        ConcNatOrgMat)
+    controller.reset()
+    doses = np.empty(ConcClay.shape)
+    for t in range(ConcClay.shape[0]):
+        doses[t] = controller.step(ConcClay[t], Temp[t],
+                                   ConcNatOrgMat[t]).magnitude.reshape(
+                                       doses[t].shape)
+    return doses * u.kg/u.m**3
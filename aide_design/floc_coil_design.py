@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Design search for lab scale coiled tube flocculators.
+
+The coiled tube functions in floc_model (g_coil, dean_number, time_res_tube
+and g_time_res) evaluate one geometry at a time. The functions in this file
+evaluate every combination of tube inner diameter, coil radius and tube
+length on a broadcast grid, keep the geometries that meet the collision
+potential, head loss and energy dissipation targets and rank them. A
+root-finding step can then refine one dimension of a chosen geometry so
+that it meets the collision potential target exactly.
+"""
+
+######################### Imports #########################
+import numpy as np
+from scipy import optimize
+
+from aide_design.units import unit_registry as u
+from aide_design import utility as ut
+from aide_design import physchem as pc
+from aide_design import floc_model as floc
+from aide_design import materials_database as mat
+from aide_design import params
+
+##################### Tube catalog ########################
+DIAM_TUBE_CATALOG = np.unique(np.concatenate(
+    (mat.DIAM_TUBE_ENGLISH.to(u.m).magnitude,
+     mat.DIAM_TUBE_METRIC.to(u.m).magnitude))) * u.m
+"""Inner diameters of all of the tubes that are available, in m."""
+
+RANK_KEYS = ('headloss', 'time', 'length', 'gtime')
+"""Quantities that a list of designs can be ranked by."""
+
+RTOL_COIL_GTIME = 4 * np.finfo(float).eps
+"""Relative tolerance of the coil length and radius that length_coil_gtime
+and radius_coil_gtime find, the smallest that brentq allows. The iteration
+limit and the tolerances can be set with utility.SolverLog."""
+
+DESIGN_FIELDS = ('IDTube', 'RadiusCoil', 'LengthTube', 'VelGrad', 'Time',
+                 'GTime', 'HeadLoss', 'EnergyDis', 'DiamFlocMax', 'Dean')
+"""Keys of the dictionary returned by coil_designs."""
+
+
+######################## Functions ########################
+def _coil_grid(FlowPlant, IDTube, RadiusCoil, LengthTube, Temp):
+    """Return the performance of every geometry on a broadcast grid.
+
+    All inputs are magnitudes in base units. IDTube, RadiusCoil and
+    LengthTube must broadcast against each other; Temp must be a scalar.
+    """
+    Nu = pc.viscosity_kinematic(Temp).magnitude
+    VelGrad = floc.g_coil(FlowPlant, IDTube, RadiusCoil, Temp).magnitude
+    Time = floc.time_res_tube(IDTube, LengthTube, FlowPlant).magnitude
+    EnergyDis = VelGrad**2 * Nu
+    return {'VelGrad': VelGrad,
+            'Time': Time,
+            'GTime': VelGrad * Time,
+            'EnergyDis': EnergyDis,
+            'HeadLoss': EnergyDis * Time / pc.gravity.magnitude,
+            'Dean': floc.dean_number(FlowPlant, IDTube, RadiusCoil, Temp),
+            'Re': floc.reynolds_rapid_mix(FlowPlant, IDTube, Temp)}
+
+
+# The design targets and candidate dimensions of coil_designs, which accepts
+# a CoilParams in their place.
+CoilParams = params.param_set('CoilParams', (
+    ('FlowPlant', u.m**3/u.s), ('Temp', u.degK),
+    ('GTimeMin', u.dimensionless), ('HeadLossMax', u.m),
+    ('EnergyDisMax', u.W/u.kg), ('RadiusCoil', u.m), ('LengthTube', u.m),
+    ('IDTube', u.m)), defaults=(None,))
+
+
+@params.accepts(CoilParams)
+@u.wraps(None, [u.m**3/u.s, u.degK, u.dimensionless, u.m, u.W/u.kg,
+                u.m, u.m, u.m, None], False)
+def coil_designs(FlowPlant, Temp, GTimeMin, HeadLossMax, EnergyDisMax,
+                 RadiusCoil, LengthTube, IDTube=None, rank_by='headloss'):
+    """Return every coiled tube geometry that meets the design targets.
+
+    IDTube, RadiusCoil and LengthTube are arrays of candidate dimensions
+    and every combination of them is evaluated at once. IDTube defaults to
+    the tube catalog. A geometry is kept if its flow is laminar, its
+    collision potential (Gθ) is at least GTimeMin, its head loss is at most
+    HeadLossMax and its average energy dissipation rate is at most
+    EnergyDisMax. A maximum floc size target can be converted into
+    EnergyDisMax with floc_model.ener_dis_diam_floc.
+
+    The result is a dictionary of equal length arrays, with keys listed in
+    DESIGN_FIELDS, sorted by rank_by (one of RANK_KEYS) in ascending order.
+    """
+    ut.check_range([FlowPlant, ">0", "Flow rate"], [Temp, ">0", "Temperature"],
+                   [GTimeMin, ">0", "Minimum Gθ"],
+                   [HeadLossMax, ">0", "Maximum head loss"],
+                   [EnergyDisMax, ">0", "Maximum energy dissipation rate"],
+                   [RadiusCoil, ">0", "Coil radius"],
+                   [LengthTube, ">0", "Tube length"])
+    if rank_by not in RANK_KEYS:
+        raise ValueError("rank_by is {0} but must be one of "
+                         "{1}.".format(rank_by, RANK_KEYS))
+    if IDTube is None:
+        IDTube = DIAM_TUBE_CATALOG.to(u.m).magnitude
+    ut.check_range([IDTube, ">0", "Tube inner diameter"])
+    IDTube, RadiusCoil, LengthTube = np.meshgrid(np.ravel(IDTube),
+                                                 np.ravel(RadiusCoil),
+                                                 np.ravel(LengthTube),
+                                                 indexing='ij')
+    grid = _coil_grid(FlowPlant, IDTube, RadiusCoil, LengthTube, Temp)
+    feasible = ((RadiusCoil > IDTube / 2)
+                & (grid['Re'] < pc.RE_TRANSITION_PIPE)
+                & (grid['GTime'] >= GTimeMin)
+                & (grid['HeadLoss'] <= HeadLossMax)
+                & (grid['EnergyDis'] <= EnergyDisMax))
+    designs = {'IDTube': IDTube[feasible] * u.m,
+               'RadiusCoil': RadiusCoil[feasible] * u.m,
+               'LengthTube': LengthTube[feasible] * u.m,
+               'VelGrad': grid['VelGrad'][feasible] / u.s,
+               'Time': grid['Time'][feasible] * u.s,
+               'GTime': grid['GTime'][feasible] * u.dimensionless,
+               'HeadLoss': grid['HeadLoss'][feasible] * u.m,
+               'EnergyDis': grid['EnergyDis'][feasible] * u.W/u.kg,
+               'Dean': grid['Dean'][feasible] * u.dimensionless}
+    designs['DiamFlocMax'] = floc.diam_floc_max(designs['EnergyDis'])
+    key = {'headloss': 'HeadLoss', 'time': 'Time', 'length': 'LengthTube',
+           'gtime': 'GTime'}[rank_by]
+    order = np.argsort(designs[key].magnitude, kind='stable')
+    return {name: designs[name][order] for name in DESIGN_FIELDS}
+
+
+@u.wraps(u.m, [u.m**3/u.s, u.m, u.m, u.degK, u.dimensionless], False)
+def length_coil_gtime(FlowPlant, IDTube, RadiusCoil, Temp, GTime):
+    """Return the tube length that gives a coiled tube flocculator a
+    collision potential of exactly GTime.
+    """
+    ut.check_range([GTime, ">0", "Gθ"])
+    return _brentq(
+        'length_coil_gtime',
+        lambda LengthTube: (_coil_grid(FlowPlant, IDTube, RadiusCoil,
+                                       LengthTube, Temp)['GTime'] - GTime),
+        0, GTime * FlowPlant / (floc.g_straight(FlowPlant, IDTube).magnitude
+                                * pc.area_circle(IDTube).magnitude), GTime)
+
+
+@u.wraps(u.m, [u.m**3/u.s, u.m, u.m, u.degK, u.dimensionless, u.m], False)
+def radius_coil_gtime(FlowPlant, IDTube, LengthTube, Temp, GTime,
+                      RadiusCoilMax):
+    """Return the coil radius that gives a coiled tube flocculator a
+    collision potential of exactly GTime.
+
+    The collision potential falls as the coil radius increases, so the
+    root is searched for between the tube radius and RadiusCoilMax. A
+    ValueError is raised if the target can't be met in that range.
+    """
+    ut.check_range([GTime, ">0", "Gθ"], [RadiusCoilMax, ">0", "Coil radius"])
+
+    def residual(RadiusCoil):
+        return _coil_grid(FlowPlant, IDTube, RadiusCoil, LengthTube,
+                          Temp)['GTime'] - GTime
+
+    RadiusCoilMin = IDTube / 2
+    if residual(RadiusCoilMin) * residual(RadiusCoilMax) > 0:
+        raise ValueError("Gθ of {0} can't be met with a coil radius between "
+                         "{1} and {2} m.".format(GTime, RadiusCoilMin,
+                                                 RadiusCoilMax))
+    return _brentq('radius_coil_gtime', residual, RadiusCoilMin,
+                   RadiusCoilMax, GTime)
+
+
+def _brentq(solver, residual, lo, hi, GTime):
+    """Return the root of residual between lo and hi, found by brentq
+    within the limits of utility.solver_limits and reported to
+    utility.SolverLog with the residual relative to GTime.
+    """
+    MaxIter, RTol = ut.solver_limits(solver, RTOL_COIL_GTIME)
+    root, result = optimize.brentq(residual, lo, hi, rtol=RTol,
+                                   maxiter=MaxIter, full_output=True,
+                                   disp=False)
+    ut.report_solver(solver, result.iterations, abs(residual(root)) / GTime,
+                     result.converged)
+    return root
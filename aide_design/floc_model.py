@@ -13,8 +13,10 @@ import numpy as np
 from aide_design import utility as ut
 from aide_design.units import unit_registry as u
 from aide_design import physchem as pc
+from aide_design import params
 
-u.enable_contexts('chem')
+# Every thread starts with the chem context; see units.
+u.enable_default_contexts('chem')
 
 ##################### Class Definition #####################
 
@@ -284,13 +286,17 @@ def gamma_coag(ConcClay, ConcAluminum, coag, material,
 
 
 @u.wraps(None, [u.kg/u.m**3, u.kg/u.m**3, None, None], False)
-@ut.list_handler
 def gamma_humic_acid_to_coag(ConcAl, ConcNatOrgMat, NatOrgMat, coag):
-    return min(((ConcNatOrgMat / conc_precipitate(ConcAl, coag).magnitude)
-                * (coag.Density / NatOrgMat.Density)
-                * (coag.Diameter / (4 * NatOrgMat.Diameter))
-                ),
-               1)
+    """Return the fraction of the coagulant that is coated with humic acid.
+
+    Arrays of concentrations are handled element by element.
+    """
+    return np.minimum(((np.asarray(ConcNatOrgMat)
+                        / conc_precipitate(ConcAl, coag).magnitude)
+                       * (coag.Density / NatOrgMat.Density)
+                       * (coag.Diameter / (4 * NatOrgMat.Diameter))
+                       ),
+                      1)
 
 
 @u.wraps(None, [u.m, u.kg/u.m**3, u.kg/u.m**3, u.kg/u.m**3, None,
@@ -349,6 +355,16 @@ def alpha(DiamTube, ConcClay, ConcAl, ConcNatOrgMat,
             )
 
 
+# The arguments of pc_viscous, which accepts a PCParams in their place.
+PCParams = params.param_set('PCParams', (
+    ('EnergyDis', u.W/u.kg), ('Temp', u.degK), ('Time', u.s),
+    ('DiamTube', u.m), ('ConcClay', u.kg/u.m**3), ('ConcAl', u.kg/u.m**3),
+    ('ConcNatOrgMat', u.kg/u.m**3), ('NatOrgMat', None), ('coag', None),
+    ('material', None), ('FittingParam', u.dimensionless),
+    ('RatioHeightDiameter', u.dimensionless)))
+
+
+@params.accepts(PCParams)
 @u.wraps(None, [u.W/u.kg, u.degK, u.s, u.m,
                 u.kg/u.m**3, u.kg/u.m**3, u.kg/u.m**3, None,
                 None, None, u.dimensionless, u.dimensionless], False)
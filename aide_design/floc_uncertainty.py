@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Monte Carlo uncertainty propagation through the flocculation model.
+
+Raw water turbidity, temperature and humic acid concentration vary widely
+at a plant, so a design is better described by the distribution of its
+performance than by a single point. The functions in this file sample the
+uncertain inputs, push the samples through the vectorized floc_model
+chain in chunks and keep only running summary statistics, so millions of
+samples never have to be held in memory at once. Every chunk has its own
+random stream spawned from one seed, so the result doesn't depend on how
+many processes share the work.
+"""
+
+######################### Imports #########################
+from concurrent import futures
+
+import numpy as np
+
+from aide_design.units import unit_registry as u
+from aide_design import utility as ut
+from aide_design import floc_model as floc
+
+
+################### Input distributions ###################
+class Constant:
+    """An input that doesn't vary."""
+    def __init__(self, value):
+        self.value = ut.base_magnitude(value)
+
+    def sample(self, rng, n):
+        return np.full(n, self.value, dtype=float)
+
+
+class Uniform:
+    """An input that is equally likely to be anywhere in [low, high)."""
+    def __init__(self, low, high):
+        self.low = ut.base_magnitude(low)
+        self.high = ut.base_magnitude(high)
+
+    def sample(self, rng, n):
+        return rng.uniform(self.low, self.high, n)
+
+
+class Normal:
+    """A normally distributed input, optionally clipped to [low, high]."""
+    def __init__(self, mean, sd, low=None, high=None):
+        self.mean = ut.base_magnitude(mean)
+        self.sd = ut.base_magnitude(sd)
+        self.low = ut.base_magnitude(low)
+        self.high = ut.base_magnitude(high)
+
+    def sample(self, rng, n):
+        values = rng.normal(self.mean, self.sd, n)
+        if self.low is not None or self.high is not None:
+            values = np.clip(values, self.low, self.high)
+        return values
+
+
+class LogNormal:
+    """A log-normally distributed input.
+
+    median has the units of the input and sigma is the dimensionless
+    standard deviation of the natural log of the input. Turbidity is
+    usually well described by this distribution.
+    """
+    def __init__(self, median, sigma):
+        self.median = ut.base_magnitude(median)
+        self.sigma = sigma
+
+    def sample(self, rng, n):
+        return rng.lognormal(np.log(self.median), self.sigma, n)
+
+
+class Triangular:
+    """An input with a triangular distribution between low and high."""
+    def __init__(self, low, mode, high):
+        self.low = ut.base_magnitude(low)
+        self.mode = ut.base_magnitude(mode)
+        self.high = ut.base_magnitude(high)
+
+    def sample(self, rng, n):
+        return rng.triangular(self.low, self.mode, self.high, n)
+
+
+class Empirical:
+    """An input resampled with replacement from observed values."""
+    def __init__(self, values):
+        self.values = np.asarray(ut.base_magnitude(values), dtype=float)
+
+    def sample(self, rng, n):
+        return rng.choice(self.values, n)
+
+
+#################### Performance model ####################
+class FlocPerformance:
+    """The floc_model chain evaluated for arrays of raw water samples.
+
+    The design of the flocculator is fixed when the model is created. When
+    called with a dictionary of sampled inputs (ConcClay, Temp, ConcAl and
+    ConcNatOrgMat, as magnitudes in base units) the model returns the
+    dimensionless pC* from pc_viscous, the terminal velocity of a floc of
+    diameter DiamTarget and the diameter of the floc that settles at
+    VelCapture. Inputs that are not sampled take their value from the
+    keyword arguments.
+    """
+    units = {'pC': u.dimensionless,
+             'VelTerm': u.m/u.s,
+             'DiamVelCapture': u.m}
+
+    def __init__(self, EnergyDis, Time, DiamTube, ConcAl, ConcNatOrgMat=0,
+                 DiamTarget=floc.diam_floc_max(10 * u.mW/u.kg),
+                 VelCapture=0.12 * u.mm/u.s, coag=floc.PACl,
+                 material=floc.Clay, NatOrgMat=floc.HumicAcid,
+                 FittingParam=0.1, RatioHeightDiameter=floc.RATIO_HEIGHT_DIAM,
+                 DiamFractal=floc.DIAM_FRACTAL):
+        self.EnergyDis = ut.base_magnitude(EnergyDis)
+        self.Time = ut.base_magnitude(Time)
+        self.DiamTube = ut.base_magnitude(DiamTube)
+        self.ConcAl = ut.base_magnitude(ConcAl)
+        self.ConcNatOrgMat = ut.base_magnitude(ConcNatOrgMat)
+        self.DiamTarget = ut.base_magnitude(DiamTarget)
+        self.VelCapture = ut.base_magnitude(VelCapture)
+        self.coag = coag
+        self.material = material
+        self.NatOrgMat = NatOrgMat
+        self.FittingParam = FittingParam
+        self.RatioHeightDiameter = RatioHeightDiameter
+        self.DiamFractal = DiamFractal
+
+    def __call__(self, samples):
+        ConcClay = samples['ConcClay']
+        Temp = samples['Temp']
+        ConcAl = samples.get('ConcAl', self.ConcAl)
+        ConcNatOrgMat = samples.get('ConcNatOrgMat', self.ConcNatOrgMat)
+        return {
+            'pC': floc.pc_viscous(self.EnergyDis, Temp, self.Time,
+                                  self.DiamTube, ConcClay, ConcAl,
+                                  ConcNatOrgMat, self.NatOrgMat, self.coag,
+                                  self.material, self.FittingParam,
+                                  self.RatioHeightDiameter),
+            'VelTerm': floc.vel_term_floc(ConcAl, ConcClay, self.coag,
+                                          self.material, self.DiamFractal,
+                                          self.DiamTarget, Temp).magnitude,
+            'DiamVelCapture': floc.diam_floc_vel_term(
+                ConcAl, ConcClay, self.coag, self.material, self.DiamFractal,
+                self.VelCapture, Temp).magnitude,
+            }
+
+
+#################### Running statistics ####################
+class SummaryStats:
+    """Streaming summary statistics of one model output.
+
+    The count, mean, variance, minimum and maximum are updated with the
+    parallel form of Welford's algorithm. Quantiles come from a histogram
+    with fixed bin edges, so two SummaryStats with the same edges can be
+    merged without losing anything. Values outside the edges are counted
+    in an underflow and an overflow bin that are bounded by the exact
+    minimum and maximum. NaN results are counted separately and otherwise
+    ignored.
+    """
+    def __init__(self, edges, units=u.dimensionless):
+        self.edges = np.asarray(edges, dtype=float)
+        self.units = units
+        self.count = 0
+        self.nan_count = 0
+        self._mean = 0.
+        self._m2 = 0.
+        self._min = np.inf
+        self._max = -np.inf
+        self.hist = np.zeros(len(self.edges) + 1, dtype=np.int64)
+
+    def update(self, values):
+        """Add an array of values to the statistics."""
+        values = np.asarray(values, dtype=float).ravel()
+        nans = np.isnan(values)
+        self.nan_count += int(np.count_nonzero(nans))
+        values = values[~nans]
+        if len(values) == 0:
+            return
+        chunk = SummaryStats(self.edges, self.units)
+        chunk.count = len(values)
+        chunk._mean = values.mean()
+        chunk._m2 = ((values - chunk._mean)**2).sum()
+        chunk._min = values.min()
+        chunk._max = values.max()
+        chunk.hist = np.bincount(np.searchsorted(self.edges, values,
+                                                 side='right'),
+                                 minlength=len(self.hist))
+        self.merge(chunk)
+
+    def merge(self, other):
+        """Add the statistics of other, which must share these bin edges."""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Only statistics with the same histogram bin "
+                             "edges can be merged.")
+        self.nan_count += other.nan_count
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / count
+        self._m2 += other._m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        self.hist += other.hist
+        return self
+
+    @property
+    def mean(self):
+        return self._mean * self.units
+
+    @property
+    def var(self):
+        return self._m2 / max(self.count - 1, 1) * self.units**2
+
+    @property
+    def std(self):
+        return np.sqrt(self._m2 / max(self.count - 1, 1)) * self.units
+
+    @property
+    def min(self):
+        return self._min * self.units
+
+    @property
+    def max(self):
+        return self._max * self.units
+
+    def quantile(self, q):
+        """Return the quantile(s) q, interpolated within histogram bins."""
+        ut.check_range([q, "0-1", "Quantile"])
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) * self.units
+        # Bin boundaries, with the underflow and overflow bins closed
+        # off by the observed extremes.
+        bounds = np.concatenate(([min(self._min, self.edges[0])], self.edges,
+                                 [max(self._max, self.edges[-1])]))
+        cumulative = np.concatenate(([0], np.cumsum(self.hist)))
+        rank = np.asarray(q, dtype=float) * self.count
+        i = np.clip(np.searchsorted(cumulative, rank, side='left'),
+                    1, len(self.hist))
+        inbin = self.hist[i - 1]
+        fraction = np.where(inbin > 0,
+                            (rank - cumulative[i - 1]) / np.maximum(inbin, 1),
+                            0)
+        values = bounds[i - 1] + fraction * (bounds[i] - bounds[i - 1])
+        return np.clip(values, self._min, self._max) * self.units
+
+
+######################## Functions ########################
+def _sample(inputs, rng, n):
+    """Return a dictionary of n samples of every input."""
+    return {name: dist.sample(rng, n) for name, dist in sorted(inputs.items())}
+
+
+def _edges(values, bins):
+    """Return histogram bin edges that comfortably span a pilot sample."""
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return np.linspace(0, 1, bins + 1)
+    low, high = values.min(), values.max()
+    pad = max(0.25 * (high - low), 1e-12 * max(abs(low), abs(high), 1))
+    return np.linspace(low - pad, high + pad, bins + 1)
+
+
+def _run_chunk(inputs, model, n, seed, edges):
+    """Return the summary statistics of one chunk of samples."""
+    outputs = model(_sample(inputs, np.random.default_rng(seed), n))
+    stats = {}
+    for name, values in outputs.items():
+        stats[name] = SummaryStats(edges[name], model.units.get(name,
+                                                               u.dimensionless))
+        stats[name].update(values)
+    return stats
+
+
+def monte_carlo(inputs, model, n_samples, seed=None, chunk_size=10**5,
+                n_workers=1, bins=4096):
+    """Return summary statistics of the model outputs for random inputs.
+
+    inputs is a dictionary of distributions (for example Uniform or
+    LogNormal) keyed by the names the model expects, and model is a
+    picklable callable such as FlocPerformance. The samples are split into
+    chunks of chunk_size; every chunk draws from its own random stream
+    spawned from seed and the chunks are shared among n_workers processes.
+    The first chunk is evaluated here to set the histogram range of every
+    output, and the chunk statistics are merged in chunk order, so the
+    result for a given seed is the same for any number of workers.
+
+    The result is a dictionary of SummaryStats keyed by output name.
+    """
+    ut.check_range([n_samples, ">0, int", "Number of samples"],
+                   [chunk_size, ">0, int", "Chunk size"],
+                   [n_workers, ">0, int", "Number of workers"],
+                   [bins, ">0, int", "Number of bins"])
+    sizes = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        sizes.append(n_samples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    pilot = model(_sample(inputs, np.random.default_rng(seeds[0]), sizes[0]))
+    edges = {name: _edges(np.asarray(values, dtype=float).ravel(), bins)
+             for name, values in pilot.items()}
+    results = {name: SummaryStats(edges[name],
+                                  model.units.get(name, u.dimensionless))
+               for name in pilot}
+    for name, values in pilot.items():
+        results[name].update(values)
+    args = [(inputs, model, sizes[i], seeds[i], edges)
+            for i in range(1, len(sizes))]
+    if n_workers == 1:
+        chunks = (_run_chunk(*arg) for arg in args)
+        _merge_chunks(results, chunks)
+    else:
+        with futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+            chunks = executor.map(_run_chunk, *zip(*args)) if args else []
+            _merge_chunks(results, chunks)
+    return results
+
+
+def _merge_chunks(results, chunks):
+    for chunk in chunks:
+        for name, stats in chunk.items():
+            results[name].merge(stats)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Properties of the water based solutions that flow through a plant.
+
+The viscosity of a coagulant solution is the viscosity of water at the
+same temperature multiplied by a correction that grows with the
+concentration of the solution, and its density is the density of water
+plus an increment that is proportional to the concentration. Every
+function accepts arrays of concentrations and temperatures, so the
+properties of thousands of stock solutions come from one call.
+
+A Solution fixes the concentration and temperature of a Fluid. It has a nu
+attribute, so it can be passed to any physchem function in place of Nu.
+"""
+
+######################### Imports #########################
+import numpy as np
+
+from aide_design.units import unit_registry as u
+from aide_design import utility as ut
+from aide_design import physchem as pc
+
+
+##################### Class Definition #####################
+class Fluid:
+    """A solution of one chemical in water.
+
+    RatioNu is (1 + CoefNu * Conc**ExpNu), with Conc in kg/m³, and gives
+    the kinematic viscosity of the solution relative to water.
+    RatioDensity is the increase in density per unit concentration of the
+    chemical.
+    """
+    def __init__(self, name, CoefNu=0, ExpNu=1, RatioDensity=0):
+        self.name = name
+        self.CoefNu = CoefNu
+        self.ExpNu = ExpNu
+        self.RatioDensity = RatioDensity
+
+    def ratio_nu(self, Conc):
+        """Return the kinematic viscosity relative to that of water."""
+        Conc = np.asarray(ut.base_magnitude(Conc), dtype=float)
+        ut.check_range([Conc, ">=0", "Concentration"])
+        return 1 + self.CoefNu * Conc**self.ExpNu
+
+    def nu(self, Conc, Temp):
+        """Return the kinematic viscosity of the solution."""
+        return (self.ratio_nu(Conc)
+                * pc.viscosity_kinematic(Temp).to(u.m**2/u.s).magnitude
+                * u.m**2/u.s)
+
+    def density(self, Conc, Temp):
+        """Return the density of the solution."""
+        Conc = np.asarray(ut.base_magnitude(Conc), dtype=float)
+        ut.check_range([Conc, ">=0", "Concentration"])
+        return ((pc.density_water(Temp).to(u.kg/u.m**3).magnitude
+                 + self.RatioDensity * Conc) * u.kg/u.m**3)
+
+    def viscosity_dynamic(self, Conc, Temp):
+        """Return the dynamic viscosity of the solution."""
+        return (self.nu(Conc, Temp) * self.density(Conc, Temp)).to(
+            u.kg/(u.m*u.s))
+
+
+class Solution:
+    """A Fluid at fixed arrays of concentration and temperature.
+
+    The properties are calculated once, when the solution is created.
+    """
+    def __init__(self, fluid, Conc, Temp=20 * u.degC):
+        self.fluid = fluid
+        self.Conc = Conc
+        self.Temp = Temp
+        self.nu = fluid.nu(Conc, Temp)
+        self.density = fluid.density(Conc, Temp)
+
+    @property
+    def viscosity_dynamic(self):
+        return (self.nu * self.density).to(u.kg/(u.m*u.s))
+
+
+################### Fluid Definitions ###################
+# The density increments are approximate and come from the specific
+# gravity of concentrated commercial solutions.
+WATER = Fluid('Water')
+
+
+ALUM = Fluid('Alum', 4.255 * 10**-6, 2.289, 0.52)
+
+
+PACL = Fluid('PACl', 2.383 * 10**-5, 1.893, 0.45)
+
+
+# Bleach is dilute enough that its viscosity is that of water; its
+# concentration is that of available chlorine.
+BLEACH = Fluid('Bleach', RatioDensity=1.3)
+
+
+# Fluids in the order of the ENCoag and en_chem switches used in the
+# dose controller design.
+COAGULANTS = (ALUM, PACL)
+
+
+def nu_coag(Conc, ENCoag, Temp=20 * u.degC):
+    """Return the kinematic viscosity of coagulant solutions.
+
+    ENCoag is 0 for alum and 1 for PACl; any other value gives the
+    viscosity of water. Conc and ENCoag can be broadcastable arrays.
+    """
+    Conc = np.asarray(ut.base_magnitude(Conc), dtype=float)
+    ENCoag = np.asarray(ENCoag)
+    ratio = np.select([ENCoag == i for i in range(len(COAGULANTS))],
+                      [fluid.ratio_nu(Conc) for fluid in COAGULANTS],
+                      WATER.ratio_nu(Conc))
+    return (ratio * pc.viscosity_kinematic(Temp).to(u.m**2/u.s).magnitude
+            * u.m**2/u.s)
@@ -3,6 +3,10 @@
 Created on Mon Aug  7 12:05:59 2017
 
 @author: kn348
+
+Like expert_inputs, the constants are listed in the CONSTANTS table and
+are only created the first time they are used. catalog() returns every
+constant with its units and description.
 """
 
 import math
@@ -16,195 +20,144 @@ except ModuleNotFoundError:
     from aide_design.units import unit_registry as u
     from aide_design import utility as ut
 
-gravity = 9.80665 * u.m/u.s**2
-"""Define the gravitational constant, in m/s²."""
-
-########### Materials Constants - general ############
-
-PIPE_ROUGH_PVC = 0.12*u.mm
-
-PIPE_ROUGH_CONCRETE = 2*u.mm
-
-RHO_CONCRETE = 2400*(u.kg/(u.m**3)) #used in the sed tank drawing
-
-THICKNESS_CONCRETE_MIN = 5*u.cm  #used throughout the code
-
-#0 is English, 1 is metric, drill series is needed for the 
-#drill series at the bottom of this sheet and tube series 
-#is needed for the Cdc code
-EN_DRILL_SERIES = 0
-
-EN_TUBE_SERIES = 0
-
-DIAM_REBAR = (1/2)*u.inch
-
-########### Material constants - entrance tank ############
-
-THICKNESS_LFOM_SHEET = THICKNESS_CONCRETE_MIN
-
-NOM_DIAM_ENT_TANK_FLOAT =  8*u.inch
-
-#Minimum pipe size to handle grit and to ensure that the pipe can be easily unclogged
-NOM_DIAM_ENT_TANK_DRAIN_MIN =  3*u.inch
-
-NOM_DIAM_ENT_TANK_DRAIN =  3*u.inch #This is constant for now
-
-THICKNESS_ENT_TANK_REMOVABLE_WALL = 5*u.cm
-
-#Parameters are arbitrary - need to be calculated
-HEIGHT_ENT_TANK_REMOVABLE_WALL_SUPPORT = 4*u.cm
-
-THICKNESS_ENT_TANK_REMOVABLE_WALL_SUPPORT = 5*u.cm
-
-THICKNESS_ENT_TANK_HOPPER_LEDGE = 15*u.cm
-
-THICKNESS_RAPID_MIX_ORIFICE_PLATE = 2*u.cm
-
-NOM_DIAM_RAPID_MIX_AIR_RELEASE = 1*u.inch
-
- ############ Material constants - chem storage tanks  ############
- 
-THICKNESS_CHEM_TANK_WALL = 5*u.mm
- 
- #Supplier Information:
-#http://www.rotoplas.com/assets/files/industria/catalogo.pdf
-
-#each element in the following array is tank volume
-
-VOL_SUPPLIER_CHEM_TANK = [208.198, 450, 600, 750, 1100, 2500]*u.L
-
-#the following array is a 2D array in which 
-#in each element, the first element is tank diameter 
-#and the second element is tank height
-
-DIMENSIONS_SUPPLIER_CHEM_TANK = [[0.571, 0.851], [0.85, 0.99], [0.96, 1.10], [1.10, 1.02], [1.10, 1.39], [1.55, 1.65]]*u.m
-
-FACTOR = [1.05, 1.05, 1.05, 1.05, 1.05, 1.05]
-
-############ Material constants - chemical dose controller ###########
-
-DIAM_TUBE_ENGLISH = [1, 2, 3 ,4 ,5 ,6, 7]*u.inch/16
-
-DIAM_TUBE_METRIC = [2, 3, 4, 6, 8, 10]*u.mm
-
-DIAM_FLT_VLV_ORIFICES_AVAIL = [0.093, 0.187, 0.25, 0.312]*u.inch
-
-############# Material constants - flocculator #####################
-
-THICKNESS_FLOC_BAFFLE_RIGID_HEIGHT = 15*u.cm
-
-#The piping size for the main part of the floc modules
-NOM_DIAM_FLOC_MODULES_MAIN = (1/2)*u.inch
-
-#The diameter of the oversized cap used to assemble the floc modules
-NOM_DIAM_FLOC_MODULES_LARGE = 1.5*u.inch
-
-############ Material constants - sedimentation  #############
-
-WIDTH_SED_PLATE = 1.06*u.m
-
-THICKNESS_SED_PLATE = 0.2*u.cm
-
-SPACE_SED_PLATE = 2.5*u.cm
+# Each row is (name, magnitude, units, description). Derived constants
+# have a function of the table as their magnitude.
+CONSTANTS = (
+    ('gravity', 9.80665, 'm/s**2',
+     "Define the gravitational constant, in m/s²."),
+    ########### Materials Constants - general ############
+    ('PIPE_ROUGH_PVC', 0.12, 'mm', ""),
+    ('PIPE_ROUGH_CONCRETE', 2, 'mm', ""),
+    ('RHO_CONCRETE', 2400, 'kg/m**3', "used in the sed tank drawing"),
+    ('THICKNESS_CONCRETE_MIN', 5, 'cm', "used throughout the code"),
+    ('EN_DRILL_SERIES', 0, None,
+     "0 is English, 1 is metric, drill series is needed for the drill series"
+     " at the bottom of this sheet and tube series is needed for the Cdc "
+     "code"),
+    ('EN_TUBE_SERIES', 0, None, ""),
+    ('DIAM_REBAR', 1/2, 'inch', ""),
+    ########### Material constants - entrance tank ############
+    ('THICKNESS_LFOM_SHEET', lambda c: c.THICKNESS_CONCRETE_MIN, None, ""),
+    ('NOM_DIAM_ENT_TANK_FLOAT', 8, 'inch', ""),
+    ('NOM_DIAM_ENT_TANK_DRAIN_MIN', 3, 'inch',
+     "Minimum pipe size to handle grit and to ensure that the pipe can be "
+     "easily unclogged"),
+    ('NOM_DIAM_ENT_TANK_DRAIN', 3, 'inch', "This is constant for now"),
+    ('THICKNESS_ENT_TANK_REMOVABLE_WALL', 5, 'cm', ""),
+    ('HEIGHT_ENT_TANK_REMOVABLE_WALL_SUPPORT', 4, 'cm',
+     "Parameters are arbitrary - need to be calculated"),
+    ('THICKNESS_ENT_TANK_REMOVABLE_WALL_SUPPORT', 5, 'cm', ""),
+    ('THICKNESS_ENT_TANK_HOPPER_LEDGE', 15, 'cm', ""),
+    ('THICKNESS_RAPID_MIX_ORIFICE_PLATE', 2, 'cm', ""),
+    ('NOM_DIAM_RAPID_MIX_AIR_RELEASE', 1, 'inch', ""),
+    ############ Material constants - chem storage tanks  ############
+    ('THICKNESS_CHEM_TANK_WALL', 5, 'mm', ""),
+    #Supplier Information:
+    #http://www.rotoplas.com/assets/files/industria/catalogo.pdf
+    #each element in the following array is tank volume
+    ('VOL_SUPPLIER_CHEM_TANK', [208.198, 450, 600, 750, 1100, 2500], 'L', ""),
+    #the following array is a 2D array in which
+    #in each element, the first element is tank diameter
+    #and the second element is tank height
+    ('DIMENSIONS_SUPPLIER_CHEM_TANK',
+     [[0.571, 0.851], [0.85, 0.99], [0.96, 1.10], [1.10, 1.02],
+      [1.10, 1.39], [1.55, 1.65]],
+     'm', ""),
+    ('FACTOR', [1.05, 1.05, 1.05, 1.05, 1.05, 1.05], None, ""),
+    ############ Material constants - chemical dose controller ###########
+    ('DIAM_TUBE_ENGLISH', [1/16, 2/16, 3/16, 4/16, 5/16, 6/16, 7/16], 'inch',
+     ""),
+    ('DIAM_TUBE_METRIC', [2, 3, 4, 6, 8, 10], 'mm', ""),
+    ('DIAM_FLT_VLV_ORIFICES_AVAIL', [0.093, 0.187, 0.25, 0.312], 'inch', ""),
+    ############# Material constants - flocculator #####################
+    ('THICKNESS_FLOC_BAFFLE_RIGID_HEIGHT', 15, 'cm', ""),
+    ('NOM_DIAM_FLOC_MODULES_MAIN', 1/2, 'inch',
+     "The piping size for the main part of the floc modules"),
+    ('NOM_DIAM_FLOC_MODULES_LARGE', 1.5, 'inch',
+     "The diameter of the oversized cap used to assemble the floc modules"),
+    ############ Material constants - sedimentation  #############
+    ('WIDTH_SED_PLATE', 1.06, 'm', ""),
+    ('THICKNESS_SED_PLATE', 0.2, 'cm', ""),
+    ('SPACE_SED_PLATE', 2.5, 'cm', ""),
+    ('ANGLE_SED_PLATE', 60, 'deg', ""),
+    ('THICKNESS_SED_WEIR', 5, 'cm', ""),
+    ('LENGTH_SED_PLATE_CANTILEVERED', 20, 'cm',
+     "Maximum length of sed plate sticking out past module pipes without any"
+     " additional support. The goal is to prevent floppy modules that don't "
+     "maintain constant distances between the plates"),
+    ('DIST_CENTER_SED_PLATE',
+     lambda c: c.SPACE_SED_PLATE + c.THICKNESS_SED_PLATE, None,
+     ""),
+    ('N_SED_MODULE_PLATES_MAX',
+     lambda c: math.floor((c.LENGTH_SED_PLATE_CANTILEVERED
+                           / c.DIST_CENTER_SED_PLATE
+                           * np.tan(c.ANGLE_SED_PLATE)) + 1),
+     None, ""),
+    ('N_SED_MODULE_PLATES_MIN', 8, None, ""),
+    ('NOM_DIAM_SED_HOPPER_DRAIN', 1, 'inch', ""),
+    ('NOM_DIAM_SED_HOPPER_VIEWER', 2, 'inch', ""),
+    ('NOM_DIAM_SED_HOPPER_SKIMMER', 2, 'inch', ""),
+    ##Diffusers/Jet Reverser
+    ('NOM_DIAM_SED_DIFFUSER', 1, 'inch', ""),
+    ('NOM_DIAM_SED_JET_REVERSER', 3, 'inch', ""),
+    ############ Material constants - stacked rapid sand filter ############
+    ('NOM_DIAM_FILTER_MANIFOLD_BRANCH', 1, 'inch',
+     "We are going to take this pipe size for the slotted pipes as a given. "
+     "Larger pipes may block too much flow and they are harder to install."),
+    ('NOM_DIAM_FILTER_BACKWASH_MANIFOLD_BRANCH', 1.5, 'inch', ""),
+    ('WIDTH_FILTER_MANIFOLD_SLOTS', 0.008, 'inch',
+     "A slot thickness of 0.008 in or 0.2 mm is selected so that sand will "
+     "not enter the slotted pipes."),
+    ('NOM_DIAM_FILTER_BRANCH_HOLDER', 2, 'inch', ""),
+    ('NOM_DIAM_FILTER_BACKWASH_BRANCH_HOLDER', 2, 'inch', ""),
+    ('SPACE_FILTER_TRUNK_MIN', 3, 'cm',
+     "Minimum vertical spacing between trunk line pipes going through the "
+     "filter wall for concrete construction"),
+    ('SPACE_FILTER_MANIFOLD_ASSEMBLY', 1, 'cm',
+     "Space between the ends of the branch receiver pipes and the walls so "
+     "that the manifold assemblies are easy to lower into the filter boxes "
+     "(if the branch receivers extended the entire length of the box they "
+     "would just barely fit and it would be hard to get into place)"),
+    ('LENGTH_FILTER_MANIFOLD_FEMCO_COUPLING', 4, 'cm', ""),
+    ##Sand Properties
+    ('DIAM_FILTER_SAND_EFFECTIVE_SIZE', 0.5, 'mm', ""),
+    ('RATIO_UNIFORMITY_COEFF_FILTER_SAND', 1.65, None, ""),
+    ('DIAM_FILTER_SAND_60',
+     lambda c: (c.DIAM_FILTER_SAND_EFFECTIVE_SIZE
+                * c.RATIO_UNIFORMITY_COEFF_FILTER_SAND),
+     None, ""),
+    ('POROSITY_FILTER_SAND', 0.4, None, "Porosity in a sand bed"),
+    ('RHO_FILTER_SAND', 2650.0, 'kg/m**3', ""),
+    ('RATIO_FILTER_FLUIDIZED', 1.3, None, "Bed expands 30% when fluidized"),
+    ('K_KOZENY', 5, None, "Carman-Kozeny coefficient"),
+    ############## Drill Series ##############
+    ('DIAM_DRILL_ENG',
+     [0.03125, 0.0625, 0.09375, 0.125, 0.15625, 0.1875, 0.21875, 0.25,
+      0.375, 0.5, 0.625, 0.75, 0.875, 1, 1.25, 1.5, 1.75, 2],
+     'inch', ""),
+    ('DIAM_DRILL_MET',
+     np.concatenate((np.arange(5, 51) / 10, np.arange(6, 21),
+                     np.arange(22, 51, 2))),
+     'mm',
+     "0.5 to 5 mm in steps of 0.1 mm, to 20 mm in steps of 1 mm and to 50 mm"
+     " in steps of 2 mm."),
+)
+
+_TABLE = ut.ConstantTable(CONSTANTS, globals())
+
+__getattr__ = _TABLE.value
+
+__dir__ = _TABLE.dir
+
+catalog = _TABLE.catalog
 
-ANGLE_SED_PLATE = 60*u.deg
-
-THICKNESS_SED_WEIR = 5*u.cm
-
-#Maximum length of sed plate sticking out past module pipes without any 
-#additional support. The goal is to prevent floppy modules that don't maintain
-# constant distances between the plates
-
-LENGTH_SED_PLATE_CANTILEVERED = 20*u.cm
-
-DIST_CENTER_SED_PLATE = SPACE_SED_PLATE + THICKNESS_SED_PLATE
-
-N_SED_MODULE_PLATES_MAX = math.floor((LENGTH_SED_PLATE_CANTILEVERED/DIST_CENTER_SED_PLATE*np.tan(ANGLE_SED_PLATE ))+1)
-
-N_SED_MODULE_PLATES_MIN = 8
-
-NOM_DIAM_SED_HOPPER_DRAIN = 1*u.inch
-
-NOM_DIAM_SED_HOPPER_VIEWER = 2*u.inch
-
-NOM_DIAM_SED_HOPPER_SKIMMER = 2*u.inch
-
-##Diffusers/Jet Reverser
-
-NOM_DIAM_SED_DIFFUSER = 1*u.inch
-
-NOM_DIAM_SED_JET_REVERSER = 3*u.inch
-
-############ Material constants - stacked rapid sand filter ############
-
-#We are going to take this pipe size for the slotted pipes as a given.
-# Larger pipes may block too much flow and they are harder to install.
-NOM_DIAM_FILTER_MANIFOLD_BRANCH = 1*u.inch
-
-NOM_DIAM_FILTER_BACKWASH_MANIFOLD_BRANCH = 1.5*u.inch
-
-#A slot thickness of 0.008 in or 0.2 mm is selected so that sand
-# will not enter the slotted pipes.
-WIDTH_FILTER_MANIFOLD_SLOTS = 0.008*u.inch
-
-NOM_DIAM_FILTER_BRANCH_HOLDER = 2*u.inch
-
-NOM_DIAM_FILTER_BACKWASH_BRANCH_HOLDER = 2*u.inch
-
-#Minimum vertical spacing between trunk line pipes going through 
-#the filter wall for concrete construction
-SPACE_FILTER_TRUNK_MIN = 3*u.cm
-
-#Space between the ends of the branch receiver pipes and the walls so that 
-#the manifold assemblies are easy to lower into the filter boxes
-# (if the branch receivers extended the entire length of the box they would 
-#just barely fit and it would be hard to get into place)
-SPACE_FILTER_MANIFOLD_ASSEMBLY = 1*u.cm
-
-LENGTH_FILTER_MANIFOLD_FEMCO_COUPLING = 4*u.cm
-
-##Sand Properties
-
-DIAM_FILTER_SAND_EFFECTIVE_SIZE = 0.5*u.mm
-
-RATIO_UNIFORMITY_COEFF_FILTER_SAND = 1.65
-
-DIAM_FILTER_SAND_60 = DIAM_FILTER_SAND_EFFECTIVE_SIZE * RATIO_UNIFORMITY_COEFF_FILTER_SAND
-
-#Porosity in a sand bed
-POROSITY_FILTER_SAND = 0.4
-
-RHO_FILTER_SAND = 2650*u.kg/(u.m**3)
-
-RATIO_FILTER_FLUIDIZED = 1.3 #Bed expands 30% when fluidized
-
-#Carman-Kozeny coefficient
-K_KOZENY = 5
-
-############## Drill Series ##############
-
-DIAM_DRILL_ENG = [0.03125, 0.0625, 0.09375, 0.125, 0.15625, 0.1875, 0.21875, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875, 1, 1.25, 1.5, 1.75, 2]*u.inch
-
-DIAM_DRILL_MET = [0.5*u.mm]
-
-counter = 0
-
-
-while DIAM_DRILL_MET[counter] <= 4.98*u.mm:
-    counter+=1
-    DIAM_DRILL_MET.append(DIAM_DRILL_MET[counter-1] + 0.1*u.mm)
-    
-while DIAM_DRILL_MET[counter] < 20*u.mm:
-    counter+=1
-    DIAM_DRILL_MET.append(DIAM_DRILL_MET[counter-1] + 1*u.mm)
-    
-while DIAM_DRILL_MET[counter] < 50*u.mm:
-    counter+=1
-    DIAM_DRILL_MET.append(DIAM_DRILL_MET[counter-1] + 2*u.mm)
 
 def diam_drill(EN_DRILL_SERIES):
     if EN_DRILL_SERIES  == 0:
-        DIAM_DRILL = DIAM_DRILL_ENG
+        DIAM_DRILL = _TABLE.value('DIAM_DRILL_ENG')
     else:
-        DIAM_DRILL = DIAM_DRILL_MET
-    return DIAM_DRILL
\ No newline at end of file
+        DIAM_DRILL = _TABLE.value('DIAM_DRILL_MET')
+    return DIAM_DRILL
+
+
+__all__ = [row[0] for row in CONSTANTS] + ['catalog', 'diam_drill']
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Frozen, hashable sets of design parameters.
+
+Design functions take long lists of Quantities, which can't be used as
+dictionary keys and are slow to pickle. param_set makes a namedtuple class
+for the arguments of a design function that stores every value with units
+as a float (or a tuple of floats) in the units the function expects. Two
+parameter sets with the same values are equal and have the same hash and
+cache_key, whatever units the values were given in, and a parameter set
+pickles as a short tuple of numbers.
+
+Functions decorated with accepts take a parameter set in place of their
+arguments, e.g. cdc.len_cdc_tube(cdc.CDCParams(...)).
+"""
+
+######################### Imports #########################
+import collections
+import enum
+import functools
+import hashlib
+import sys
+
+import numpy as np
+
+from aide_design.units import unit_registry as u
+
+
+def param_set(typename, fields, defaults=None):
+    """Return a frozen parameter set class.
+
+    fields is a sequence of (name, units) pairs in the order of the
+    arguments of the design function. units is None for values without
+    units, such as coefficients, switches and Material objects. As with
+    u.wraps, numbers given for a field with units are taken to be in
+    those units. defaults are the default values of the last fields.
+    """
+    names = [name for name, units in fields]
+    module = sys._getframe(1).f_globals.get('__name__', '__main__')
+    base = collections.namedtuple(typename, names, defaults=defaults,
+                                  module=module)
+    return type(typename, (ParamSet, base),
+                {'__slots__': (), '__module__': module,
+                 'UNITS': tuple(units for name, units in fields)})
+
+
+class ParamSet:
+    """Methods shared by the classes made by param_set."""
+    __slots__ = ()
+
+    def __new__(cls, *args, **kwargs):
+        values = super().__new__(cls, *args, **kwargs)
+        return super().__new__(cls, *(_normalize(value, units) for value, units
+                                      in zip(values, cls.UNITS)))
+
+    @classmethod
+    def _make(cls, iterable):
+        return cls(*iterable)
+
+    @property
+    def cache_key(self):
+        """Return a hash of the values that is the same in every process."""
+        text = canonical((type(self).__name__, tuple(self)))
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def arguments(self):
+        """Return the values as arguments for the design function."""
+        return tuple(_quantity(value, units)
+                     for value, units in zip(self, self.UNITS))
+
+
+def _normalize(value, units):
+    """Return value as a hashable number or tuple in units."""
+    if units is not None:
+        if isinstance(value, u.Quantity):
+            value = value.to(units).magnitude
+        if value is None:
+            return None
+        value = np.asarray(value, dtype=float)
+    elif isinstance(value, (list, tuple, np.ndarray, np.generic)):
+        value = np.asarray(value)
+    else:
+        return value
+    return _tuple(value.tolist())
+
+
+def _tuple(x):
+    """Return nested lists as nested tuples."""
+    return tuple(_tuple(i) for i in x) if isinstance(x, list) else x
+
+
+def _quantity(value, units):
+    """Return a normalized value as a Quantity or array."""
+    if isinstance(value, tuple):
+        value = np.array(value)
+    if units is None or value is None:
+        return value
+    return value * units
+
+
+def canonical(x):
+    """Return a string that identifies x by value rather than by identity."""
+    if isinstance(x, (tuple, list)):
+        return '({0})'.format(','.join(canonical(i) for i in x))
+    if isinstance(x, dict):
+        return '{{{0}}}'.format(canonical(sorted(x.items())))
+    if isinstance(x, type):
+        return '{0}.{1}'.format(x.__module__, x.__qualname__)
+    if isinstance(x, enum.Enum):
+        return '{0}.{1}'.format(canonical(type(x)), x.name)
+    if isinstance(x, u.Quantity):
+        x = x.to_base_units()
+        return '{0} {1}'.format(
+            canonical(np.asarray(x.magnitude, dtype=float).tolist()), x.units)
+    if isinstance(x, np.ndarray):
+        return canonical(x.tolist())
+    if hasattr(x, '__dict__'):
+        return '{0}{1}'.format(canonical(type(x)),
+                               canonical(sorted(vars(x).items())))
+    return repr(x)
+
+
+def accepts(param_class):
+    """Let a design function take a param_class instance in place of the
+    arguments in it. Any further arguments are passed on unchanged.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if args and isinstance(args[0], param_class):
+                args = args[0].arguments() + args[1:]
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -12,19 +12,43 @@ physical/chemical unit processes for AguaClara water treatment plants.
 """
 
 ########################## Imports ##########################
+import functools
+import inspect
+
 import numpy as np
 from scipy import interpolate, integrate
 
 try:
     from aide_design.units import unit_registry as u
     from aide_design import utility as ut
+    from aide_design import params
 except ModuleNotFoundError:
     from aide_design.units import unit_registry as u
     from aide_design import utility as ut
+    from aide_design import params
 
 gravity = 9.80665 * u.m/u.s**2
 """Define the gravitational constant, in m/s²."""
 
+
+def nu_handler(func):
+    """Wraps a function so that its Nu argument can be a fluid.
+
+    Any Nu with a nu attribute, such as a fluids.Solution, is replaced by
+    that kinematic viscosity, so the function works for coagulant
+    solutions as well as for water.
+    """
+    position = list(inspect.signature(func).parameters).index('Nu')
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if 'Nu' in kwargs:
+            kwargs['Nu'] = getattr(kwargs['Nu'], 'nu', kwargs['Nu'])
+        elif len(args) > position:
+            args = list(args)
+            args[position] = getattr(args[position], 'nu', args[position])
+        return func(*args, **kwargs)
+    return wrapper
+
 ###################### Simple geometry ######################
 """A few equations for useful geometry.
 Is there a geometry package that we should be using?"""
@@ -47,6 +71,11 @@ RATIO_VC_ORIFICE = 0.62
 
 RE_TRANSITION_PIPE = 2100
 
+# Relative tolerances of the iterative solvers flow_pipe and diam_pipe. The
+# iteration limit and other tolerances can be set with utility.SolverLog.
+RTOL_FLOW_PIPE = 0.01
+RTOL_DIAM_PIPE = 0.001
+
 K_KOZENY=5
 
 
@@ -99,6 +128,7 @@ def viscosity_kinematic(temp):
             / density_water(temp).magnitude)
 
 
+@nu_handler
 @u.wraps(None, [u.m**3/u.s, u.m, u.m**2/u.s], False)
 def re_pipe(FlowRate, Diam, Nu):
     """Return the Reynolds Number for a pipe."""
@@ -132,6 +162,7 @@ def radius_hydraulic_general(Area, PerimWetted):
     return Area / PerimWetted 
 
 
+@nu_handler
 @u.wraps(None, [u.m**3/u.s, u.m, u.m, u.m**2/u.s, u.dimensionless], False)
 def re_rect(FlowRate, Width, DistCenter, Nu, openchannel):
     """Return the Reynolds Number for a rectangular channel."""
@@ -145,6 +176,7 @@ def re_rect(FlowRate, Width, DistCenter, Nu, openchannel):
     #are wetted; l = Diam and Diam = 4*R.h     
     
 
+@nu_handler
 @u.wraps(None, [u.m/u.s, u.m**2, u.m, u.m**2/u.s], False)
 def re_general(Vel, Area, PerimWetted, Nu):
     """Return the Reynolds Number for a general cross section."""
@@ -154,6 +186,7 @@ def re_general(Vel, Area, PerimWetted, Nu):
     return 4 * radius_hydraulic_general(Area, PerimWetted).magnitude * Vel / Nu
 
 
+@nu_handler
 @u.wraps(None, [u.m**3/u.s, u.m, u.m**2/u.s, u.m], False)
 @ut.list_handler
 def fric(FlowRate, Diam, Nu, PipeRough):
@@ -177,6 +210,7 @@ def fric(FlowRate, Diam, Nu, PipeRough):
     return f
 
 
+@nu_handler
 @u.wraps(None, [u.m**3/u.s, u.m, u.m, u.m**2/u.s, u.m, u.dimensionless], False)
 @ut.list_handler
 def fric_rect(FlowRate, Width, DistCenter, Nu, PipeRough, openchannel):
@@ -204,6 +238,7 @@ def fric_rect(FlowRate, Width, DistCenter, Nu, PipeRough, openchannel):
         return 64 / re_rect(FlowRate, Width, DistCenter, Nu, openchannel)
 
 
+@nu_handler
 @u.wraps(None, [u.m**2, u.m, u.m/u.s, u.m**2/u.s, u.m], False)
 @ut.list_handler
 def fric_general(Area, PerimWetted, Vel, Nu, PipeRough):
@@ -231,6 +266,7 @@ def fric_general(Area, PerimWetted, Vel, Nu, PipeRough):
     return f      
 
 
+@nu_handler
 @u.wraps(u.m, [u.m**3/u.s, u.m, u.m, u.m**2/u.s, u.m], False)
 def headloss_fric(FlowRate, Diam, Length, Nu, PipeRough):
     """Return the major head loss (due to wall shear) in a pipe.
@@ -258,6 +294,14 @@ def headloss_exp(FlowRate, Diam, KMinor):
     return KMinor * 8 / (gravity.magnitude * np.pi**2) * FlowRate**2 / Diam**4
 
 
+# The arguments of headloss, which accepts a HeadlossParams in their place.
+HeadlossParams = params.param_set('HeadlossParams', (
+    ('FlowRate', u.m**3/u.s), ('Diam', u.m), ('Length', u.m),
+    ('Nu', u.m**2/u.s), ('PipeRough', u.m), ('KMinor', None)))
+
+
+@params.accepts(HeadlossParams)
+@nu_handler
 @u.wraps(u.m, [u.m**3/u.s, u.m, u.m, u.m**2/u.s, u.m, u.dimensionless], False)
 def headloss(FlowRate, Diam, Length, Nu, PipeRough, KMinor):
     """Return the total head loss from major and minor losses in a pipe.
@@ -270,6 +314,7 @@ def headloss(FlowRate, Diam, Length, Nu, PipeRough, KMinor):
             + headloss_exp(FlowRate, Diam, KMinor).magnitude)
 
 
+@nu_handler
 @u.wraps(u.m, [u.m**3/u.s, u.m, u.m, u.m, u.m**2/u.s, u.m, u.dimensionless], False)
 def headloss_fric_rect(FlowRate, Width, DistCenter, Length, Nu, PipeRough, openchannel):
     """Return the major head loss due to wall shear in a rectangular channel.
@@ -302,6 +347,7 @@ def headloss_exp_rect(FlowRate, Width, DistCenter, KMinor):
             )
 
 
+@nu_handler
 @u.wraps(u.m, [u.m**3/u.s, u.m, u.m, u.m, u.dimensionless, u.m**2/u.s, u.m, u.dimensionless], False)
 def headloss_rect(FlowRate, Width, DistCenter, Length, 
                   KMinor, Nu, PipeRough, openchannel):
@@ -317,6 +363,7 @@ def headloss_rect(FlowRate, Width, DistCenter, Length,
                                    Nu, PipeRough, openchannel).magnitude)
 
 
+@nu_handler
 @u.wraps(u.m, [u.m**2, u.m, u.m/u.s, u.m, u.m**2/u.s, u.m], False)
 def headloss_fric_general(Area, PerimWetted, Vel, Length, Nu, PipeRough):
     """Return the major head loss due to wall shear in the general case.
@@ -343,6 +390,7 @@ def headloss_exp_general(Vel, KMinor):
     return KMinor * Vel**2 / (2*gravity.magnitude)
 
 
+@nu_handler
 @u.wraps(u.m, [u.m**2, u.m/u.s, u.m, u.m, u.dimensionless, u.m**2/u.s, u.m], False)
 def headloss_gen(Area, Vel, PerimWetted, Length, KMinor, Nu, PipeRough):
     """Return the total head lossin the general case.
@@ -357,6 +405,7 @@ def headloss_gen(Area, Vel, PerimWetted, Length, KMinor, Nu, PipeRough):
                                      Length, Nu, PipeRough).magnitude)
 
 
+@nu_handler
 @u.wraps(u.m, [u.m**2/u.s, u.m, u.m, u.dimensionless, 
                u.m**2/u.s, u.m, u.dimensionless], False)
 def headloss_manifold(FlowRate, Diam, Length, KMinor, Nu, PipeRough, NumOutlets):
@@ -404,6 +453,45 @@ def flow_orifice_vert(Diam, Height, RatioVCOrifice):
         return 0
 
 
+# Gauss-Legendre nodes and weights on [-1, 1] for flow_orifice_vert_array.
+_NODES_ORIFICE, _WEIGHTS_ORIFICE = np.polynomial.legendre.leggauss(32)
+
+
+@u.wraps(u.m**3/u.s, [u.m, u.m, u.dimensionless], False)
+def flow_orifice_vert_array(Diam, Height, RatioVCOrifice):
+    """Return the vertical flow rate of orifices for arrays of inputs.
+    
+    This is flow_orifice_vert for broadcastable arrays of Diam and Height.
+    The integral over the submerged part of the orifice is taken with
+    Gauss-Legendre quadrature after a change of variables that removes the
+    square root singularities at its ends. It agrees with
+    flow_orifice_vert to about eight significant digits unless the water
+    level is within a tiny fraction of the diameter of the bottom of the
+    orifice.
+    """
+    #Checking input validity
+    ut.check_range([Diam, ">0", "Diameter"],
+                   [RatioVCOrifice, "0-1", "VC orifice ratio"])
+    Diam, Height = np.broadcast_arrays(np.asarray(Diam, dtype=float),
+                                       np.asarray(Height, dtype=float))
+    radius = Diam[..., np.newaxis] / 2
+    head = Height[..., np.newaxis]
+    # z = center - half*cos(phi) runs from the bottom of the orifice to
+    # the lower of its top and the water surface as phi goes from 0 to pi.
+    top = np.minimum(radius, head)
+    center = (top - radius) / 2
+    half = (top + radius) / 2
+    phi = np.pi / 2 * (_NODES_ORIFICE + 1)
+    z = center - half * np.cos(phi)
+    width = 2 * np.sqrt(np.maximum(radius**2 - z**2, 0))
+    integrand = (width * np.sqrt(np.maximum(head - z, 0)) 
+                 * half * np.sin(phi))
+    flow_vert = np.pi / 2 * np.sum(_WEIGHTS_ORIFICE * integrand, axis=-1)
+    return np.where(Height > -Diam / 2, 
+                    flow_vert * RatioVCOrifice * np.sqrt(2 * gravity.magnitude),
+                    0)
+
+
 @u.wraps(u.m, [u.m, u.dimensionless, u.m**3/u.s], False)
 def head_orifice(Diam, RatioVCOrifice, FlowRate):
     """Return the head of the orifice."""
@@ -437,6 +525,7 @@ def num_orifices(FlowPlant, RatioVCOrifice, HeadLossOrifice, DiamOrifice):
 
 
 # Here we define functions that return the flow rate.
+@nu_handler
 @u.wraps(u.m**3/u.s, [u.m, u.m**2/u.s], False)
 def flow_transition(Diam, Nu):
     """Return the flow rate for the laminar/turbulent transition.
@@ -448,6 +537,7 @@ def flow_transition(Diam, Nu):
     return np.pi * Diam * RE_TRANSITION_PIPE * Nu / 4
 
 
+@nu_handler
 @u.wraps(u.m**3/u.s, [u.m, u.m, u.m, u.m**2/u.s], False)
 def flow_hagen(Diam, HeadLossFric, Length, Nu):
     """Return the flow rate for laminar flow with only major losses."""
@@ -458,6 +548,7 @@ def flow_hagen(Diam, HeadLossFric, Length, Nu):
     return (np.pi*Diam**4) / (128*Nu) * gravity.magnitude * HeadLossFric / Length
 
 
+@nu_handler
 @u.wraps(u.m**3/u.s, [u.m, u.m, u.m, u.m**2/u.s, u.m], False)
 def flow_swamee(Diam, HeadLossFric, Length, Nu, PipeRough):
     """Return the flow rate for turbulent flow with only major losses."""
@@ -476,6 +567,7 @@ def flow_swamee(Diam, HeadLossFric, Length, Nu, PipeRough):
             )
 
 
+@nu_handler
 @u.wraps(u.m**3/u.s, [u.m, u.m, u.m, u.m**2/u.s, u.m], False)
 @ut.list_handler
 def flow_pipemajor(Diam, HeadLossFric, Length, Nu, PipeRough):
@@ -510,16 +602,28 @@ def flow_pipeminor(Diam, HeadLossExpans, KMinor):
 # Now we put all of the flow equations together and calculate the flow in a 
 # straight pipe that has both major and minor losses and might be either
 # laminar or turbulent.
+# The arguments of flow_pipe, which accepts a FlowPipeParams in their place.
+FlowPipeParams = params.param_set('FlowPipeParams', (
+    ('Diam', u.m), ('HeadLoss', u.m), ('Length', u.m), ('Nu', u.m**2/u.s),
+    ('PipeRough', u.m), ('KMinor', None)))
+
+
+@params.accepts(FlowPipeParams)
+@nu_handler
 @u.wraps(u.m**3/u.s, [u.m, u.m, u.m, u.m**2/u.s, u.m, u.dimensionless], False)
 @ut.list_handler
 def flow_pipe(Diam, HeadLoss, Length, Nu, PipeRough, KMinor):
     """Return the the flow in a straight pipe.
     
     This function works for both major and minor losses and 
-    works whether the flow is laminar or turbulent.
+    works whether the flow is laminar or turbulent. With minor losses the
+    flow is found by iteration, which is reported to utility.SolverLog.
     """
     #Inputs do not need to be checked here because they are checked by
     #functions this function calls.
+    MaxIter, RTol = ut.solver_limits('flow_pipe', RTOL_FLOW_PIPE)
+    Iterations = 0
+    err = 0.0
     if KMinor == 0:
         FlowRate = flow_pipemajor(Diam, HeadLoss, Length, Nu, 
                                   PipeRough).magnitude
@@ -530,7 +634,8 @@ def flow_pipe(Diam, HeadLoss, Length, Nu, PipeRough, KMinor):
                                       Nu, PipeRough).magnitude,
                        flow_pipeminor(Diam, HeadLoss, KMinor).magnitude
                        )
-        while err > 0.01:
+        while err > RTol and Iterations < MaxIter:
+            Iterations += 1
             FlowRatePrev = FlowRate
             HLFricNew = (HeadLoss * headloss_fric(FlowRate, Diam, Length, 
                                                   Nu, PipeRough).magnitude 
@@ -547,9 +652,11 @@ def flow_pipe(Diam, HeadLoss, Length, Nu, PipeRough, KMinor):
                 err = (abs(FlowRate - FlowRatePrev) 
                        / ((FlowRate + FlowRatePrev) / 2)
                        )
+    ut.report_solver('flow_pipe', Iterations, err, err <= RTol)
     return FlowRate	
 
 
+@nu_handler
 @u.wraps(u.m, [u.m**3/u.s, u.m, u.m, u.m**2/u.s], False)
 def diam_hagen(FlowRate, HeadLossFric, Length, Nu):
     #Checking input validity
@@ -561,6 +668,7 @@ def diam_hagen(FlowRate, HeadLossFric, Length, Nu):
             ) ** (1/4)
 
 
+@nu_handler
 @u.wraps(u.m, [u.m**3/u.s, u.m, u.m, u.m**2/u.s, u.m], False)
 def diam_swamee(FlowRate, HeadLossFric, Length, Nu, PipeRough):
     """Return the inner diameter of a pipe.
@@ -586,6 +694,7 @@ def diam_swamee(FlowRate, HeadLossFric, Length, Nu, PipeRough):
     return 0.66 * (a+b)**0.04
 
 
+@nu_handler
 @u.wraps(u.m, [u.m**3/u.s, u.m, u.m, u.m**2/u.s, u.m], False)
 @ut.list_handler
 def diam_pipemajor(FlowRate, HeadLossFric, Length, Nu, PipeRough):
@@ -617,16 +726,28 @@ def diam_pipeminor(FlowRate, HeadLossExpans, KMinor):
             )
 
 
+# The arguments of diam_pipe, which accepts a DiamPipeParams in their place.
+DiamPipeParams = params.param_set('DiamPipeParams', (
+    ('FlowRate', u.m**3/u.s), ('HeadLoss', u.m), ('Length', u.m),
+    ('Nu', u.m**2/u.s), ('PipeRough', u.m), ('KMinor', None)))
+
+
+@params.accepts(DiamPipeParams)
+@nu_handler
 @u.wraps(u.m, [u.m**3/u.s, u.m, u.m, u.m**2/u.s, u.m, None], False)
 @ut.list_handler
 def diam_pipe(FlowRate, HeadLoss, Length, Nu, PipeRough, KMinor):
     """Return the pipe ID that would result in the given total head loss.
     
     This function applies to both laminar and turbulent flow and
-    incorporates both minor and major losses.
+    incorporates both minor and major losses. With minor losses the
+    diameter is found by iteration, which is reported to utility.SolverLog.
     """
     #Inputs do not need to be checked here because they are checked by
     #functions this function calls.
+    MaxIter, RTol = ut.solver_limits('diam_pipe', RTOL_DIAM_PIPE)
+    Iterations = 0
+    err = 0.0
     if KMinor == 0:
         Diam = diam_pipemajor(FlowRate, HeadLoss, Length, Nu, 
                               PipeRough).magnitude
@@ -635,7 +756,8 @@ def diam_pipe(FlowRate, HeadLoss, Length, Nu, PipeRough, KMinor):
                                   Length, Nu, PipeRough).magnitude,
                    diam_pipeminor(FlowRate, HeadLoss, KMinor).magnitude)
         err = 1.00
-        while err > 0.001:
+        while err > RTol and Iterations < MaxIter:
+            Iterations += 1
             DiamPrev = Diam
             HLFricNew = (HeadLoss * headloss_fric(FlowRate, Diam, Length, 
                                                   Nu, PipeRough
@@ -651,6 +773,7 @@ def diam_pipe(FlowRate, HeadLoss, Length, Nu, PipeRough, KMinor):
             Diam = diam_pipemajor(FlowRate, HLFricNew, Length, Nu, PipeRough
                                   ).magnitude
             err = abs(Diam - DiamPrev) / ((Diam + DiamPrev) / 2)
+    ut.report_solver('diam_pipe', Iterations, err, err <= RTol)
     return Diam
 
 # Weir head loss equations
@@ -703,6 +826,7 @@ def vel_horizontal(HeightWaterCritical):
     return np.sqrt(gravity.magnitude * HeightWaterCritical)
 
 
+@nu_handler
 @u.wraps(u.m, [u.m, u.m, u.m/u.s, u.m, u.m**2/u.s], False)
 def headloss_kozeny(Length, Diam, Vel, PipeRough, Nu):
     """Return the Carmen Kozeny Sand Bed head loss."""
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Opt in profiling of the design functions.
+
+A Profiler replaces the public functions of physchem, floc_model,
+cdc_functions and pipedatabase, and utility.check_range, with timed
+versions until it is disabled, so nothing is measured, and nothing costs
+any time, unless a Profiler is enabled. Calls between design functions go
+through their modules, so they are timed as well.
+
+Each layer of a decorated function is timed separately: the layers that
+pint adds with u.wraps are counted as units, the layers added by
+list_handler, nu_handler and params.accepts as handlers, and the function
+itself as compute. For every function the profiler records the number of
+calls, the inclusive time, the exclusive time spent in the function
+itself rather than in the other timed functions it calls, and the split of
+the exclusive time between units, handlers and compute.
+
+    with profiling.Profiler() as profiler:
+        pc.flow_pipe(...)
+    print(profiler.format_table())
+    profiler.write_stacks('flow_pipe.folded')
+
+write_table saves the table as CSV and write_stacks saves the exclusive
+time of each call stack, in microseconds, in the collapsed stack format
+read by flamegraph.pl and speedscope.
+"""
+
+######################### Imports #########################
+import collections
+import csv
+import functools
+import importlib
+import inspect
+import threading
+import time
+
+# The functions that are profiled, as (module, function names) pairs.
+# None stands for every public function of the module.
+PROFILED_FUNCTIONS = (
+    ('aide_design.physchem', None),
+    ('aide_design.floc_model', None),
+    ('aide_design.cdc_functions', None),
+    ('aide_design.pipedatabase', None),
+    ('aide_design.utility', ('check_range',)),
+    )
+
+# Columns of the profile table.
+COLUMNS = ('name', 'calls', 'inclusive', 'exclusive', 'units', 'handlers',
+           'compute')
+
+# Columns of the per function statistics that each layer adds its time to.
+_LAYERS = {'units': 2, 'handlers': 3, 'compute': 4}
+
+
+class Profiler:
+    """Time the calls of design functions while enabled.
+
+    Each thread keeps its own statistics, which table merges, so a
+    Profiler can be enabled while designs run in a thread pool.
+    """
+    def __init__(self, functions=PROFILED_FUNCTIONS):
+        self.functions = functions
+        self._replaced = []
+        self._cells = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    @property
+    def enabled(self):
+        return bool(self._replaced)
+
+    def enable(self):
+        """Replace the profiled functions with timed versions."""
+        if self.enabled:
+            raise RuntimeError("The profiler is already enabled.")
+        for module_name, names in self.functions:
+            module = importlib.import_module(module_name)
+            if names is None:
+                names = _public_functions(module)
+            for name in names:
+                self._instrument(module, name)
+
+    def disable(self):
+        """Put back the functions replaced by enable."""
+        while self._cells:
+            cell, func = self._cells.pop()
+            cell.cell_contents = func
+        while self._replaced:
+            module, name, func = self._replaced.pop()
+            setattr(module, name, func)
+
+    def reset(self):
+        """Forget the calls recorded so far."""
+        with self._lock:
+            self._threads = []
+            self._local = threading.local()
+
+    def _instrument(self, module, name):
+        """Replace module.name, and each layer of decorators under it, with
+        timed versions.
+        """
+        func = getattr(module, name)
+        label = '{0}.{1}'.format(module.__name__.rpartition('.')[2], name)
+        layers = [func]
+        while inspect.isfunction(getattr(layers[-1], '__wrapped__', None)):
+            layers.append(layers[-1].__wrapped__)
+        # The decorators call the layer under them through a closure cell,
+        # which is swapped for the timed version of that layer.
+        for outer, inner in zip(layers, layers[1:]):
+            for cell in outer.__closure__ or ():
+                try:
+                    if cell.cell_contents is not inner:
+                        continue
+                except ValueError:
+                    continue
+                self._cells.append((cell, inner))
+                cell.cell_contents = self._timed(
+                    inner, label, _layer(inner, inner is layers[-1]), False)
+        self._replaced.append((module, name, func))
+        setattr(module, name, self._timed(func, label,
+                                          _layer(func, len(layers) == 1), True))
+
+    def _timed(self, func, label, layer, outermost):
+        """Return func timed as the given layer of the function label."""
+        column = _LAYERS[layer]
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            state = self._state()
+            if outermost:
+                state.path.append(label)
+            frame = [0.0]
+            state.frames.append(frame)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                state.frames.pop()
+                if state.frames:
+                    state.frames[-1][0] += elapsed
+                row = state.stats.get(label)
+                if row is None:
+                    row = state.stats[label] = [0, 0.0, 0.0, 0.0, 0.0]
+                row[column] += elapsed - frame[0]
+                state.stacks[';'.join(state.path)] += elapsed - frame[0]
+                if outermost:
+                    state.path.pop()
+                    row[0] += 1
+                    # Recursive calls are already in the inclusive time of
+                    # the outer call.
+                    if label not in state.path:
+                        row[1] += elapsed
+        return timed
+
+    def _state(self):
+        """Return the call stack and statistics of this thread."""
+        state = self._local
+        if not hasattr(state, 'frames'):
+            state.frames = []
+            state.path = []
+            state.stats = {}
+            state.stacks = collections.Counter()
+            with self._lock:
+                self._threads.append(state)
+        return state
+
+    def table(self):
+        """Return a row for each function called, as a dictionary of
+        COLUMNS, sorted by exclusive time. Times are in seconds.
+        """
+        totals = collections.defaultdict(lambda: [0, 0.0, 0.0, 0.0, 0.0])
+        with self._lock:
+            threads = list(self._threads)
+        for state in threads:
+            for label, row in list(state.stats.items()):
+                total = totals[label]
+                for i, value in enumerate(row):
+                    total[i] += value
+        rows = [dict(zip(COLUMNS, (label, row[0], row[1], sum(row[2:]))
+                         + tuple(row[2:])))
+                for label, row in totals.items()]
+        return sorted(rows, key=lambda row: row['exclusive'], reverse=True)
+
+    def format_table(self, n_rows=None):
+        """Return the table as text, with times in milliseconds."""
+        lines = ['{0:<40} {1:>8} {2:>11} {3:>11} {4:>11} {5:>11} '
+                 '{6:>11}'.format(*COLUMNS)]
+        for row in self.table()[:n_rows]:
+            lines.append('{name:<40} {calls:>8} '.format(**row)
+                         + ' '.join('{0:>11.3f}'.format(row[column] * 1000)
+                                    for column in COLUMNS[2:]))
+        return '\n'.join(lines)
+
+    def write_table(self, path):
+        """Write the table to a CSV file, with times in seconds."""
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.table())
+
+    def stacks(self):
+        """Return the exclusive time of each call stack in microseconds, as
+        a dictionary of stacks joined by ';'.
+        """
+        totals = collections.Counter()
+        with self._lock:
+            threads = list(self._threads)
+        for state in threads:
+            totals.update(dict(state.stacks))
+        return {stack: int(round(seconds * 1e6))
+                for stack, seconds in totals.items() if stack}
+
+    def write_stacks(self, path):
+        """Write the stacks in the collapsed format of flamegraph.pl."""
+        with open(path, 'w') as file:
+            for stack, microseconds in sorted(self.stacks().items()):
+                if microseconds > 0:
+                    file.write('{0} {1}\n'.format(stack, microseconds))
+
+
+def _public_functions(module):
+    """Return the names of the public functions defined in module."""
+    return [name for name, value in vars(module).items()
+            if not name.startswith('_') and inspect.isfunction(value)
+            and value.__module__ == module.__name__]
+
+
+def _layer(func, innermost):
+    """Return whether func is a units, handlers or compute layer."""
+    if innermost:
+        return 'compute'
+    if 'pint' in func.__code__.co_filename:
+        return 'units'
+    return 'handlers'
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Columnar on-disk store of design sweep results.
+
+A ResultStore is a directory with one .npy file per column and a
+header.json that records the number of rows and the dtype, units and
+categories of every column. Chunks of rows are appended as they are
+designed, e.g. by Sweep.run(store=...). Reading a column maps its file
+into memory instead of loading it, so a store of 100 million rows opens
+at once and only the rows that are used are read from disk.
+
+Columns of numbers with units are stored as float64 magnitudes in the
+units of the first chunk and read back as Quantities. Columns of other
+values, such as floc_model Chemicals, are stored as integer codes into a
+list of categories; Materials are stored by name and missing values, None
+or NaN, as the category None. Columns of other numbers keep the dtype of
+the first chunk, and later chunks that can't be stored in it without loss,
+such as floats appended to a column of integers or integers too large for
+it, are rejected.
+
+Each .npy file has a header of a fixed size that is rewritten after every
+append, so every file can also be opened on its own with
+np.load(path, mmap_mode='r'). header.json is written last, so a store
+that was being appended to when a process crashed still holds the rows of
+every finished append.
+
+    store = ResultStore('sweep_results')
+    store.append({'FlowPlant': flows, 'pC': pC})
+    pC = store['pC'][1000:2000]
+"""
+
+######################### Imports #########################
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from aide_design.units import unit_registry as u
+
+# Size of the header of each column file in bytes; a multiple of 64 as
+# required by the .npy format.
+SIZE_HEADER = 128
+
+_HEADER = 'header.json'
+_MAGIC = b'\x93NUMPY\x01\x00'
+
+
+class ResultStore:
+    """Columns of sweep results stored in the directory path.
+
+    The directory is created if it doesn't exist. A store can have many
+    readers but only one process may append to it at a time.
+    """
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._maps = {}
+        self.refresh()
+
+    def refresh(self):
+        """Read the header again, to see rows appended by another process."""
+        header = os.path.join(self.path, _HEADER)
+        if os.path.exists(header):
+            with open(header) as file:
+                saved = json.load(file)
+        else:
+            saved = {'n_rows': 0, 'columns': []}
+        self.n_rows = saved['n_rows']
+        self.schema = {column['name']: column for column in saved['columns']}
+        self._maps = {}
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def columns(self):
+        return list(self.schema)
+
+    def units(self, name):
+        """Return the units of column name, or None."""
+        units = self.schema[name]['units']
+        return None if units is None else u.Unit(units)
+
+    def append(self, columns):
+        """Append rows given as a dictionary of equal length columns.
+
+        The first append sets the names, dtypes and units of the columns;
+        later appends must have the same names and are converted to those
+        units.
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("The columns have lengths {0} but must all be "
+                             "the same length.".format(sorted(lengths)))
+        n_new = lengths.pop()
+        if not self.schema:
+            self.schema = {name: _describe(name, values)
+                           for name, values in columns.items()}
+            for name in self.schema:
+                with open(self._file(name), 'wb') as file:
+                    file.write(_npy_header(self.schema[name]['dtype'], 0))
+        elif set(columns) != set(self.schema):
+            raise ValueError("The columns are {0} but must be {1}.".format(
+                sorted(columns), sorted(self.schema)))
+        data = {name: _encode(self.schema[name], values)
+                for name, values in columns.items()}
+        for name, values in data.items():
+            dtype = np.dtype(self.schema[name]['dtype'])
+            with open(self._file(name), 'r+b') as file:
+                # Drop anything left over from an append that didn't finish.
+                file.truncate(SIZE_HEADER + self.n_rows * dtype.itemsize)
+                file.seek(0, os.SEEK_END)
+                file.write(np.ascontiguousarray(values, dtype).tobytes())
+                file.seek(0)
+                file.write(_npy_header(dtype, self.n_rows + n_new))
+        self.n_rows += n_new
+        self._maps = {}
+        temporary = os.path.join(self.path, _HEADER + '.tmp')
+        with open(temporary, 'w') as file:
+            json.dump({'n_rows': self.n_rows,
+                       'columns': list(self.schema.values())}, file)
+        os.replace(temporary, os.path.join(self.path, _HEADER))
+
+    def _file(self, name):
+        return os.path.join(self.path, name + '.npy')
+
+    def raw(self, name):
+        """Return the stored values of column name, mapped from disk."""
+        if name not in self._maps:
+            column = self.schema[name]
+            if self.n_rows == 0:
+                self._maps[name] = np.empty(0, column['dtype'])
+            else:
+                self._maps[name] = np.memmap(
+                    self._file(name), column['dtype'], 'r',
+                    offset=SIZE_HEADER, shape=(self.n_rows,))
+        return self._maps[name]
+
+    def column(self, name, rows=slice(None)):
+        """Return the rows of column name, as a Quantity if it has units.
+
+        The rows are read lazily unless the column has categories.
+        """
+        column = self.schema[name]
+        values = self.raw(name)[rows]
+        if column['categories'] is not None:
+            return np.array(column['categories'], dtype=object)[values]
+        if column['units'] is not None:
+            return u.Quantity(values, column['units'])
+        return values
+
+    __getitem__ = column
+
+    def read(self, names=None, rows=slice(None)):
+        """Return a dictionary of the rows of the columns called names, or
+        of every column.
+        """
+        return {name: self.column(name, rows) for name in names or self.schema}
+
+
+def _describe(name, values):
+    """Return the schema of a column from its first values."""
+    if not re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', name):
+        raise ValueError("{0} is not a valid column name.".format(name))
+    units = categories = None
+    if isinstance(values, u.Quantity):
+        units = '{:~}'.format(values.units)
+        dtype = np.float64
+    else:
+        array = np.asarray(values)
+        if array.dtype.kind in 'biuf':
+            dtype = array.dtype
+        else:
+            dtype = np.int32
+            categories = []
+    return {'name': name, 'dtype': np.dtype(dtype).str, 'units': units,
+            'categories': categories}
+
+
+def _encode(column, values):
+    """Return values as an array of the dtype of column."""
+    if column['categories'] is not None:
+        categories = column['categories']
+        codes = {label: i for i, label in enumerate(categories)}
+        factors, uniques = pd.factorize(np.asarray(values, dtype=object))
+        for value in uniques:
+            label = _label(value)
+            if label not in codes:
+                codes[label] = len(categories)
+                categories.append(label)
+        # factorize codes missing values as -1, the last entry of the table.
+        if (factors == -1).any() and None not in codes:
+            codes[None] = len(categories)
+            categories.append(None)
+        table = np.array([codes[_label(value)] for value in uniques]
+                         + [codes.get(None, -1)], np.int32)
+        return table[factors]
+    if column['units'] is not None:
+        return u.Quantity(values).to(column['units']).magnitude
+    if isinstance(values, u.Quantity):
+        raise ValueError("Column {0} has no units but was given {1}.".format(
+            column['name'], values.units))
+    values = np.asarray(values)
+    dtype = np.dtype(column['dtype'])
+    # Values of a wider dtype are only stored if they are unchanged by the
+    # cast, e.g. small int64 values in an int32 column.
+    if values.size and not np.can_cast(values.dtype, dtype, 'safe') and not (
+            np.can_cast(values.dtype, dtype, 'same_kind')
+            and np.array_equal(values.astype(dtype), values, equal_nan=True)):
+        raise ValueError("Column {0} stores {1} but was given {2} that "
+                         "don't fit.".format(column['name'], dtype,
+                                             values.dtype))
+    return values
+
+
+def _label(value):
+    """Return how a categorical value is stored: Materials by name."""
+    value = getattr(value, 'name', value)
+    if isinstance(value, np.generic):
+        value = value.item()
+    return value
+
+
+def _npy_header(dtype, n_rows):
+    """Return a .npy version 1.0 header of SIZE_HEADER bytes."""
+    text = repr({'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                 'fortran_order': False, 'shape': (n_rows,)})
+    text = text.ljust(SIZE_HEADER - len(_MAGIC) - 2 - 1) + '\n'
+    return _MAGIC + len(text).to_bytes(2, 'little') + text.encode('latin1')
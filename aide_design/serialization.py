@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+JSON encoding and decoding of Quantities and design results.
+
+Quantities are written as {"magnitude": ..., "units": ...}, the form of
+design_request_example.json, where magnitude is a number or an array.
+Arrays smaller than SIZE_BINARY_MIN are written as lists, which keep
+their type: integer arrays as integers and float arrays as floats. Larger
+arrays are written as {"dtype": ..., "shape": ..., "base64": ...}, their
+bytes in base64, which is smaller and much faster to write and read than
+a list of numbers. floc_model Materials and Chemicals are written as
+their attributes and the name of their class, {"__material__":
+"Chemical", "name": "PACl", ...}. Dictionaries, lists and tuples of these, such as
+the results of the designs, are written as JSON objects and arrays.
+
+The units of a Quantity are formatted, and unit strings are parsed, once
+each, as they are cached. dump writes a result to a file in chunks as it
+is encoded, so a large result is never held in memory as one string.
+
+    text = serialization.dumps({'flow': flows, 'coag': floc.PACl})
+    result = serialization.loads(text)
+"""
+
+######################### Imports #########################
+import base64
+import functools
+import json
+
+import numpy as np
+
+from aide_design.units import unit_registry as u
+from aide_design import floc_model as floc
+
+# Arrays with at least this many elements are written in base64.
+SIZE_BINARY_MIN = 1024
+
+# Number of array elements, or base64 characters, written at a time.
+SIZE_CHUNK = 2**16
+
+_FIELDS_BINARY = {'dtype', 'shape', 'base64'}
+
+# The key that marks an encoded Material, which no parameter is called, and
+# the classes it may name.
+_KEY_MATERIAL = '__material__'
+_MATERIALS = {'Material': floc.Material, 'Chemical': floc.Chemical}
+
+
+######################### Encoding #########################
+def iterencode(obj, binary=None):
+    """Return a generator of the pieces of the JSON text of obj.
+
+    binary is True to write every array in base64, False to write every
+    array as a list, and None to write arrays of at least SIZE_BINARY_MIN
+    elements in base64.
+    """
+    if isinstance(obj, u.Quantity):
+        yield '{"magnitude": '
+        yield from iterencode(obj.magnitude, binary)
+        yield ', "units": ' + json.dumps(_units_text(obj._units)) + '}'
+    elif isinstance(obj, dict):
+        yield '{'
+        for i, (key, value) in enumerate(obj.items()):
+            yield (', ' if i else '') + json.dumps(str(key)) + ': '
+            yield from iterencode(value, binary)
+        yield '}'
+    elif isinstance(obj, (list, tuple)):
+        yield '['
+        for i, value in enumerate(obj):
+            if i:
+                yield ', '
+            yield from iterencode(value, binary)
+        yield ']'
+    elif isinstance(obj, np.ndarray):
+        yield from _iterencode_array(obj, binary)
+    elif isinstance(obj, np.generic):
+        yield json.dumps(obj.item())
+    elif isinstance(obj, floc.Material):
+        yield from iterencode(dict({_KEY_MATERIAL: type(obj).__name__},
+                                   **vars(obj)), binary)
+    else:
+        yield json.dumps(obj)
+
+
+def _iterencode_array(array, binary):
+    """Return a generator of the pieces of the JSON text of an array."""
+    if array.dtype.kind not in 'biuf':
+        yield json.dumps(array.tolist())
+    elif binary or (binary is None and array.size >= SIZE_BINARY_MIN):
+        data = memoryview(np.ascontiguousarray(array)).cast('B')
+        yield '{{"dtype": "{0}", "shape": {1}, "base64": "'.format(
+            array.dtype.str, json.dumps(list(array.shape)))
+        # A multiple of 3 bytes is encoded without padding, so the chunks
+        # join into one base64 string.
+        step = 3 * SIZE_CHUNK
+        for start in range(0, len(data), step):
+            yield base64.b64encode(data[start:start + step]).decode('ascii')
+        yield '"}'
+    elif array.ndim == 0:
+        yield json.dumps(array.item())
+    else:
+        # Rows are written a chunk at a time; lists of numbers are
+        # formatted by the C encoder of the json module.
+        step = max(1, SIZE_CHUNK // max(1, array[0].size))
+        yield '['
+        for start in range(0, len(array), step):
+            text = json.dumps(array[start:start + step].tolist())
+            yield (', ' if start else '') + text[1:-1]
+        yield ']'
+
+
+@functools.lru_cache(maxsize=None)
+def _units_text(units):
+    """Return the abbreviated string of a UnitsContainer."""
+    return '{:~}'.format(u.Unit(units))
+
+
+def dumps(obj, binary=None):
+    """Return the JSON text of obj."""
+    return ''.join(iterencode(obj, binary))
+
+
+def dump(obj, file, binary=None):
+    """Write the JSON text of obj to a text file as it is encoded."""
+    for text in iterencode(obj, binary):
+        file.write(text)
+
+
+def encode(obj):
+    """Return obj as lists, dictionaries, numbers and strings that
+    json.dumps can write, with arrays as lists.
+    """
+    if isinstance(obj, u.Quantity):
+        return {'magnitude': encode(obj.magnitude),
+                'units': _units_text(obj._units)}
+    if isinstance(obj, dict):
+        return {str(key): encode(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [encode(value) for value in obj]
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    if isinstance(obj, floc.Material):
+        return encode(dict({_KEY_MATERIAL: type(obj).__name__}, **vars(obj)))
+    return obj
+
+
+######################### Decoding #########################
+@functools.lru_cache(maxsize=None)
+def _unit(text):
+    """Return the Unit of a unit string."""
+    return u.Unit(text)
+
+
+def decode_object(obj):
+    """Return a decoded JSON object as a Quantity, array or Material, or
+    unchanged; the object_hook of loads.
+    """
+    if len(obj) == 2 and 'magnitude' in obj and 'units' in obj:
+        magnitude = obj['magnitude']
+        if isinstance(magnitude, list):
+            magnitude = np.array(magnitude)
+        return u.Quantity(magnitude, _unit(obj['units']))
+    if len(obj) == 3 and _FIELDS_BINARY.issubset(obj):
+        # The buffer is a bytearray so that the array can be changed, as
+        # arrays decoded from lists can.
+        array = np.frombuffer(bytearray(base64.b64decode(obj['base64'])),
+                              np.dtype(obj['dtype']))
+        return array.reshape(obj['shape'])
+    if obj.get(_KEY_MATERIAL) in _MATERIALS:
+        return _material(obj)
+    return obj
+
+
+def _material(obj):
+    """Return the floc_model Material described by obj, the one defined in
+    floc_model if its attributes are the same.
+    """
+    cls = _MATERIALS[obj[_KEY_MATERIAL]]
+    attributes = {key: value for key, value in obj.items()
+                  if key != _KEY_MATERIAL}
+    for value in vars(floc).values():
+        if type(value) is cls and vars(value) == attributes:
+            return value
+    material = cls.__new__(cls)
+    material.__dict__.update(attributes)
+    return material
+
+
+def loads(text):
+    """Return the result encoded in the JSON text."""
+    return json.loads(text, object_hook=decode_object)
+
+
+def load(file):
+    """Return the result encoded in a JSON text file."""
+    return json.load(file, object_hook=decode_object)
+
+
+def decode(obj):
+    """Return obj, as returned by json.loads, with its Quantities, arrays
+    and Materials decoded.
+    """
+    if isinstance(obj, dict):
+        return decode_object({key: decode(value)
+                              for key, value in obj.items()})
+    if isinstance(obj, list):
+        return [decode(value) for value in obj]
+    return obj
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Series of available sizes, such as drill bits and tubes.
+
+A design usually calculates the size it needs and then takes the next
+larger (or smaller) size that can be bought. A Series keeps the available
+sizes as a sorted array in base units and snaps whole arrays of sizes to
+it with one searchsorted call. Sizes beyond the ends of the series either
+raise a ValueError, are clipped to the end of the series or become NaN,
+depending on out_of_range.
+"""
+
+######################### Imports #########################
+import numpy as np
+
+from aide_design.units import unit_registry as u
+from aide_design import utility as ut
+from aide_design import materials_database as mat
+
+# The ways a Series can handle sizes beyond its ends.
+OUT_OF_RANGE = ('raise', 'clip', 'nan')
+
+
+class Series:
+    """A sorted series of available sizes.
+
+    values can be given in any units; they are stored in base units and
+    results are returned in units.
+    """
+    def __init__(self, name, values, units=u.mm):
+        self.name = name
+        self.units = units
+        if not isinstance(values, u.Quantity):
+            values = values * units
+        self.magnitudes = np.unique(np.asarray(ut.base_magnitude(values),
+                                               dtype=float))
+        self.magnitudes.flags.writeable = False
+
+    @property
+    def values(self):
+        return (self.magnitudes * u.m).to(self.units)
+
+    def __len__(self):
+        return len(self.magnitudes)
+
+    def _snap(self, x, side, out_of_range):
+        """Return the base unit sizes of the series picked by side."""
+        if out_of_range not in OUT_OF_RANGE:
+            raise ValueError("out_of_range is {0} but must be one of "
+                             "{1}.".format(out_of_range, OUT_OF_RANGE))
+        x = np.asarray(ut.base_magnitude(x), dtype=float)
+        if side == 'ceil':
+            i = np.searchsorted(self.magnitudes, x, side='left')
+        else:
+            i = np.searchsorted(self.magnitudes, x, side='right') - 1
+        outside = (i < 0) | (i >= len(self))
+        if out_of_range == 'raise' and np.any(outside):
+            raise ValueError("{0} is beyond the {1} series, which runs from "
+                             "{2} to {3}.".format(
+                                 (x[outside].flat[0] * u.m).to(self.units),
+                                 self.name, self.values[0], self.values[-1]))
+        snapped = self.magnitudes[np.clip(i, 0, len(self) - 1)]
+        if out_of_range == 'nan':
+            snapped = np.where(outside, np.nan, snapped)
+        return snapped
+
+    def ceil(self, x, out_of_range='raise'):
+        """Return the smallest size of the series at least as large as x."""
+        return (self._snap(x, 'ceil', out_of_range) * u.m).to(self.units)
+
+    def floor(self, x, out_of_range='raise'):
+        """Return the largest size of the series no larger than x."""
+        return (self._snap(x, 'floor', out_of_range) * u.m).to(self.units)
+
+    def nearest(self, x):
+        """Return the size of the series closest to x."""
+        x = np.asarray(ut.base_magnitude(x), dtype=float)
+        i = np.clip(np.searchsorted(self.magnitudes, x), 1, len(self) - 1)
+        lower = self.magnitudes[i - 1]
+        upper = self.magnitudes[i]
+        if len(self) == 1:
+            return (np.full(x.shape, lower) * u.m).to(self.units)
+        snapped = np.where(x - lower <= upper - x, lower, upper)
+        return (snapped * u.m).to(self.units)
+
+
+################### Series Definitions ###################
+DRILL_ENGLISH = Series('English drill', mat.DIAM_DRILL_ENG, u.inch)
+
+
+DRILL_METRIC = Series('metric drill', mat.DIAM_DRILL_MET, u.mm)
+
+
+TUBE_ENGLISH = Series('English tube', mat.DIAM_TUBE_ENGLISH, u.inch)
+
+
+TUBE_METRIC = Series('metric tube', mat.DIAM_TUBE_METRIC, u.mm)
+
+
+FLOAT_VALVE_ORIFICES = Series('float valve orifice',
+                              mat.DIAM_FLT_VLV_ORIFICES_AVAIL, u.inch)
+
+
+# The drills that the orifices of an LFOM are sized to.
+LFOM_DRILL_ENGLISH = Series('LFOM English drill', np.concatenate((
+    np.arange(1/32, 1/4, 1/32), np.arange(3/8, 1, 1/8),
+    np.arange(1.25, 3.25, 1/4))), u.inch)
+
+
+LFOM_DRILL_METRIC = Series('LFOM metric drill', np.concatenate((
+    np.arange(0.5, 4.9, 0.1), np.arange(5, 19, 1), np.arange(20, 50, 2))),
+    u.mm)
+
+
+def drill(EN_DRILL_SERIES):
+    """Return the drill series; 0 is English and 1 is metric."""
+    return DRILL_ENGLISH if EN_DRILL_SERIES == 0 else DRILL_METRIC
+
+
+def tube(EN_TUBE_SERIES):
+    """Return the tube series; 0 is English and 1 is metric."""
+    return TUBE_ENGLISH if EN_TUBE_SERIES == 0 else TUBE_METRIC
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Asyncio HTTP server for design requests.
+
+POST /design takes a JSON body in the form of design_request_example.json,
+{"request": {"unit_process": ..., "name": ..., <inputs>}}, where inputs
+with units are {"magnitude": ..., "units": ...}, and answers
+{"result": {"unit_process": ..., "name": ..., <outputs>}}. Inputs and
+outputs are converted with serialization. GET /metrics returns the
+request counts, queue depth and latencies as JSON.
+
+The designs run in a process pool, or with --threads in a thread pool,
+so the event loop is never blocked. Unit contexts are local to each thread
+(see units), so designs can share one process safely.
+Identical requests that arrive while one of them is being designed share
+that one computation. Requests wait for a worker in a bounded queue; when
+the queue is full the server answers 503 at once, rather than letting
+requests pile up, so callers can back off and retry.
+
+Run it locally with
+
+    python -m aide_design.server --port 8000 --workers 4 [--threads]
+"""
+
+######################### Imports #########################
+import argparse
+import asyncio
+import collections
+import hashlib
+import json
+import time
+from concurrent import futures
+
+import numpy as np
+
+from aide_design.units import unit_registry as u
+from aide_design import params
+from aide_design import serialization
+
+# Size of the queue of requests waiting for a worker.
+SIZE_QUEUE = 64
+
+# Number of recent requests whose latencies are summarized by /metrics.
+N_LATENCIES = 1000
+
+# Largest request body that is read, in bytes.
+SIZE_BODY_MAX = 2**20
+
+# Keys of a request that describe it rather than being inputs.
+REQUEST_FIELDS = ('unit_process', 'name', 'request_timestamp')
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 413: 'Payload Too Large',
+            422: 'Unprocessable Entity', 503: 'Service Unavailable'}
+
+
+####################### Designers ########################
+def design_pipe(flow_rate, length, max_hl, k_minor=0, sdr=26,
+                temperature=20 * u.degC):
+    """Return the smallest SDR pipe whose head loss is at most max_hl."""
+    from aide_design import physchem as pc
+    from aide_design import pipedatabase as pipe
+    from aide_design import materials_database as mat
+    nu = pc.viscosity_kinematic(temperature)
+    diam = pc.diam_pipe(flow_rate, max_hl, length, nu, mat.PIPE_ROUGH_PVC,
+                        k_minor)
+    nom_diam = pipe.ND_SDR_available(diam, sdr)
+    inner_diam = pipe.ID_SDR(nom_diam, sdr)
+    return {'length': length,
+            'nominal_diameter': nom_diam.to(u.inch).magnitude,
+            'inner_diameter': inner_diam.to(u.mm),
+            'resulting_headloss': pc.headloss(
+                flow_rate, inner_diam, length, nu, mat.PIPE_ROUGH_PVC,
+                k_minor).to(u.cm)}
+
+
+def design_lfom(flow_rate, max_hl):
+    """Return the orifices of an LFOM."""
+    from aide_design.unit_process_design.prefab import (
+        lfom_prefab_functional as lfom)
+    D, H_rows, N = lfom.lfom_layout(flow_rate, max_hl, lfom.uomeasure.metric,
+                                    lfom.SDR_LFOM)
+    return {'nominal_diameter': lfom.nom_diam_lfom_pipe(
+                flow_rate, max_hl, lfom.Pi_LFOM_safety,
+                lfom.SDR_LFOM).to(u.inch).magnitude,
+            'orifice_diameter': D.to(u.mm),
+            'row_heights': H_rows.to(u.cm),
+            'orifices_per_row': N}
+
+
+# The unit processes that can be requested and the functions that design
+# them. Each function takes the inputs of the request as keyword arguments.
+DESIGNERS = {'pipe_example': design_pipe, 'lfom': design_lfom}
+
+
+def run_design(unit_process, inputs):
+    """Return the JSON outputs of a design; runs in a worker process."""
+    designer = DESIGNERS[unit_process]
+    outputs = designer(**{name: serialization.decode(value)
+                          for name, value in inputs.items()})
+    return serialization.encode(outputs)
+
+
+######################### Server #########################
+class DesignError(Exception):
+    """A request that can't be designed, with its HTTP status."""
+    def __init__(self, status, message):
+        Exception.__init__(self, message)
+        self.status = status
+
+
+class DesignServer:
+    """Serve design requests from a pool of worker processes.
+
+    executor defaults to a ProcessPoolExecutor with n_workers processes.
+    """
+    def __init__(self, n_workers=1, size_queue=SIZE_QUEUE, executor=None):
+        self.n_workers = n_workers
+        self.executor = executor or futures.ProcessPoolExecutor(n_workers)
+        self.queue = asyncio.Queue(size_queue)
+        self._in_flight = {}
+        self._workers = []
+        self._latencies = collections.deque(maxlen=N_LATENCIES)
+        self.counts = collections.Counter()
+        self.depth_max = 0
+
+    async def start(self, host='127.0.0.1', port=8000):
+        """Start the workers and listen; returns the asyncio server."""
+        self._workers = [asyncio.ensure_future(self._work())
+                         for i in range(self.n_workers)]
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self.executor.shutdown(wait=False)
+
+    async def _work(self):
+        """Run queued designs in the executor one at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            future, unit_process, inputs = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(
+                    self.executor, run_design, unit_process, inputs)
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.queue.task_done()
+
+    async def design(self, request):
+        """Return the result for a decoded request."""
+        try:
+            unit_process = request['unit_process']
+        except (KeyError, TypeError):
+            raise DesignError(400, "The request has no unit_process.")
+        if unit_process not in DESIGNERS:
+            raise DesignError(400, "unit_process is {0} but must be one of "
+                              "{1}.".format(unit_process, sorted(DESIGNERS)))
+        inputs = {name: value for name, value in request.items()
+                  if name not in REQUEST_FIELDS}
+        try:
+            decoded = {name: serialization.decode(value)
+                       for name, value in inputs.items()}
+            text = params.canonical((unit_process, decoded))
+        except Exception as error:
+            raise DesignError(400, str(error))
+        key = hashlib.sha256(text.encode()).hexdigest()
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self.queue.put_nowait((future, unit_process, inputs))
+            except asyncio.QueueFull:
+                self.counts['rejected'] += 1
+                raise DesignError(503, "The design queue is full.")
+            self.depth_max = max(self.depth_max, self.queue.qsize())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._in_flight.pop(key, None))
+        else:
+            self.counts['coalesced'] += 1
+        try:
+            outputs = await asyncio.shield(future)
+        except (ValueError, TypeError) as error:
+            raise DesignError(422, str(error))
+        result = {field: request[field] for field in REQUEST_FIELDS[:2]
+                  if field in request}
+        result.update(outputs)
+        return {'result': result}
+
+    def metrics(self):
+        """Return the request counts, queue depth and latencies in ms."""
+        latencies = np.array(self._latencies) * 1000
+        summary = {'count': len(latencies)}
+        if len(latencies):
+            summary.update(zip(('p50', 'p95', 'p99'),
+                               np.percentile(latencies, [50, 95, 99])))
+            summary.update(mean=latencies.mean(), max=latencies.max())
+        return {'counts': dict(self.counts),
+                'queue': {'depth': self.queue.qsize(),
+                          'depth_max': self.depth_max,
+                          'size': self.queue.maxsize,
+                          'in_flight': len(self._in_flight)},
+                'latency_ms': summary}
+
+    async def _handle(self, reader, writer):
+        """Answer one HTTP request on a connection."""
+        start = time.perf_counter()
+        try:
+            method, path, body = await _read_request(reader)
+            if path == '/metrics' and method == 'GET':
+                status, reply = 200, self.metrics()
+            elif path == '/design' and method == 'POST':
+                self.counts['requests'] += 1
+                try:
+                    request = json.loads(body)['request']
+                except (ValueError, KeyError, TypeError):
+                    raise DesignError(400, "The body must be JSON with a "
+                                      "request object.")
+                status, reply = 200, await self.design(request)
+                self._latencies.append(time.perf_counter() - start)
+            elif path in ('/metrics', '/design'):
+                raise DesignError(405, "{0} is not allowed.".format(method))
+            else:
+                raise DesignError(404, "{0} was not found.".format(path))
+        except DesignError as error:
+            if error.status != 503:
+                self.counts['errors'] += 1
+            status, reply = error.status, {'error': str(error)}
+        except Exception as error:
+            self.counts['errors'] += 1
+            status, reply = 400, {'error': str(error)}
+        data = json.dumps(reply).encode()
+        writer.write('HTTP/1.1 {0} {1}\r\nContent-Type: application/json\r\n'
+                     'Content-Length: {2}\r\nConnection: close\r\n\r\n'.format(
+                         status, _REASONS[status], len(data)).encode() + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def _read_request(reader):
+    """Return the method, path and body of an HTTP request."""
+    line = (await reader.readline()).decode('latin-1').split()
+    if len(line) != 3:
+        raise DesignError(400, "Malformed request line.")
+    length = 0
+    while True:
+        header = (await reader.readline()).decode('latin-1').strip()
+        if not header:
+            break
+        name, _, value = header.partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    if length > SIZE_BODY_MAX:
+        raise DesignError(413, "The body is longer than {0} "
+                          "bytes.".format(SIZE_BODY_MAX))
+    body = await reader.readexactly(length) if length else b''
+    return line[0].upper(), line[1], body
+
+
+async def serve(host='127.0.0.1', port=8000, n_workers=1,
+                size_queue=SIZE_QUEUE, threads=False):
+    """Serve design requests until cancelled, in n_workers processes or,
+    if threads is True, threads.
+    """
+    executor = futures.ThreadPoolExecutor(n_workers) if threads else None
+    server = DesignServer(n_workers, size_queue, executor)
+    listener = await server.start(host, port)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve design requests.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--queue', type=int, default=SIZE_QUEUE)
+    parser.add_argument('--threads', action='store_true',
+                        help="run the designs in threads, not processes")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.host, args.port, args.workers, args.queue,
+                      args.threads))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Parallel parameter sweeps through shared memory.
+
+A Sweep runs a design function over a table of inputs, such as the
+cartesian product of plant flows, temperatures, turbidities and
+coagulants made by grid. The table is split into chunks of rows that the
+workers of a process pool design. Rather than pickling inputs and
+results, the input columns and the output columns live in shared memory
+NumPy buffers; a worker is only told which rows to design, reads them
+from the input buffers and writes its results straight into the output
+buffers.
+
+The design function takes the inputs as keyword arguments and returns a
+dictionary of outputs. Columns of numbers with units are passed as
+Quantity arrays. Columns of other objects, such as floc_model Chemicals,
+are passed one value at a time: the rows of a chunk are grouped by those
+values and the function is called once for each group. With
+elementwise=True the function is called once per row with scalars, for
+design functions that don't take arrays. Under the spawn start method the
+function must be importable, e.g. defined at the top of a module.
+
+If a checkpoint directory is given, the results of every finished chunk
+are saved there, and running the same sweep again after a crash only
+designs the chunks that are missing. Finished chunks can also be appended
+to a result_store.ResultStore; chunks that were saved in the checkpoint
+but never reached the store, because of a crash between the two, are
+appended when the sweep is resumed.
+
+    sweep = Sweep(design, grid(FlowPlant=flows, Temp=temps,
+                               coag=[floc.PACl, floc.Alum]))
+    outputs = sweep.run(n_workers=64, checkpoint='sweep_checkpoint')
+"""
+
+######################### Imports #########################
+import hashlib
+import json
+import os
+from concurrent import futures
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from aide_design.units import unit_registry as u
+from aide_design import params
+
+# Number of rows designed by a worker at a time.
+CHUNK_SIZE = 4096
+
+_MANIFEST = 'sweep.json'
+
+
+def grid(**axes):
+    """Return the cartesian product of axes as a table of columns.
+
+    Each axis is a sequence of values, such as a Quantity array or a list
+    of Chemicals. The first axis varies slowest.
+    """
+    lengths = [len(values) for values in axes.values()]
+    index = np.indices(lengths).reshape(len(lengths), -1)
+    columns = {}
+    for i, (name, values) in enumerate(axes.items()):
+        if isinstance(values, u.Quantity) or _numeric(values):
+            columns[name] = values[index[i]]
+        else:
+            columns[name] = [values[j] for j in index[i]]
+    return columns
+
+
+def _numeric(values):
+    """Return whether values is an array of numbers."""
+    return (isinstance(values, np.ndarray)
+            and np.issubdtype(values.dtype, np.number))
+
+
+class _Column:
+    """Where a column of the sweep lives in shared memory.
+
+    Numbers are stored as float64, in units if the column has units.
+    Columns of other objects are stored as int64 codes into categories.
+    """
+    def __init__(self, name, units=None, categories=None):
+        self.name = name
+        self.units = units
+        self.categories = categories
+        self.shm_name = None
+
+    def array(self, buffer, n_rows):
+        dtype = np.float64 if self.categories is None else np.int64
+        return np.ndarray((n_rows,), dtype, buffer=buffer)
+
+    def values(self, data):
+        """Return values stored in data as passed to the design function."""
+        if self.categories is not None:
+            return data
+        if self.units is None:
+            return data
+        return u.Quantity(data, self.units)
+
+
+class Sweep:
+    """Run func over every row of a table of inputs.
+
+    inputs is a dictionary of columns of equal length, as returned by grid.
+    """
+    def __init__(self, func, inputs, chunk_size=CHUNK_SIZE,
+                 elementwise=False):
+        lengths = {len(column) for column in inputs.values()}
+        if len(lengths) != 1:
+            raise ValueError("The input columns have lengths {0} but must "
+                             "all be the same length.".format(sorted(lengths)))
+        if chunk_size < 1:
+            raise ValueError("chunk_size is {0} but must be at least "
+                             "1.".format(chunk_size))
+        self.func = func
+        self.n_rows = lengths.pop()
+        self.chunk_size = chunk_size
+        self.elementwise = elementwise
+        self.columns = []
+        self._data = {}
+        for name, values in inputs.items():
+            if isinstance(values, u.Quantity):
+                column = _Column(name, units='{:~}'.format(values.units))
+                data = np.asarray(values.magnitude, dtype=float)
+            elif _numeric(np.asarray(values)):
+                column = _Column(name)
+                data = np.asarray(values, dtype=float)
+            else:
+                categories = []
+                data = np.empty(self.n_rows, dtype=np.int64)
+                for i, value in enumerate(values):
+                    for code, category in enumerate(categories):
+                        if category is value:
+                            break
+                    else:
+                        code = len(categories)
+                        categories.append(value)
+                    data[i] = code
+                column = _Column(name, categories=categories)
+            self.columns.append(column)
+            self._data[name] = data
+
+    def chunks(self):
+        """Return the (start, stop) rows of each chunk."""
+        return [(start, min(start + self.chunk_size, self.n_rows))
+                for start in range(0, self.n_rows, self.chunk_size)]
+
+    def key(self):
+        """Return a hash of the function, inputs and chunks of the sweep."""
+        digest = hashlib.sha256()
+        digest.update(params.canonical((self.func.__module__,
+                                        self.func.__qualname__,
+                                        self.chunk_size,
+                                        self.elementwise)).encode())
+        for column in self.columns:
+            digest.update(params.canonical((column.name, column.units,
+                                            column.categories)).encode())
+            digest.update(self._data[column.name].tobytes())
+        return digest.hexdigest()
+
+    def _probe(self):
+        """Return the output columns, found by designing the first row."""
+        outputs = _design(self.func, self.columns,
+                          {name: data[:1] for name, data in self._data.items()},
+                          self.elementwise)
+        columns = []
+        for name, value in outputs.items():
+            units = (None if not isinstance(value, u.Quantity)
+                     else '{:~}'.format(value.units))
+            columns.append(_Column(name, units=units))
+        return columns
+
+    def run(self, n_workers=None, checkpoint=None, store=None):
+        """Design every row and return a dictionary of output columns.
+
+        The rows are designed by n_workers processes, by default one per
+        CPU, or in this process if n_workers is 1. checkpoint is a
+        directory that finished chunks are saved in and resumed from.
+        store is a result_store.ResultStore that the inputs and outputs of
+        each chunk designed by this run are appended to as it finishes,
+        with a row column holding the index of each row in the sweep.
+        """
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        outputs = self._probe()
+        blocks = []
+        arrays = {}
+        try:
+            for column in self.columns + outputs:
+                data = self._data.get(column.name)
+                block = shared_memory.SharedMemory(
+                    create=True, size=max(8 * self.n_rows, 1))
+                blocks.append(block)
+                column.shm_name = block.name
+                arrays[column.name] = column.array(block.buf, self.n_rows)
+                if data is not None:
+                    arrays[column.name][:] = data
+            spec = (self.func, self.columns, outputs, self.n_rows,
+                    self.elementwise)
+            todo = self._resume(checkpoint, outputs, arrays)
+            if store is not None and checkpoint is not None:
+                self._append_missing(store, outputs, arrays, todo)
+            if n_workers == 1:
+                _init_worker(spec)
+                for start, stop in todo:
+                    _run_chunk(start, stop)
+                    self._finish(checkpoint, store, outputs, arrays, start,
+                                 stop)
+            elif todo:
+                with futures.ProcessPoolExecutor(
+                        n_workers, initializer=_init_worker,
+                        initargs=(spec,)) as pool:
+                    jobs = [pool.submit(_run_chunk, start, stop)
+                            for start, stop in todo]
+                    for job in futures.as_completed(jobs):
+                        start, stop = job.result()
+                        self._finish(checkpoint, store, outputs, arrays,
+                                     start, stop)
+            return {column.name: column.values(arrays[column.name].copy())
+                    for column in outputs}
+        finally:
+            _release()
+            # The buffers can only be closed once no array uses them.
+            arrays.clear()
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def _resume(self, checkpoint, outputs, arrays):
+        """Load the chunks saved in checkpoint and return the chunks that
+        still have to be designed.
+        """
+        if checkpoint is None:
+            return self.chunks()
+        manifest = {'key': self.key(), 'n_rows': self.n_rows,
+                    'chunk_size': self.chunk_size,
+                    'outputs': {column.name: column.units
+                                for column in outputs}}
+        path = os.path.join(checkpoint, _MANIFEST)
+        if os.path.exists(path):
+            with open(path) as file:
+                saved = json.load(file)
+            if saved != manifest:
+                raise ValueError("The checkpoint in {0} belongs to another "
+                                 "sweep.".format(checkpoint))
+        else:
+            os.makedirs(checkpoint, exist_ok=True)
+            _replace(path, lambda file: file.write(
+                json.dumps(manifest).encode()))
+        todo = []
+        for start, stop in self.chunks():
+            path = _chunk_path(checkpoint, start)
+            if not os.path.exists(path):
+                todo.append((start, stop))
+                continue
+            with np.load(path) as saved:
+                for column in outputs:
+                    arrays[column.name][start:stop] = saved[column.name]
+        return todo
+
+    def _finish(self, checkpoint, store, outputs, arrays, start, stop):
+        """Save the outputs of a finished chunk in checkpoint and append
+        its rows to store.
+        """
+        if checkpoint is not None:
+            _replace(_chunk_path(checkpoint, start), lambda file: np.savez(
+                file, **{column.name: arrays[column.name][start:stop]
+                         for column in outputs}))
+        if store is not None:
+            self._append(store, outputs, arrays, start, stop)
+
+    def _append(self, store, outputs, arrays, start, stop):
+        """Append the inputs and outputs of rows start to stop to store."""
+        rows = {'row': np.arange(start, stop)}
+        for column in self.columns + outputs:
+            data = arrays[column.name][start:stop]
+            if column.categories is not None:
+                rows[column.name] = [column.categories[i] for i in data]
+            else:
+                rows[column.name] = column.values(data.copy())
+        store.append(rows)
+
+    def _append_missing(self, store, outputs, arrays, todo):
+        """Append the chunks loaded from the checkpoint whose rows aren't
+        in store.
+        """
+        if 'row' in store.schema:
+            stored = set(np.unique(store.raw('row') // self.chunk_size))
+        else:
+            stored = set()
+        todo = set(todo)
+        for start, stop in self.chunks():
+            if ((start, stop) not in todo
+                    and start // self.chunk_size not in stored):
+                self._append(store, outputs, arrays, start, stop)
+
+
+def _chunk_path(checkpoint, start):
+    return os.path.join(checkpoint, 'chunk_{0:012d}.npz'.format(start))
+
+
+def _replace(path, write):
+    """Write a file through a temporary file so that it is never partial."""
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as file:
+        write(file)
+    os.replace(temporary, path)
+
+
+def _design(func, columns, data, elementwise):
+    """Return the outputs of func for rows of input data, as a dictionary
+    of arrays.
+    """
+    n_rows = len(next(iter(data.values())))
+    categorical = [c for c in columns if c.categories is not None]
+    if elementwise:
+        groups = [np.array([i]) for i in range(n_rows)]
+    elif categorical:
+        codes = np.stack([data[c.name] for c in categorical], axis=1)
+        keys, inverse = np.unique(codes, axis=0, return_inverse=True)
+        groups = [np.flatnonzero(inverse.ravel() == i)
+                  for i in range(len(keys))]
+    else:
+        groups = [np.arange(n_rows)]
+    outputs = {}
+    for rows in groups:
+        kwargs = {}
+        for column in columns:
+            values = data[column.name][rows]
+            if column.categories is not None:
+                kwargs[column.name] = column.categories[values[0]]
+            elif elementwise:
+                kwargs[column.name] = column.values(values[0])
+            else:
+                kwargs[column.name] = column.values(values)
+        result = func(**kwargs)
+        if not isinstance(result, dict):
+            result = {'result': result}
+        for name, value in result.items():
+            if name not in outputs:
+                outputs[name] = ([] if len(groups) > 1 else None, value)
+            if len(groups) > 1:
+                outputs[name][0].append((rows, value))
+    if len(groups) == 1:
+        return {name: value for name, (parts, value) in outputs.items()}
+    combined = {}
+    for name, (parts, first) in outputs.items():
+        units = first.units if isinstance(first, u.Quantity) else None
+        array = np.empty(n_rows)
+        for rows, value in parts:
+            if units is not None:
+                value = value.to(units).magnitude
+            array[rows] = value
+        combined[name] = array if units is None else u.Quantity(array, units)
+    return combined
+
+
+######################### Workers #########################
+_worker = {}
+
+
+def _init_worker(spec):
+    """Attach this process to the shared memory of a sweep."""
+    _release()
+    func, inputs, outputs, n_rows, elementwise = spec
+    blocks = [shared_memory.SharedMemory(column.shm_name)
+              for column in inputs + outputs]
+    arrays = [column.array(block.buf, n_rows)
+              for column, block in zip(inputs + outputs, blocks)]
+    _worker.update(func=func, inputs=inputs, outputs=outputs,
+                   elementwise=elementwise, blocks=blocks,
+                   arrays=dict(zip([c.name for c in inputs + outputs],
+                                   arrays)))
+
+
+def _run_chunk(start, stop):
+    """Design rows start to stop and write them to the output buffers."""
+    arrays = _worker['arrays']
+    results = _design(_worker['func'], _worker['inputs'],
+                      {c.name: arrays[c.name][start:stop]
+                       for c in _worker['inputs']},
+                      _worker['elementwise'])
+    for column in _worker['outputs']:
+        value = results[column.name]
+        if column.units is not None:
+            value = u.Quantity(value).to(column.units).magnitude
+        arrays[column.name][start:stop] = value
+    return start, stop
+
+
+def _release():
+    """Detach this process from the shared memory of the last sweep."""
+    arrays = _worker.pop('arrays', None)
+    del arrays
+    for block in _worker.pop('blocks', ()):
+        block.close()
+    _worker.clear()
@@ -10,9 +10,11 @@ Created on Mon Jun 26 11:55:37 2017
 try:
     from aide_design.units import unit_registry as u
     from aide_design import utility as ut
+    from aide_design import fluids
 except ModuleNotFoundError:
     from aide_design.units import unit_registry as u
     from aide_design import utility as ut
+    from aide_design import fluids
 
 g=9.80665*(u.m/(u.s**2))
 #==============================================================================
@@ -25,20 +27,20 @@ NU_WATER = 1* u.mm**2/u.s
 #==============================================================================
 # #coagulant viscosity
 #==============================================================================
+# The viscosity models are shared with cdc_functions through
+# aide_design.fluids.
 class nu:
       def nu_alum(ConcAlum):
-          ConcAlum = ConcAlum.to(1/u.kg/(u.m**3))
-          return (1 + (4.255 * 10**(-6) * (ConcAlum)**2.289))*NU_WATER
+          return fluids.ALUM.ratio_nu(ConcAlum) * NU_WATER
 
       def nu_pacl(ConcPacl):
-          ConcPacl = ConcPacl.to(1/u.kg/(u.m**3))
-          return (1 + (2.383 * 10**(-5) * (ConcPacl)**1.893))*NU_WATER
+          return fluids.PACL.ratio_nu(ConcPacl) * NU_WATER
 
       def nu_coag(ConcCoag, ENCoag):
           if ENCoag == 0:
-          return nu_alum(ConcCoag)mn
+              return nu.nu_alum(ConcCoag)
           elif ENCoag == 1:
-          return nu_pacl(ConcCoag)
+              return nu.nu_pacl(ConcCoag)
 
 #==============================================================================
 # stock volume and concentration
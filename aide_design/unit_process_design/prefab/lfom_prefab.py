@@ -3,6 +3,8 @@
 # although math is "built in" it needs to be imported so it's functions can be used.
 import math
 
+import functools
+
 from scipy import constants, interpolate
 
 #see numpy cheat sheet https://www.dataquest.io/blog/images/cheat-sheets/numpy-cheat-sheet.pdf
@@ -26,6 +28,12 @@ from aide_design.units import unit_registry as u
 # utility has the significant digit display function
 from aide_design import utility as ut
 
+# series snaps sizes to the available drill bits
+from aide_design import series
+
+# lfom_prefab_functional places the orifices of an LFOM
+from aide_design.unit_process_design.prefab import lfom_prefab_functional as lf
+
 ##---##
 
 # The following constants need to go into the constants file
@@ -44,18 +52,15 @@ class uomeasure(Enum):
     english = 0
     metric = 1
 
-def drill_series(uomeasure):
+# drill_series returns the sizes of the LFOM drills and lfom_drill_series
+# the series.Series that snaps sizes to them.
+def lfom_drill_series(uomeasure):
     if uomeasure is uomeasure.english:
-        ds=np.arange(1/32, 1/4, 1/32)
-        ds=np.append(ds,np.arange(3/8, 1, 1/8))
-        ds=np.append(ds,np.arange(1.25, 3.25, 1/4))
-        ds=ds*u.inch
-    else:
-        ds=np.arange(0.5, 4.9, 0.1)
-        ds=np.append(ds,np.arange(5, 19, 1))
-        ds=np.append(ds,np.arange(20, 50, 2))
-        ds=ds*u.mm
-    return ds
+        return series.LFOM_DRILL_ENGLISH
+    return series.LFOM_DRILL_METRIC
+
+def drill_series(uomeasure):
+    return lfom_drill_series(uomeasure).values
 
 # Take the values of the array, compare to x, find the index of the first value less than or equal to x
 def floor_nearest(x,array):
@@ -67,15 +72,60 @@ def ceil_nearest(x,array):
     myindex = np.argmax(array >= x)
     return array[myindex]
 
+# Number of water levels in the rating curve of an LFOM.
+N_LEVELS_RATING = 1000
+
+# The inputs of an LFOM design. Changing one of them clears the cached
+# values that depend on it.
+LFOM_INPUTS = ('flow', 'hl', 'ratio_safety', 'sdr', 'drill_series_uom')
+
+def cached(*inputs):
+    """Cache the value of an LFOM method until one of its inputs changes.
+
+    inputs are the names of the LFOM inputs that the value depends on,
+    directly or through other methods.
+    """
+    def decorator(method):
+        name = method.__name__
+        @functools.wraps(method)
+        def wrapper(self):
+            if name not in self._cache:
+                self._cache[name] = method(self)
+            return self._cache[name]
+        wrapper.inputs = inputs
+        return wrapper
+    return decorator
+
+
 class LFOM: 
+    """A linear flow orifice meter design.
 
+    The derived values of the design are calculated when they are first
+    needed and cached. Changing an input, either directly or through one
+    of the setters, only clears the cached values that depend on it, so
+    what-if edits of one parameter don't redo the whole design.
+    """
     def __init__(self, flow, hl, ratio_safety, sdr, drill_series_uom):
+        self._cache = {}
         self.flow = flow
         self.hl = hl 
         self.ratio_safety = ratio_safety
         self.sdr = sdr
         self.drill_series_uom = drill_series_uom
 
+    def __setattr__(self, name, value):
+        if name in LFOM_INPUTS and name in self.__dict__:
+            try:
+                unchanged = bool(np.all(self.__dict__[name] == value))
+            except Exception:
+                unchanged = False
+            if unchanged:
+                return
+            for key in [key for key in self._cache 
+                        if name in getattr(type(self), key).inputs]:
+                del self._cache[key]
+        object.__setattr__(self, name, value)
+
     def set_flow(self, flow):
         self.flow = flow
 
@@ -92,124 +142,115 @@ class LFOM:
         self.drill_series_uom = drill_series_uom
 
 
-    def __width_stout(self, z):
+    def _width_stout(self, z):
         return 2 / ((2 * u.g_0 * z)**(1/2) * math.pi * self.hl)
 
-    def __n_rows(self):
-        n_est = (self.hl * math.pi / (2 * self.__width_stout(self.hl) * self.flow)).to(u.dimensionless)
+    @cached('flow', 'hl')
+    def n_rows(self):
+        n_est = (self.hl * math.pi / (2 * self._width_stout(self.hl) * self.flow)).to(u.dimensionless)
         return min(10, max(4, math.trunc(n_est.magnitude)))
 
-    def __dist_center_rows(self):
-        return self.hl / self.__n_rows()
+    @cached('flow', 'hl')
+    def dist_center_rows(self):
+        return self.hl / self.n_rows()
 
     # average vertical velocity of the water inside the LFOM pipe 
     # at the very bottom of the bottom row of orifices
     # The speed of falling water is 0.841 m/s for all linear flow orifice meters of height 20cm,
     # independent of total plant flow rate.
-    def __vol_pipe_critical(self):
+    def _vol_pipe_critical(self):
         return (4 / (3 * math.pi) * (2 * u.g_0 * self.hl)**(1/2)).to(u.m/u.s)
 
-    def __area_pipe_min(self):
-        return (self.ratio_safety * self.flow / self.__vol_pipe_critical()).to(u.m**2)
+    def _area_pipe_min(self):
+        return (self.ratio_safety * self.flow / self._vol_pipe_critical()).to(u.m**2)
 
+    @cached('flow', 'hl', 'ratio_safety', 'sdr')
     def nom_diam_pipe(self):
-        id = pc.diam_circle(self.__area_pipe_min())
+        id = pc.diam_circle(self._area_pipe_min())
         return pipe.ND_SDR_available(id, self.sdr)
 
     # another possibility is to use integration to solve this problem.
     # Here we use the width of the stout weir in the center of the top row
     # to estimate the area of the top orifice
-    def __area_orifices_max(self):
-        z = self.hl - 0.5 * self.__dist_center_rows()
-        return self.flow * self.__width_stout(z) * self.__dist_center_rows()
+    def _area_orifices_max(self):
+        z = self.hl - 0.5 * self.dist_center_rows()
+        return self.flow * self._width_stout(z) * self.dist_center_rows()
 
-    def __d_orifices_max(self):
-        return pc.diam_circle(self.__area_orifices_max())
+    def _d_orifices_max(self):
+        return pc.diam_circle(self._area_orifices_max())
 
+    @cached('flow', 'hl', 'drill_series_uom')
     def drillbit_diameter(self):
-        return ceil_nearest(self.__d_orifices_max(), drill_series(self.drill_series_uom))
+        return lfom_drill_series(self.drill_series_uom).ceil(self._d_orifices_max())
 
-    def __drillbit_area(self):
+    def _drillbit_area(self):
         return pc.area_circle(self.drillbit_diameter())
 
     ##A bound on the number of orifices allowed in each row.  
     ##The distance between consecutive orifices must be enough to retain structural integrity of the pipe
-    def __n_orifices_per_row_max(self):
+    @cached(*LFOM_INPUTS)
+    def n_orifices_per_row_max(self):
         S_lfom_orifices_Min= 3 * u.mm
         nom_diam = self.nom_diam_pipe()
         drillbit_diam = self.drillbit_diameter() + S_lfom_orifices_Min
         return math.floor(math.pi * (pipe.ID_SDR(nom_diam, self.sdr)) / (drillbit_diam))
 
     #locations where we will try to get the target flows is in between orifices at elevation Pi.H
-    def __flow_ramp(self):
-        dist_center = self.__dist_center_rows() / u.cm
-        return np.arange(dist_center, self.hl / u.cm, dist_center) * self.flow * u.cm / self.hl
+    def _flow_ramp(self):
+        dist_center = self.dist_center_rows()
+        return (ut.arange_with_units(dist_center, self.hl, dist_center) * self.flow / self.hl).to(self.flow.units)
 
+    @cached('flow', 'hl', 'drill_series_uom')
     def height_orifices(self):
         drillbit_diam = self.drillbit_diameter() * 0.5
-        return np.arange(drillbit_diam, self.hl, self.__dist_center_rows(), dtype= object)
-
-    #Calculate the flow for a given number of submerged rows of orifices
-    def __flow_actual(self, Row_Index_Submerged, N_LFOM_Orifices):
-        D_LFOM_Orifices = self.drillbit_diameter().to(u.m)
-        FLOW_new=[]
-        dist_center = self.__dist_center_rows()
-        for i in range(Row_Index_Submerged):
-            h = np.arange(dist_center, self.hl, dist_center, dtype=object)
-            h = h[Row_Index_Submerged].to(u.m)
-            d = np.arange(0.5* D_LFOM_Orifices, self.hl, dist_center, dtype=object)
-            FLOW_new.append(N_LFOM_Orifices[i]*(pc.flow_orifice_vert(D_LFOM_Orifices, h - d[i], ratio_VC_orifice)))
-        return sum(FLOW_new)
-
-    #Calculate number of orifices at each level given a diameter
+        return ut.arange_with_units(drillbit_diam, self.hl, self.dist_center_rows())
+
+    #Calculate number of orifices at each level given a diameter, placed by
+    #lfom_prefab_functional.place_lfom_orifices
+    @cached(*LFOM_INPUTS)
     def fric_n_orifices(self):
-        FLOW_ramp_local = self.__flow_ramp()
-        D_LFOM_Orifices = self.drillbit_diameter()
-        h = np.arange(self.__dist_center_rows(), self.hl, self.__dist_center_rows(), dtype=object)
-        d = np.arange(D_LFOM_Orifices * 0.5, self.hl, self.__dist_center_rows(), dtype=object)
-        n = []
-        for i in range (len(d) - 1):
-            flow_actual = self.__flow_actual(i, n)
-            Height = h[i] - d[i]
-            rounded = np.round((FLOW_ramp_local[i] - flow_actual).to(u.m**3 / u.seconds) / pc.flow_orifice_vert(D_LFOM_Orifices, Height, ratio_VC_orifice))
-            if self.nom_diam_pipe() <= 12 * u.inch:
-                n.append(min(max(0, rounded), self.__n_orifices_per_row_max()))
-            else:
-                n.append(max(0,rounded))
-        return n
+        D_LFOM_Orifices = self.drillbit_diameter().to(u.m).magnitude
+        hl = self.hl.to(u.m).magnitude
+        n_placed = len(np.arange(D_LFOM_Orifices * 0.5, hl, self.dist_center_rows().to(u.m).magnitude)) - 1
+        if self.nom_diam_pipe() <= 12 * u.inch:
+            n_max = self.n_orifices_per_row_max()
+        else:
+            n_max = np.inf
+        return lf.place_lfom_orifices(self.flow.to(u.m**3/u.s).magnitude, hl, D_LFOM_Orifices, self.n_rows(), n_max)[0, :n_placed]
 
     #This function calculates the error of the design based on the differences between the predicted flow rate
-    #and the actual flow rate through the LFOM.
-    def __flow_error(self):
-        N_lfom_orifices = self.fric_n_orifices()
-        FLOW_lfom_error = []
-        for j in range (len(N_lfom_orifices) - 1):
-            flow_actual = self.__flow_actual(j, N_lfom_orifices)
-            FLOW_lfom_error.append((flow_actual - self.__flow_ramp()[j]) / self.flow)
-        return FLOW_lfom_error
-
-    def __flow_error_max(self):
-        x = max(self.__flow_error())
-        y = x**2
-        return y**1/2
-
-    def __flow_ideal(self, height):
-        __flow_ideal=(self.flow * height) / self.hl
-        return __flow_ideal
+    #and the actual flow rate through the LFOM at the target levels.
+    def _flow_error(self):
+        rows = len(self.fric_n_orifices())
+        heights = np.arange(1, rows) * self.dist_center_rows()
+        return ((self.flow_lfom(heights) - self._flow_ramp()[:rows - 1]) / self.flow).to(u.dimensionless)
+
+    def _flow_error_max(self):
+        return np.abs(self._flow_error()).max()
+
+    def _flow_ideal(self, height):
+        _flow_ideal=(self.flow * height) / self.hl
+        return _flow_ideal
     
+    #The flow through the LFOM when the water is at height, which can be an
+    #array of heights, from lfom_prefab_functional.flow_lfom_rating
     def flow_lfom(self, height):
-        D_lfom_orifices = self.drillbit_diameter()
-        H_submerged = np.arange(height - 0.5 * D_lfom_orifices, self.hl, height - self.__dist_center_rows(), dtype=object)
         N_lfom_orifices = self.fric_n_orifices()
-        flow = []
-        for i in range (len(H_submerged)):
-            flow.append(pc.flow_orifice_vert(D_lfom_orifices, H_submerged[i], ratio_VC_orifice) * N_lfom_orifices[i])
-        return sum(flow)
+        H_rows = 0.5 * self.drillbit_diameter() + np.arange(len(N_lfom_orifices)) * self.dist_center_rows()
+        heights = np.asarray(height.to(u.m).magnitude)
+        flow = lf.flow_lfom_rating(self.drillbit_diameter(), H_rows, N_lfom_orifices, heights.reshape(1, -1))
+        return flow[0].reshape(heights.shape)
+
+    #The flow at N_LEVELS_RATING evenly spaced water levels up to hl, the
+    #ideal flow and the largest deviation from it relative to the design flow
+    @cached(*LFOM_INPUTS)
+    def rating_curve(self):
+        heights = np.linspace(0, 1, N_LEVELS_RATING + 1)[1:] * self.hl.to(u.m)
+        flow = self.flow_lfom(heights)
+        flow_ideal = self._flow_ideal(heights).to(u.m**3/u.s)
+        error = ((flow - flow_ideal) / self.flow).to(u.dimensionless)
+        return {'height': heights, 'flow': flow, 'flow_ideal': flow_ideal,
+                'error_max': np.max(np.abs(error))}
 
 
 lfom = LFOM(FLOW, HL_LFOM, Pi_LFOM_safety, SDR_LFOM, uomeasure.english)
-
-print(lfom.nom_diam_pipe())
-print(lfom.drillbit_diameter())
-print(lfom.height_orifices())
-print(lfom.fric_n_orifices())
\ No newline at end of file
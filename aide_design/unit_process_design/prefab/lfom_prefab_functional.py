@@ -10,6 +10,8 @@ Created on Wed Jun 21 17:16:46 2017
 # although math is "built in" it needs to be imported so it's functions can be used.
 import math
 
+from concurrent import futures
+
 from scipy import constants, interpolate
 
 #see numpy cheat sheet https://www.dataquest.io/blog/images/cheat-sheets/numpy-cheat-sheet.pdf
@@ -32,6 +34,12 @@ from aide_design.units import unit_registry as u
 
 # utility has the significant digit display function
 from aide_design import utility as ut
+
+# series snaps sizes to the available drill bits
+from aide_design import series
+
+# params lets the design functions take one hashable set of inputs
+from aide_design import params
 ratio_VC_orifice= 0.62
 
 # The following constants need to go into the constants file
@@ -49,6 +57,10 @@ def n_lfom_rows(Q,HL_LFOM):
 FLOW = 5*u.L/u.s
 HL_LFOM = 20*u.cm
 
+#The inputs of an LFOM design; the design functions accept an LFOMParams in
+#place of FLOW,HL_LFOM,drill_series_uom,SDR_LFOM.
+LFOMParams=params.param_set('LFOMParams',(('FLOW',u.m**3/u.s),('HL_LFOM',u.m),('drill_series_uom',None),('SDR_LFOM',None)))
+
 
 def dist_center_lfom_rows(FLOW,HL_LFOM):
     return HL_LFOM/n_lfom_rows(FLOW,HL_LFOM)
@@ -85,23 +97,20 @@ class uomeasure(Enum):
 # define the constant. How do we make all of the constants available to designers?   
 drill_series_uom=uomeasure
 
-def drill_series(uomeasure):
+# drill_series returns the sizes of the LFOM drills and lfom_drill_series
+# the series.Series that snaps sizes to them.
+def lfom_drill_series(uomeasure):
     if uomeasure is uomeasure.english:
-        ds=np.arange(1/32, 1/4, 1/32)
-        ds=np.append(ds,np.arange(3/8, 1, 1/8))
-        ds=np.append(ds,np.arange(1.25, 3.25, 1/4))
-        ds=ds*u.inch
-    else:
-        ds=np.arange(0.5, 4.9, 0.1)
-        ds=np.append(ds,np.arange(5, 19, 1))
-        ds=np.append(ds,np.arange(20, 50, 2))
-        ds=ds*u.mm
-    return ds
+        return series.LFOM_DRILL_ENGLISH
+    return series.LFOM_DRILL_METRIC
+
+def drill_series(uomeasure):
+    return lfom_drill_series(uomeasure).values
 
 
 
 def lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom):
-    return ut.ceil_nearest(d_lfom_orifices_max(FLOW,HL_LFOM),drill_series(drill_series_uom))
+    return lfom_drill_series(drill_series_uom).ceil(d_lfom_orifices_max(FLOW,HL_LFOM))
 
 def lfom_drillbit_area(FLOW,HL_LFOM,drill_series_uom):
     return pc.area_circle(lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom))
@@ -109,58 +118,223 @@ def lfom_drillbit_area(FLOW,HL_LFOM,drill_series_uom):
 ##A bound on the number of orifices allowed in each row.  
 ##The distance between consecutive orifices must be enough to retain structural integrity of the pipe
 
+@params.accepts(LFOMParams)
 def n_lfom_orifices_per_row_max(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM):
     S_lfom_orifices_Min= 3*u.mm
     return math.floor(math.pi*(pipe.ID_SDR(nom_diam_lfom_pipe(FLOW,HL_LFOM,Pi_LFOM_safety,SDR_LFOM),SDR_LFOM))/(lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom)+S_lfom_orifices_Min))
 
 #locations where we will try to get the target flows is in between orifices at elevation Pi.H
 def flow_ramp(FLOW,HL_LFOM):
-    return((np.arange((dist_center_lfom_rows(FLOW,HL_LFOM)/u.cm),(HL_LFOM/u.cm),(dist_center_lfom_rows(FLOW,HL_LFOM)/u.cm))*FLOW)*u.cm)/HL_LFOM
+    dist=dist_center_lfom_rows(FLOW,HL_LFOM)
+    return (ut.arange_with_units(dist,HL_LFOM,dist)*FLOW/HL_LFOM).to(FLOW.units)
 
+#The heights of the centers of the rows of orifices, as one Quantity array
 def height_lfom_orifices(FLOW,HL_LFOM,drill_series_uom):
-    return np.arange(lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom.metric)*0.5,HL_LFOM,dist_center_lfom_rows(FLOW,HL_LFOM),dtype= object)
+    return ut.arange_with_units(lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom.metric)*0.5,HL_LFOM,dist_center_lfom_rows(FLOW,HL_LFOM))
 
 
 #Calculate the flow for a given number of submerged rows of orifices
 def flow_lfom_actual(FLOW,HL_LFOM,drill_series_uom,Row_Index_Submerged,N_LFOM_Orifices):
-    D_LFOM_Orifices=lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom).to(u.m)
-    FLOW_new=[]
-    for i in range(Row_Index_Submerged):
-        h = np.arange(dist_center_lfom_rows(FLOW,HL_LFOM),HL_LFOM,dist_center_lfom_rows(FLOW,HL_LFOM),dtype=object)
-        h = h[Row_Index_Submerged].to(u.m)
-        d = np.arange(0.5* D_LFOM_Orifices,HL_LFOM,dist_center_lfom_rows(FLOW,HL_LFOM),dtype=object)
-        FLOW_new.append(N_LFOM_Orifices[i]*(pc.flow_orifice_vert(D_LFOM_Orifices,h-d[i],ratio_VC_orifice)))
-    return sum(FLOW_new)
+    D_LFOM_Orifices=lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom)
+    dist=dist_center_lfom_rows(FLOW,HL_LFOM)
+    h=ut.arange_with_units(dist,HL_LFOM,dist,u.m)[Row_Index_Submerged]
+    d=ut.arange_with_units(0.5*D_LFOM_Orifices,HL_LFOM,dist,u.m)[:Row_Index_Submerged]
+    n=np.asarray(N_LFOM_Orifices[:Row_Index_Submerged],dtype=float)
+    return np.sum(n*pc.flow_orifice_vert_array(D_LFOM_Orifices,h-d,ratio_VC_orifice).magnitude)*u.m**3/u.s
+
+#Place the orifices of arrays of candidate designs, in base units. Each
+#candidate has an orifice diameter D, a number of rows N_rows that sets the
+#row spacing HL/N_rows, and a limit N_max on the orifices in one row.
+#The rows are filled from the bottom up and each row gets the number of
+#orifices that brings the flow at the water level one row spacing above it
+#closest to the ideal flow. The flow through one orifice of every row at
+#every target level comes from a single call to flow_orifice_vert_array,
+#and the flow through the rows that are already placed is kept as a
+#running total at every target level, so the placement takes one pass over
+#the rows for all candidates together. The counts are returned with a row
+#per candidate, padded with zeros.
+def place_lfom_orifices(FLOW,HL,D,N_rows,N_max=np.inf):
+    D,N_rows,N_max=np.broadcast_arrays(np.atleast_1d(D).astype(float),np.atleast_1d(N_rows),np.atleast_1d(N_max).astype(float))
+    dist=HL/N_rows
+    N_placed=np.array([len(np.arange(0.5*D[c],HL,dist[c]))-1 for c in range(len(D))])
+    rows=np.arange(max(N_placed.max(),0))
+    used=rows<N_placed[:,np.newaxis]
+    H_rows=0.5*D[:,np.newaxis]+rows*dist[:,np.newaxis]
+    H_targets=(rows+1)*dist[:,np.newaxis]
+    FLOW_ramp_local=FLOW*H_targets/HL
+    # FLOW_orifice[c,i,k] is the flow through one orifice of row k of
+    # candidate c when the water is at target level i.
+    FLOW_orifice=pc.flow_orifice_vert_array(D[:,np.newaxis,np.newaxis],H_targets[:,:,np.newaxis]-H_rows[:,np.newaxis,:],ratio_VC_orifice).magnitude
+    FLOW_placed=np.zeros(H_targets.shape)
+    n=np.zeros(H_targets.shape,dtype=int)
+    for i in rows:
+        with np.errstate(divide='ignore',invalid='ignore'):
+            n_row=np.round((FLOW_ramp_local[:,i]-FLOW_placed[:,i])/FLOW_orifice[:,i,i])
+        n[:,i]=np.where(used[:,i],np.minimum(np.maximum(0,np.nan_to_num(n_row)),N_max),0)
+        FLOW_placed+=n[:,i,np.newaxis]*FLOW_orifice[:,:,i]
+    return n
 
 #Calculate number of orifices at each level given a diameter
+@params.accepts(LFOMParams)
 def fric_n_lfom_orifices(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM):
-    FLOW_ramp_local=flow_ramp(FLOW,HL_LFOM)
-    D_LFOM_Orifices=lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom)
-    H_ramp_local=np.arange(D_LFOM_Orifices*0.5,HL_LFOM,dist_center_lfom_rows(FLOW,HL_LFOM),dtype=object)
-    n=[]
-    for i in range (len(H_ramp_local)-1):
-        h=np.arange(dist_center_lfom_rows(FLOW,HL_LFOM),HL_LFOM,dist_center_lfom_rows(FLOW,HL_LFOM),dtype=object)
-        d=H_ramp_local
-        if nom_diam_lfom_pipe(FLOW,HL_LFOM,Pi_LFOM_safety,SDR_LFOM)<=12*u.inch:
-            n.append(min(max(0,round((FLOW_ramp_local[i]-flow_lfom_actual(FLOW,HL_LFOM,drill_series_uom,i,n))/pc.flow_orifice_vert(D_LFOM_Orifices,h[i]-d[i],ratio_VC_orifice))),n_lfom_orifices_per_row_max(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM)))
-        else:
-             n.append(max(0,round((FLOW_ramp_local[i]-flow_lfom_actual(FLOW,HL_LFOM,drill_series_uom,i,n))/pc.flow_orifice_vert(D_LFOM_Orifices,h[i]-d[i],ratio_VC_orifice))))
-    return n
+    D_LFOM_Orifices=lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom).to(u.m).magnitude
+    HL=HL_LFOM.to(u.m).magnitude
+    N_rows=n_lfom_rows(FLOW,HL_LFOM)
+    N_placed=len(np.arange(D_LFOM_Orifices*0.5,HL,dist_center_lfom_rows(FLOW,HL_LFOM).to(u.m).magnitude))-1
+    if nom_diam_lfom_pipe(FLOW,HL_LFOM,Pi_LFOM_safety,SDR_LFOM)<=12*u.inch:
+        N_max=n_lfom_orifices_per_row_max(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM)
+    else:
+        N_max=np.inf
+    return place_lfom_orifices(FLOW.to(u.m**3/u.s).magnitude,HL,D_LFOM_Orifices,N_rows,N_max)[0,:N_placed]
+
+
+#The diameter of the orifices, the height of the center of every row and the
+#number of orifices in every row of the LFOM.
+@params.accepts(LFOMParams)
+def lfom_layout(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM):
+    N_lfom_orifices=fric_n_lfom_orifices(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM)
+    D_lfom_orifices=lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom).to(u.m)
+    H_rows=0.5*D_lfom_orifices+np.arange(len(N_lfom_orifices))*dist_center_lfom_rows(FLOW,HL_LFOM).to(u.m)
+    return D_lfom_orifices,H_rows,N_lfom_orifices
+
+
+# Number of (design, level, row) points evaluated at once by
+# flow_lfom_rating, which bounds the size of its temporary arrays.
+SIZE_RATING_CHUNK = 2**16
+
+#Calculate the flow through LFOM designs at arrays of water levels.
+#D_lfom_orifices has one value per design. H_rows and N_lfom_orifices have
+#a row of values per design; designs with fewer rows are padded with rows
+#of zero orifices. H_water has a row of water levels per design (or one row
+#that is shared by every design). The flows through every row at every
+#level are evaluated together, in chunks of levels.
+def flow_lfom_rating(D_lfom_orifices,H_rows,N_lfom_orifices,H_water):
+    D=np.atleast_1d(ut.base_magnitude(D_lfom_orifices)).astype(float)
+    z=np.atleast_2d(ut.base_magnitude(H_rows)).astype(float)
+    n=np.atleast_2d(N_lfom_orifices).astype(float)
+    H=np.atleast_2d(ut.base_magnitude(H_water)).astype(float)
+    N_designs=max(len(D),len(z),len(n),len(H))
+    D,z,n,H=(np.broadcast_to(x,(N_designs,)+x.shape[1:]) for x in (D,z,n,H))
+    flow=np.empty(H.shape)
+    step=max(1,SIZE_RATING_CHUNK//(N_designs*z.shape[1]))
+    for start in range(0,H.shape[1],step):
+        levels=slice(start,start+step)
+        flow[:,levels]=np.sum(n[:,np.newaxis,:]*pc.flow_orifice_vert_array(D[:,np.newaxis,np.newaxis],H[:,levels,np.newaxis]-z[:,np.newaxis,:],ratio_VC_orifice).magnitude,axis=-1)
+    return flow*u.m**3/u.s
+
+#Rate LFOM designs at N_levels water levels evenly spaced up to HL_LFOM.
+#FLOW and HL_LFOM have one value per design and the other inputs are those
+#of flow_lfom_rating. The deviation from the ideal linear flow is relative
+#to FLOW, and its maximum absolute value and root mean square over the
+#levels are reported for every design.
+def lfom_rating(FLOW,HL_LFOM,D_lfom_orifices,H_rows,N_lfom_orifices,N_levels=1000):
+    FLOW=np.atleast_1d(ut.base_magnitude(FLOW)).astype(float)
+    HL=np.atleast_1d(ut.base_magnitude(HL_LFOM)).astype(float)
+    H_water=HL[:,np.newaxis]*np.linspace(0,1,N_levels+1)[1:]
+    flow=flow_lfom_rating(D_lfom_orifices,H_rows,N_lfom_orifices,H_water).magnitude
+    flow_ideal=flow_lfom_ideal(FLOW[:,np.newaxis],HL[:,np.newaxis],H_water)
+    error=(flow-flow_ideal)/FLOW[:,np.newaxis]
+    return {'H_water':np.broadcast_to(H_water,flow.shape)*u.m,
+            'flow':flow*u.m**3/u.s,
+            'flow_ideal':flow_ideal*u.m**3/u.s,
+            'error_max':np.max(np.abs(error),axis=1)*u.dimensionless,
+            'error_rms':np.sqrt(np.mean(error**2,axis=1))*u.dimensionless}
+
+
+#Place and rate one chunk of candidate (drill diameter, row count) designs
+#in base units. Candidates that need more orifices in a row than fit in the
+#largest pipe, or whose orifices are wider than the row spacing, are
+#pruned before they are rated and get an error of infinity.
+def _score_lfom_candidates(FLOW,HL,D,N_rows,N_max_largest,N_levels):
+    n=place_lfom_orifices(FLOW,HL,D,N_rows)
+    N_need=n.max(axis=1,initial=0)
+    feasible=(N_need<=N_max_largest)&(D<HL/N_rows)&(N_need>0)
+    error_max=np.full(len(D),np.inf)
+    error_rms=np.full(len(D),np.inf)
+    if np.any(feasible):
+        H_rows=0.5*D[feasible,np.newaxis]+np.arange(n.shape[1])*(HL/N_rows[feasible,np.newaxis])
+        rating=lfom_rating(FLOW,HL,D[feasible],H_rows,n[feasible],N_levels)
+        error_max[feasible]=rating['error_max'].magnitude
+        error_rms[feasible]=rating['error_rms'].magnitude
+    return n,N_need,error_max,error_rms
+
+# Minimum distance between the edges of neighbouring orifices in a row.
+S_LFOM_ORIFICES_MIN = 3*u.mm
+
+#Search every combination of drill size, row count, SDR and pipe ND for the
+#LFOM designs with the smallest flow error for their pipe size. Each
+#(drill size, row count) candidate is placed without a limit on the
+#orifices per row and rated on N_levels water levels; the candidates are
+#split into chunks that are spread over n_workers processes. A candidate
+#fits a pipe if the pipe is at least as large as nom_diam_lfom_pipe
+#requires and every row fits in the pipe wall with S_LFOM_ORIFICES_MIN
+#between orifices. The result is the Pareto set of maximum flow error
+#versus pipe ND, as a dictionary of arrays sorted by ND.
+def optimize_lfom(FLOW,HL_LFOM,drill_series_uom,SDRs=(SDR_LFOM,),N_rows=range(4,11),NDs=None,N_levels=200,n_workers=1,chunk_size=64):
+    ut.check_range([N_levels,">0, int","Number of levels"],[n_workers,">0, int","Number of workers"],[chunk_size,">0, int","Chunk size"])
+    if NDs is None:
+        NDs=pipe.ND_all_available()
+    FLOW_m=FLOW.to(u.m**3/u.s).magnitude
+    HL=HL_LFOM.to(u.m).magnitude
+    ID_min=pc.diam_circle(area_lfom_pipe_min(FLOW,HL_LFOM,Pi_LFOM_safety)).to(u.m).magnitude
+    pipes=[(SDR,ND.to(u.inch).magnitude,pipe.ID_SDR(ND,SDR).to(u.m).magnitude) for SDR in SDRs for ND in NDs]
+    pipes=[p for p in pipes if p[2]>=ID_min]
+    if not pipes:
+        raise ValueError("None of the pipes is large enough for a flow of {0}.".format(FLOW))
+    ID_largest=max(p[2] for p in pipes)
+    S_min=S_LFOM_ORIFICES_MIN.to(u.m).magnitude
+    D,R=np.meshgrid(drill_series(drill_series_uom).to(u.m).magnitude,np.asarray(N_rows),indexing='ij')
+    D=D.ravel()
+    R=R.ravel()
+    N_max_largest=np.floor(np.pi*ID_largest/(D+S_min))
+    chunks=[slice(start,start+chunk_size) for start in range(0,len(D),chunk_size)]
+    args=[(FLOW_m,HL,D[c],R[c],N_max_largest[c],N_levels) for c in chunks]
+    if n_workers==1:
+        scores=[_score_lfom_candidates(*arg) for arg in args]
+    else:
+        with futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+            scores=list(executor.map(_score_lfom_candidates,*zip(*args)))
+    width=max(score[0].shape[1] for score in scores)
+    n=np.concatenate([np.pad(score[0],((0,0),(0,width-score[0].shape[1])),'constant') for score in scores])
+    N_need,error_max,error_rms=(np.concatenate([score[i] for score in scores]) for i in (1,2,3))
+    # The best candidate for every pipe, then the pipes that no smaller
+    # pipe beats.
+    best=[]
+    for SDR,ND,ID in sorted(pipes,key=lambda p:(p[1],p[0])):
+        fits=(N_need<=np.floor(np.pi*ID/(D+S_min)))&np.isfinite(error_max)
+        if np.any(fits):
+            i=np.flatnonzero(fits)[np.lexsort((error_rms[fits],error_max[fits]))[0]]
+            best.append((ND,SDR,i))
+    pareto=[]
+    for ND,SDR,i in best:
+        if not pareto or error_max[i]<error_max[pareto[-1][2]]:
+            if pareto and pareto[-1][0]==ND:
+                pareto.pop()
+            pareto.append((ND,SDR,i))
+    index=np.array([i for ND,SDR,i in pareto],dtype=int)
+    return {'ND':np.array([ND for ND,SDR,i in pareto])*u.inch,
+            'SDR':np.array([SDR for ND,SDR,i in pareto]),
+            'D_lfom_orifices':D[index]*u.m,
+            'N_rows':R[index],
+            'N_lfom_orifices':n[index],
+            'error_max':error_max[index]*u.dimensionless,
+            'error_rms':error_rms[index]*u.dimensionless}
 
 
 #This function calculates the error of the design based on the differences between the predicted flow rate
-#and the actual flow rate through the LFOM.
+#and the actual flow rate through the LFOM at the target levels between the rows.
+@params.accepts(LFOMParams)
 def flow_lfom_error(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM):
-    N_lfom_orifices=fric_n_lfom_orifices(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM)
-    FLOW_lfom_error=[]
-    for j in range (len(N_lfom_orifices)-1):
-        FLOW_lfom_error.append((flow_lfom_actual(FLOW,HL_LFOM,drill_series_uom,j,N_lfom_orifices)-flow_ramp(FLOW,HL_LFOM)[j])/FLOW)
-    return FLOW_lfom_error
+    D_lfom_orifices,H_rows,N_lfom_orifices=lfom_layout(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM)
+    FLOW_ramp_local=flow_ramp(FLOW,HL_LFOM)[:len(N_lfom_orifices)-1]
+    H_targets=(np.arange(1,len(N_lfom_orifices))*dist_center_lfom_rows(FLOW,HL_LFOM)).to(u.m)
+    flow=flow_lfom_rating(D_lfom_orifices,H_rows,N_lfom_orifices,H_targets)[0]
+    return ((flow-FLOW_ramp_local)/FLOW).to(u.dimensionless)
 
 
 #This funciton returns the maximum error, the absolute value of the errors is take into account positive 
 #and negative errors
-x= max(flow_lfom_error(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM))
+x= flow_lfom_error(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM).max()
 y=x**2
 FLOW_LFOM_ERROR_MAX=y**1/2
 
@@ -170,14 +344,13 @@ def flow_lfom_ideal(FLOW,HL_LFOM,H):
     return flow_lfom_ideal
 
 
+#Calculate the actual flow through the LFOM at a water level, or an array
+#of water levels, H.
+@params.accepts(LFOMParams)
 def flow_lfom(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM,H):
-    D_lfom_orifices=lfom_drillbit_diameter(FLOW,HL_LFOM,drill_series_uom)
-    H_submerged=np.arange(H-0.5*D_lfom_orifices,HL_LFOM,H-dist_center_lfom_rows(FLOW,HL_LFOM),dtype=object)
-    N_lfom_orifices=fric_n_lfom_orifices(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM)
-    flow=[]
-    for i in range (len(H_submerged)):
-        flow.append(pc.flow_orifice_vert(D_lfom_orifices,H_submerged[i],ratio_VC_orifice)*N_lfom_orifices[i])
-    return sum (flow)
+    D_lfom_orifices,H_rows,N_lfom_orifices=lfom_layout(FLOW,HL_LFOM,drill_series_uom,SDR_LFOM)
+    flow=flow_lfom_rating(D_lfom_orifices,H_rows,N_lfom_orifices,np.ravel(H.to(u.m).magnitude))[0]
+    return np.reshape(flow.magnitude,np.shape(H.magnitude))*u.m**3/u.s
 
 
 if FLOW==1.6*(u.L/u.s):
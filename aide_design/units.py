@@ -18,11 +18,126 @@ an operation on quantities whose units come from different unit
 registries raises an exception). This module contains a single global
 unit registry `unit_registry` that can be used by any number of other
 modules.
+
+The contexts enabled with `enable_contexts`, `disable_contexts` and
+`context` are local to the thread or asyncio task that enables them, so a
+conversion in one thread never sees a context that another thread is
+entering or leaving. Contexts that every thread should start with, such as
+the 'chem' context of floc_model, are enabled with
+`enable_default_contexts`. The registry is otherwise only read after it is
+built, so the functions of physchem, floc_model and the modules built on
+them can be called from many threads at once, for example from a
+ThreadPoolExecutor.
 """
 
+import contextlib
+import contextvars
 import os
+import threading
+
 import pint
+from pint.context import Context, ContextChain
+
+
+class LocalContextRegistry(pint.UnitRegistry):
+    """A pint UnitRegistry whose active contexts are local to each thread
+    and asyncio task.
+
+    A thread or task starts with the default contexts. Enabling or
+    disabling a context replaces its own chain of contexts with a new one
+    instead of changing a chain that other threads are using.
+    """
+    def __init__(self, *args, **kwargs):
+        self._local_contexts = contextvars.ContextVar('active_contexts',
+                                                      default=None)
+        self._lock_contexts = threading.RLock()
+        pint.UnitRegistry.__init__(self, *args, **kwargs)
+
+    @property
+    def _active_ctx(self):
+        chain = self._local_contexts.get()
+        return self._default_contexts if chain is None else chain
+
+    @_active_ctx.setter
+    def _active_ctx(self, chain):
+        self._default_contexts = chain
+
+    def enable_contexts(self, *names_or_contexts, **kwargs):
+        """Enable contexts, given by name or object, in this thread or
+        task.
+        """
+        self._local_contexts.set(
+            self._enabled(self._active_ctx, names_or_contexts, kwargs))
+
+    def disable_contexts(self, n=None):
+        """Disable the last n contexts enabled in this thread or task."""
+        if n is None:
+            n = len(self._contexts)
+        chain = _copy_chain(self._active_ctx)
+        chain.remove_contexts(n)
+        chain.graph
+        self._local_contexts.set(chain)
+
+    def enable_default_contexts(self, *names_or_contexts, **kwargs):
+        """Enable contexts in every thread and task that hasn't enabled or
+        disabled contexts of its own.
+        """
+        with self._lock_contexts:
+            self._default_contexts = self._enabled(
+                self._default_contexts, names_or_contexts, kwargs)
+
+    @contextlib.contextmanager
+    def context(self, *names, **kwargs):
+        """Enable contexts in this thread or task within a with statement."""
+        token = self._local_contexts.set(
+            self._enabled(self._active_ctx, names, kwargs))
+        try:
+            yield self
+        finally:
+            self._local_contexts.reset(token)
+
+    def _enabled(self, chain, names_or_contexts, kwargs):
+        """Return a copy of chain with the contexts added, as
+        enable_contexts of pint does.
+        """
+        if chain.defaults:
+            kwargs = dict(chain.defaults, **kwargs)
+        contexts = [self._contexts[name] if isinstance(name, str) else name
+                    for name in names_or_contexts]
+        # The first time a context is enabled its dimensions are rewritten in
+        # terms of base dimensions, which changes the shared context.
+        with self._lock_contexts:
+            for context in contexts:
+                if getattr(context, '_checked', False):
+                    continue
+                for (src, dst), func in list(context.funcs.items()):
+                    src_ = self._get_dimensionality(src)
+                    dst_ = self._get_dimensionality(dst)
+                    if src != src_ or dst != dst_:
+                        context.remove_transformation(src, dst)
+                        context.add_transformation(src_, dst_, func)
+                context._checked = True
+        chain = _copy_chain(chain)
+        chain.insert_contexts(*(Context.from_context(context, **kwargs)
+                                for context in contexts))
+        # The graph is built now, because building it lazily while another
+        # thread reads it would expose a half built graph.
+        chain.graph
+        return chain
+
+
+def _copy_chain(chain):
+    """Return a copy of a chain of contexts that can be changed."""
+    copy = ContextChain()
+    copy.maps = list(chain.maps)
+    copy._contexts = list(chain._contexts)
+    return copy
+
+
+unit_registry = LocalContextRegistry(system='mks', autoconvert_offset_to_baseunit=True)
 
-unit_registry = pint.UnitRegistry(system='mks', autoconvert_offset_to_baseunit=True)
+unit_registry.load_definitions(os.path.join(os.path.dirname(__file__), "data/unit_definitions.txt"))
 
-unit_registry.load_definitions(os.path.join(os.path.dirname(__file__), "data/unit_definitions.txt"))
\ No newline at end of file
+# Quantities that are unpickled, for example the results of a process pool
+# or of the design cache, belong to this registry rather than a new one.
+pint.set_application_registry(unit_registry)
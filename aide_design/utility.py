@@ -8,6 +8,7 @@ By: Sage Weber-Shirk
 """
 # units allows us to include units in all of our calculations
 import math
+import numbers
 
 try:
     from aide_design.units import unit_registry as u
@@ -15,7 +16,10 @@ except ModuleNotFoundError:
     from aide_design.units import unit_registry as u
 
 import numpy as np
+import collections
 import functools
+import threading
+import warnings
 
 #We need to fix the formatting so that it doesn't display trailing zeroes
 #that are not significant.
@@ -87,28 +91,213 @@ def sig(x,n):
         return "".join(out)
 
 
+def sig_array(x, n):
+    """Return sig(value, n) for every value of an array, as an array of the
+    same shape.
+
+    x is an array of numbers or a Quantity array. The result is the same as
+    np.array([sig(value, n) for value in x]), but the digits of every value
+    are found at once with NumPy and the units of a Quantity array are
+    formatted only once. The few values whose digits can't be found
+    exactly that way, such as exact powers of ten, are passed to sig.
+    """
+    units = None
+    if isinstance(x, u.Quantity):
+        units = x.units
+        x = x.magnitude
+    x = np.asarray(x, dtype=float)
+    flat = x.ravel()
+    if units is None and n == 1:
+        # sig returns rounded numbers rather than strings in this case.
+        return np.array([sig(value, n) for value in flat]).reshape(x.shape)
+    if units is None:
+        prefix, suffix = '', ''
+    else:
+        prefix, suffix = '{:~P}'.format(u.Quantity('\0', units)).split('\0')
+    out = np.empty(flat.shape, dtype=object)
+    mag = np.abs(flat)
+    # The same steps as sig, for every value at once.
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        log = np.log10(mag)
+        e = np.where(np.isfinite(log), np.trunc(log), 0)
+        tens = _pow10(e - n + 1)
+        y = np.floor(mag / tens)
+        low = y < 10.0 ** (n - 1)
+        e = np.where(low, e - 1, e)
+        tens = _pow10(e - n + 1)
+        y = np.floor(mag / tens)
+        y = np.where(np.abs((y + 1.) * tens - mag) <= np.abs(y * tens - mag),
+                     y + 1, y)
+        over = y >= 10.0 ** n
+        y = np.where(over, y / 10., y)
+        e = np.where(over, e + 1, e)
+        # log10 may round differently from math.log10 next to integers.
+        exact = (np.isfinite(log) & (np.abs(log - np.round(log)) > 1e-9)
+                 & (y >= 10.0 ** (n - 1)) & (y < 10.0 ** n) & (n <= 15))
+    zero = flat == 0
+    out[zero] = '0.' + '0' * (n - 1)
+    rounded = (flat >= 1) & (units is not None) & (n == 1)
+    out[rounded] = [prefix + str(round(value)) + suffix
+                    for value in flat[rounded]]
+    fast = exact & ~zero & ~rounded
+    digits = y.astype(np.int64, copy=False) if np.any(fast) else y
+    negative = flat < 0
+    for exponent in np.unique(e[fast]):
+        for sign in (False, True):
+            rows = fast & (e == exponent) & (negative == sign)
+            if np.any(rows):
+                template, scale = _format_digits(int(exponent), n)
+                template = (prefix.replace('%', '%%') + '-' * sign + template
+                            + suffix.replace('%', '%%'))
+                values = digits[rows]
+                if scale is None:
+                    out[rows] = [template % i for i in values.tolist()]
+                else:
+                    out[rows] = [template % pair for pair in
+                                 zip((values // scale).tolist(),
+                                     (values % scale).tolist())]
+    for i in np.flatnonzero(~fast & ~zero & ~rounded):
+        out[i] = sig(flat[i] if units is None else u.Quantity(flat[i], units),
+                     n)
+    return out.astype(str).reshape(x.shape)
+
+
+def _pow10(k):
+    """Return 10**k for an array of integers k, rounded as math.pow rounds
+    it, which NumPy's power doesn't always do.
+    """
+    exponents, inverse = np.unique(k, return_inverse=True)
+    return np.array([math.pow(10, int(i)) for i in exponents])[inverse]
+
+
+def _format_digits(e, n):
+    """Return a % template of the strings of sig for values whose exponent
+    is e, and the power of ten that splits their n significant digits into
+    the two numbers it takes, or None if it takes only the digits.
+    """
+    if e < -2 or e >= n:
+        exponent = 'e{0}{1}'.format('+' if e > 0 else '', e)
+        if n == 1:
+            return '%d' + exponent, None
+        return '%d.%0{0}d'.format(n - 1) + exponent, 10 ** (n - 1)
+    if e == n - 1:
+        return '%d', None
+    if e >= 0:
+        return '%d.%0{0}d'.format(n - 1 - e), 10 ** (n - 1 - e)
+    return '0.' + '0' * -(e + 1) + '%d', None
+
+
+def base_magnitude(x):
+    """Return the magnitude of x in base units.
+
+    Numbers without units are returned unchanged, so this can be used on
+    inputs that may or may not include units.
+    """
+    if isinstance(x, u.Quantity):
+        return x.to_base_units().magnitude
+    return x
+
+
+def arange_with_units(start, stop, step, unit=None):
+    """Return evenly spaced values from start up to, but not including,
+    stop as one Quantity that wraps a float64 array.
+
+    This replaces np.arange(start, stop, step, dtype=object), which holds
+    a separate Quantity for every value. start, stop and step may be
+    Quantities or numbers in unit; unit defaults to the units of the first
+    of them that is a Quantity.
+    """
+    if unit is None:
+        unit = next((x.units for x in (start, step, stop)
+                     if isinstance(x, u.Quantity)), u.dimensionless)
+    unit = u.Quantity(1, unit).units
+    start, stop, step = (x.to(unit).magnitude if isinstance(x, u.Quantity)
+                         else x for x in (start, stop, step))
+    return u.Quantity(np.arange(start, stop, step, dtype=float), unit)
+
+
 def stepceil_with_units(param, step, unit):
     """This function returns the smallest multiple of 'step' greater than or
     equal to 'param' and outputs the result in Pint units. 
     This function is unit-aware and functions without requiring translation
     so long as 'param' and 'unit' are of the same dimensionality.
+    param can be an array.
     """
-    counter = 0 * unit
-    while counter < param.to(unit):
-        counter += step * unit
-    return counter
+    return _step_with_units(param, step, unit, np.ceil)
+
+
+def stepfloor_with_units(param, step, unit):
+    """Return the largest multiple of step, in unit, less than or equal to
+    param. param can be an array.
+    """
+    return _step_with_units(param, step, unit, np.floor)
+
+
+def stepround_with_units(param, step, unit):
+    """Return the multiple of step, in unit, nearest to param. Values
+    halfway between two multiples are rounded up. param can be an array.
+    """
+    return _step_with_units(param, step, unit, lambda q: np.floor(q + 0.5))
+
+
+def _step_with_units(param, step, unit, rounding):
+    """Return param rounded to a multiple of step by rounding, in unit.
+
+    The number of steps is found in one division rather than by counting.
+    Quotients within a tiny fraction of a whole number of steps are taken
+    to be that number, so that 0.3 m is 3 steps of 0.1 m rather than
+    2.9999999999999996, and the result is rounded to the decimals of step
+    so that 3 steps of 0.1 m are 0.3 m rather than 0.30000000000000004 m.
+    step and param may be Quantities or numbers in unit.
+    """
+    unit = u.Quantity(1, unit).units
+    if isinstance(step, u.Quantity):
+        step = step.to(unit).magnitude
+    check_range([step, ">0", "Step"])
+    if isinstance(param, u.Quantity):
+        param = param.to(unit).magnitude
+    quotient = np.asarray(param, dtype=float) / step
+    nearest = np.round(quotient)
+    quotient = np.where(np.abs(quotient - nearest)
+                        <= 1e-9 * np.maximum(np.abs(nearest), 1),
+                        nearest, quotient)
+    result = rounding(quotient) * step
+    text = repr(float(step))
+    if 'e' not in text:
+        result = np.round(result, len(text.partition('.')[2]))
+    # Adding zero turns the -0.0 of small negative params into 0.0.
+    result = result + 0.0
+    if np.ndim(result) == 0:
+        result = float(result)
+    return u.Quantity(result, unit)
 
 
 # Take the values of the array, compare to x, find the index of the first value less than or equal to x
+# The array must be sorted. x can be an array, in which case every element
+# is looked up with one searchsorted call. A value no larger than the
+# first element of the array wraps around to the last element; the
+# aide_design.series module has explicit out of range handling.
 def floor_nearest(x,array):
-    myindex = np.argmax(array >= x) - 1
+    myindex = _index_nearest(x, array) - 1
     return array[myindex]
 
 
 # Take the values of the array, compare to x, find the index of the first value greater or equal to x
+# A value larger than every element of the array wraps around to the
+# first element.
 def ceil_nearest(x,array):
-    myindex = np.argmax(array >= x)
-    return array[myindex]
+    myindex = _index_nearest(x, array)
+    return array[np.where(myindex < len(array), myindex, 0)]
+
+
+def _index_nearest(x, array):
+    """Return the index of the first element of array greater than or equal
+    to x, or len(array) if there is none.
+    """
+    if isinstance(array, u.Quantity):
+        x = u.Quantity(x).to(array.units).magnitude
+        array = array.magnitude
+    return np.searchsorted(np.asarray(array), x, side='left')
 
 
 def list_handler(func):
@@ -222,25 +411,246 @@ def check_range(*args):
                                        "request: {0}.".format(i))
         if not isinstance(arg[0], (list, tuple, np.ndarray)):
             arg[0] = [arg[0]]
-        for i in arg[0]:
-            if '>0' in arg[1] and i <= 0:
-                raise ValueError("{1} is {0} but must be greater than "
-                                 "0.".format(i, arg[2]))
-            if '>=0' in arg[1] and i <0:
-                raise ValueError("{1} is {0} but must be 0 or "
-                                 "greater.".format(i, arg[2]))
-            if '0-1' in arg[1] and not 0 <= i <= 1:
-                raise ValueError("{1} is {0} but must be between 0 and "
-                                 "1.".format(i, arg[2]))
-            if '<0' in arg[1] and i >= 0:
-                raise ValueError("{1} is {0} but must be less than "
-                                 "0.".format(i, arg[2]))
-            if '<=0' in arg[1] and i >0:
-                raise ValueError("{1} is {0} but must be 0 or "
-                                 "less.".format(i, arg[2]))
-            if 'int' in arg[1] and int(i) != i:
-                raise TypeError("{1} is {0} but must be a numeric "
-                                "integer.".format(i, arg[2]))
-            if 'boolean' in arg[1] and type(i) != bool:
+        #Booleans must be checked one element at a time because numpy
+        #would silently convert them to numbers.
+        if 'boolean' in arg[1]:
+            for i in arg[0]:
+                if type(i) != bool:
+                    raise TypeError("{1} is {0} but must be a "
+                                    "boolean.".format(i, arg[2]))
+        #The numeric checks are done on the whole array at once so that
+        #large arrays of samples don't have to be checked in a Python loop.
+        #Quantities are checked by their magnitudes, as comparing them
+        #with 0 does.
+        if not set(arg[1].split(",")) - {'boolean'}:
+            continue
+        if isinstance(arg[0], np.ndarray) and arg[0].dtype.kind != 'O':
+            values = arg[0]
+        elif isinstance(arg[0], np.ndarray):
+            values = _magnitudes(arg[0])
+        else:
+            values = np.asarray([getattr(i, 'magnitude', i) for i in arg[0]])
+        if values.dtype.kind not in 'biuf':
+            if not all(isinstance(i, numbers.Number) for i in values.flat):
+                bad = next(i for i in values.flat
+                           if not isinstance(i, numbers.Number))
                 raise TypeError("{1} is {0} but must be a "
-                                "boolean.".format(i, arg[2]))
+                                "number.".format(bad, arg[2]))
+            values = values.astype(float)
+        for check, invalid, message, error in _RANGE_CHECKS:
+            if check in arg[1].split(","):
+                bad = invalid(values)
+                if np.any(bad):
+                    raise error(message.format(values[bad].flat[0], arg[2]))
+
+
+def _magnitudes(values):
+    """Return the magnitudes of the elements of an object array, such as
+    an array of Quantities, whose magnitudes can be 0-d arrays.
+    """
+    magnitudes = np.empty(values.shape, dtype=object)
+    for index, i in enumerate(values.flat):
+        i = getattr(i, 'magnitude', i)
+        magnitudes.flat[index] = (i.item() if isinstance(i, np.ndarray)
+                                  and i.ndim == 0 else i)
+    return magnitudes
+
+
+_RANGE_CHECKS = (
+    ('>0', lambda x: x <= 0,
+     "{1} is {0} but must be greater than 0.", ValueError),
+    ('>=0', lambda x: x < 0,
+     "{1} is {0} but must be 0 or greater.", ValueError),
+    ('0-1', lambda x: ~((0 <= x) & (x <= 1)),
+     "{1} is {0} but must be between 0 and 1.", ValueError),
+    ('<0', lambda x: x >= 0,
+     "{1} is {0} but must be less than 0.", ValueError),
+    ('<=0', lambda x: x > 0,
+     "{1} is {0} but must be 0 or less.", ValueError),
+    ('int', lambda x: ~np.isfinite(x) | (np.trunc(x) != x),
+     "{1} is {0} but must be a numeric integer.", TypeError),
+    )
+"""Checks understood by check_range, in the order they are applied.
+
+Each entry is the request string, a vectorized test that flags invalid
+values, the error message and the type of error raised when the test fails.
+"""
+
+
+class ConstantTable:
+    """Constants of a module that are created the first time they are used.
+
+    Each row of the table is (name, magnitude, units, description). units
+    is a string that the unit registry understands, or None for numbers
+    and strings without units. A list of magnitudes with a list of units
+    is a list of quantities, such as tank volumes in gallons and liters.
+    The magnitude of a derived constant is a function of the table, such
+    as lambda c: c.LENGTH + c.SPACE, which returns its value.
+
+    value is meant to be the __getattr__ of the module whose globals are
+    namespace. Each value is stored in namespace when it is created, so
+    Python finds it there the next time and never calls value again.
+    """
+    def __init__(self, rows, namespace):
+        self.rows = {row[0]: row for row in rows}
+        self._namespace = namespace
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self.value(name)
+
+    def value(self, name):
+        """Return the constant called name, creating it if needed."""
+        if name in self._namespace:
+            return self._namespace[name]
+        try:
+            magnitude, units = self.rows[name][1:3]
+        except KeyError:
+            raise AttributeError("module {0!r} has no attribute "
+                                 "{1!r}".format(self._namespace['__name__'],
+                                                name)) from None
+        if callable(magnitude):
+            value = magnitude(self)
+        elif units is None:
+            value = magnitude
+        elif isinstance(units, list):
+            value = [u.Quantity(x, unit) for x, unit in zip(magnitude, units)]
+        else:
+            value = u.Quantity(magnitude, units)
+        self._namespace[name] = value
+        return value
+
+    def dir(self):
+        """Return the names of the module, including constants not yet
+        created.
+        """
+        return sorted(set(self._namespace) | set(self.rows))
+
+    def catalog(self):
+        """Return a list with a dictionary for each constant.
+
+        The dictionaries have the name, magnitude, units, description and
+        whether the constant is derived from others. Magnitudes are
+        numbers, strings or lists so that the catalog can be saved as JSON.
+        Lists of quantities have a list of units.
+        """
+        catalog = []
+        for name, magnitude, units, description in self.rows.values():
+            derived = callable(magnitude)
+            if derived or units is not None:
+                value = self.value(name)
+                if isinstance(value, list):
+                    magnitude = [_plain(x.magnitude) for x in value]
+                    units = ['{:~}'.format(x.units) for x in value]
+                elif isinstance(value, u.Quantity):
+                    magnitude = _plain(value.magnitude)
+                    units = '{:~}'.format(value.units)
+                else:
+                    magnitude = _plain(value)
+            catalog.append({'name': name, 'magnitude': magnitude,
+                            'units': units, 'description': description,
+                            'derived': derived})
+        return catalog
+
+
+def _plain(x):
+    """Return numpy numbers and arrays as Python numbers and lists."""
+    return x.tolist() if isinstance(x, (np.ndarray, np.generic)) else x
+
+
+####################### Solver telemetry #######################
+# Default iteration limit of the iterative solvers.
+SOLVER_MAX_ITER = 100
+
+SolverRecord = collections.namedtuple(
+    'SolverRecord', ['solver', 'iterations', 'residual', 'converged'])
+"""One call of an iterative solver: its name, the number of iterations,
+the final relative residual and whether the residual met the tolerance.
+"""
+
+_solver_logs = threading.local()
+
+
+class SolverLog:
+    """Record the calls of the iterative solvers made in a with block.
+
+    The solvers called in the block, in this thread, stop after max_iter
+    iterations. rtol is a dictionary of tolerances by solver name that
+    replace the defaults of those solvers. Logs can be nested; the limits
+    of the innermost log apply and every log records the calls.
+
+        with ut.SolverLog(max_iter=20) as log:
+            pc.diam_pipe(...)
+        log.histogram('diam_pipe')
+    """
+    def __init__(self, max_iter=None, rtol=None):
+        if max_iter is not None:
+            check_range([max_iter, ">0, int", "Maximum iterations"])
+        self.max_iter = max_iter
+        self.rtol = dict(rtol or {})
+        self.records = []
+
+    def __enter__(self):
+        if not hasattr(_solver_logs, 'stack'):
+            _solver_logs.stack = []
+        _solver_logs.stack.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _solver_logs.stack.remove(self)
+
+    def not_converged(self):
+        """Return the records of the calls that did not converge."""
+        return [record for record in self.records if not record.converged]
+
+    def histogram(self, solver=None):
+        """Return the number of calls of solver, or of every solver, that
+        took 0, 1, 2, ... iterations.
+        """
+        return np.bincount([record.iterations for record in self.records
+                            if solver in (None, record.solver)],
+                           minlength=1)
+
+    def summary(self):
+        """Return the number of calls, calls that did not converge, mean
+        and maximum iterations and largest residual of each solver.
+        """
+        summary = {}
+        for solver in sorted({record.solver for record in self.records}):
+            records = [r for r in self.records if r.solver == solver]
+            iterations = [r.iterations for r in records]
+            summary[solver] = {
+                'calls': len(records),
+                'not_converged': sum(not r.converged for r in records),
+                'iterations_mean': np.mean(iterations),
+                'iterations_max': max(iterations),
+                'residual_max': max(r.residual for r in records)}
+        return summary
+
+
+def solver_limits(solver, rtol):
+    """Return the iteration limit and the tolerance of solver, whose own
+    default tolerance is rtol, in this thread.
+    """
+    stack = getattr(_solver_logs, 'stack', None)
+    if not stack:
+        return SOLVER_MAX_ITER, rtol
+    log = stack[-1]
+    return (SOLVER_MAX_ITER if log.max_iter is None else log.max_iter,
+            log.rtol.get(solver, rtol))
+
+
+def report_solver(solver, iterations, residual, converged):
+    """Record a call of an iterative solver in the active SolverLogs.
+
+    A call that did not converge also raises a RuntimeWarning.
+    """
+    record = SolverRecord(solver, iterations, float(residual), bool(converged))
+    for log in getattr(_solver_logs, 'stack', ()):
+        log.records.append(record)
+    if not converged:
+        warnings.warn("{0} did not converge in {1} iterations; the relative "
+                      "residual is {2:.3g}.".format(solver, iterations,
+                                                     residual),
+                      RuntimeWarning, stacklevel=2)
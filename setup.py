@@ -1,7 +1,16 @@
+import os
+import re
+
 from setuptools import setup
 
+# The version is defined once, in aide_design/__init__.py, which can't be
+# imported before the dependencies are installed.
+with open(os.path.join(os.path.dirname(__file__), 'aide_design',
+                       '__init__.py')) as file:
+    version = re.search(r"^__version__ = '(.*)'", file.read(), re.M).group(1)
+
 setup(name='aide_design',
-      version='v0.0.2',
+      version=version,
       description='AguaClara Infrastructure Design Engine',
       url='https://github.com/AguaClara/aguaclara_design',
       author='AguaClara at Cornell',